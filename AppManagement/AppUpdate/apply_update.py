@@ -63,6 +63,7 @@ def apply_update() -> None:
 
     logger.info("Applying update")
     app_core = AppCore.instance()
+    app_core.query_executor.cancel_all()
     app_core.db.close_connection()
 
     if DEVELOPMENT_MODE:#if app in development
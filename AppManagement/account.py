@@ -1,16 +1,20 @@
 from sys import exit
+from typing import cast
 from functools import partial
 
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from AppObjects.windows_registry import WindowsRegistry
+from AppObjects.account_view_states import AccountViewState
 
 from languages import LanguageStructure
 
 from GUI.gui_constants import ALIGN_V_CENTER
 
-from AppManagement.balance import load_account_balance
-from AppManagement.category import remove_categories_from_list, load_categories, activate_categories
+from AppManagement.balance import load_account_balance, show_account_balance
+from AppManagement.category import remove_categories_from_list, load_categories, activate_categories, load_categories_data,\
+hide_category, release_category, reset_focused_category
+from GUI.category import get_category_layout
 from AppManagement.language import change_language_during_add_account, change_language
 
 
@@ -80,21 +84,98 @@ def add_account() -> int:
     return 1
 
 
+def save_account_view() -> None:
+    """Hide categories of current account and cache them with account balance, so switching back to account is immediate.
+    Least recently used accounts views are removed from cache and their widgets are put to categories pool.
+    """
+
+    app_core = AppCore.instance()
+    for category in app_core.categories.values():
+        hide_category(category)
+
+    evicted_states = app_core.account_view_states.put(cast(int, app_core.account_view_states.shown_account_id), AccountViewState(
+        app_core.categories,
+        app_core.current_year,
+        app_core.current_month,
+        WindowsRegistry.SettingsWindow.account_created_date.text().removeprefix(LanguageStructure.Settings.get_translation(1)),
+        app_core.current_balance,
+        app_core.current_total_income,
+        app_core.current_total_expenses
+    ))
+    app_core.categories = {}
+    for state in evicted_states:
+        release_account_view(state)
+
+
+def release_account_view(state:AccountViewState) -> None:
+    """Put widgets of categories of cached account view to categories pool."""
+
+    for category in state.categories.values():
+        release_category(category)
+
+
+def clear_account_views() -> None:
+    """Remove views of all cached accounts. Used when database is replaced."""
+
+    for state in AppCore.instance().account_view_states.clear():
+        release_account_view(state)
+
+
+def restore_account_view(state:AccountViewState) -> None:
+    """Show cached view of account. Categories are loaded again only if another month is selected now.
+
+        Arguments
+        ---------
+            `state` : (AccountViewState) - View of account.
+    """
+
+    app_core = AppCore.instance()
+    app_core.categories = state.categories
+    app_core.account_view_states.shown_account_id = app_core.db.account_id
+    for category in app_core.categories.values():
+        get_category_layout(category.type).addWidget(category.window)
+        category.window.show()
+
+    WindowsRegistry.SettingsWindow.account_created_date.setText(
+        LanguageStructure.Settings.get_translation(1) + state.created_date
+    )
+    app_core.current_balance = state.current_balance
+    app_core.current_total_income = state.current_total_income
+    app_core.current_total_expenses = state.current_total_expenses
+    show_account_balance()
+
+    if (state.year, state.month) != (app_core.current_year, app_core.current_month):
+        load_categories_data()
+    reset_focused_category()
+
+
 def load_account_data(name:str) -> None:
-    """Load account data. Load categories, set account name and balance."""
+    """Load account data. Load categories, set account name and balance.
+    View of current account is cached, and cached view of loaded account is shown instead of loading it again.
+    """
 
     app_core = AppCore.instance()
-    #Remove loaded categories
-    remove_categories_from_list()
+    if app_core.account_view_states.shown_account_id is not None and len(app_core.categories) != 0:
+        save_account_view()
+    else:
+        #Remove loaded categories
+        remove_categories_from_list()
 
     app_core.config.account_name = name
     app_core.db.set_account_id(app_core.config.account_name)
+    app_core.config.update_user_config()
+
+    state = app_core.account_view_states.take(cast(int, app_core.db.account_id))
+    if state is not None:
+        restore_account_view(state)
+        logger.info(f"Account {name} data restored from cache")
+        return
+
     WindowsRegistry.SettingsWindow.account_created_date.setText(
         LanguageStructure.Settings.get_translation(1) 
         + str(app_core.db.account_query.get_account().created_date.strftime("%Y-%m-%d %H:%M:%S"))
     )    
     
-    app_core.config.update_user_config()
     load_categories()
     activate_categories()
     load_account_balance()
@@ -130,7 +211,7 @@ def clear_accounts_layout() -> None:
 
     WindowsRegistry.SwitchAccountWindow.account_switch_widgets.clear()
     while WindowsRegistry.SwitchAccountWindow.accounts_layout.count() > 0:
-        widget = WindowsRegistry.SwitchAccountWindow.accounts_layout.itemAt(0).widget()
+        widget = WindowsRegistry.SwitchAccountWindow.accounts_layout.takeAt(0).widget()
         if widget:
             widget.setParent(None)
 
@@ -169,7 +250,9 @@ def remove_account() -> None:
     WindowsRegistry.Messages.delete_account_warning.exec()
 
     if WindowsRegistry.Messages.delete_account_warning.clickedButton() == WindowsRegistry.Messages.delete_account_warning.ok_button:
+        remove_categories_from_list()#Removed account view must not be cached
         app_core.db.account_query.delete_account()
+        app_core.month_snapshots.clear()#Id of removed account can be given to a new account
         clear_accounts_layout()
         load_accounts()
 
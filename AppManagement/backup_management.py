@@ -11,7 +11,8 @@ from DesktopQtToolkit.Utils import get_table_widget_item
 from project_configuration import BACKUPS_DIRECTORY, TEST_BACKUPS_DIRECTORY, MIN_RECOMMENDED_BACKUPS, MAX_RECOMMENDED_BACKUPS,\
 DB_FILE_PATH, TEST_DB_FILE_PATH, MIN_RECOMMENDED_LEGACY_BACKUPS, MAX_RECOMMENDED_LEGACY_BACKUPS, BACKUPS_DATE_FORMAT
 from backend.db_controller import DBController
-from AppManagement.account import load_account_data, clear_accounts_layout, load_accounts
+from AppManagement.account import load_account_data, clear_accounts_layout, load_accounts, clear_account_views
+from AppManagement.information_message import show_information_message
 
 from AppObjects.app_core import AppCore
 from AppObjects.windows_registry import WindowsRegistry
@@ -30,8 +31,7 @@ def load_backups() -> None:
     """Load backups from database and display them in the table."""
 
     app_core = AppCore.instance()
-    WindowsRegistry.BackupManagementWindow.backups_table.setRowCount(0)
-    WindowsRegistry.BackupManagementWindow.backups_table.setRowCount(len(app_core.backups))
+    backups_table = WindowsRegistry.BackupManagementWindow.backups_table
     
     backups_sorted_by_date = sorted(
         app_core.backups.items(),
@@ -41,19 +41,23 @@ def load_backups() -> None:
         backups_sorted_by_date,
         key=lambda backup: (*map(int, backup[1].app_version.split(".")),), reverse=True
     )
-    for row, (backup_id, backup) in enumerate(backups_sorted_by_app_version):
-        data = CustomTableWidgetItem(backup.timestamp)
-        data.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-        data.setTextAlignment(ALIGNMENT.AlignCenter)
+    with backups_table.bulk_population():
+        backups_table.setRowCount(0)
+        backups_table.setRowCount(len(app_core.backups))
 
-        app_version = CustomTableWidgetItem(backup.app_version)
-        app_version.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-        app_version.setTextAlignment(ALIGNMENT.AlignCenter)
+        for row, (backup_id, backup) in enumerate(backups_sorted_by_app_version):
+            data = CustomTableWidgetItem(backup.timestamp)
+            data.setFlags(~ Qt.ItemFlag.ItemIsEditable)
+            data.setTextAlignment(ALIGNMENT.AlignCenter)
 
-        WindowsRegistry.BackupManagementWindow.backups_table.setItem(row, 0, data)
-        WindowsRegistry.BackupManagementWindow.backups_table.setItem(row, 1, app_version)
-        WindowsRegistry.BackupManagementWindow.backups_table.setItem(row, 2, CustomTableWidgetItem(backup_id))
-        logger.debug(f"Backup {backup.timestamp} loaded into list")
+            app_version = CustomTableWidgetItem(backup.app_version)
+            app_version.setFlags(~ Qt.ItemFlag.ItemIsEditable)
+            app_version.setTextAlignment(ALIGNMENT.AlignCenter)
+
+            backups_table.setItem(row, 0, data)
+            backups_table.setItem(row, 1, app_version)
+            backups_table.setItem(row, 2, CustomTableWidgetItem(backup_id))
+            logger.debug(f"Backup {backup.timestamp} loaded into list")
 
 
 def create_backup() -> None:
@@ -81,6 +85,26 @@ def create_backup() -> None:
     QTimer.singleShot(1000, _enable_button)
 
 
+def rebuild_search_index() -> None:
+    """Rebuild and optimize transactions full-text search index on a query executor worker thread."""
+
+    app_core = AppCore.instance()
+    search_query = app_core.db.search_query
+
+    def _rebuild_index() -> None:
+        search_query.rebuild_index()
+        search_query.optimize_index()
+
+    def _finish_rebuild(result:None) -> None:
+        WindowsRegistry.BackupManagementWindow.rebuild_search_index.setEnabled(True)
+        logger.info("Search index rebuilt")
+        show_information_message(LanguageStructure.BackupManagement.get_translation(24))
+
+    WindowsRegistry.BackupManagementWindow.rebuild_search_index.setEnabled(False)
+    logger.info("Rebuilding search index")
+    app_core.query_executor.submit("search_index_maintenance", _rebuild_index, _finish_rebuild)
+
+
 def remove_backup() -> int:
     """Remove a backup from the table and delete the backup file."""
 
@@ -146,12 +170,19 @@ def load_backup() -> int:
     
     create_backup()
 
+    app_core.query_executor.cancel_all()
     app_core.db.close_connection()
-    if app_core.test_mode:
-        shutil.copy(backup.db_file_path, TEST_DB_FILE_PATH)
-    else:
-        shutil.copy(backup.db_file_path, DB_FILE_PATH)
-    app_core.db = DBController(app_core.test_mode, app_core.test_alembic_config)
+    db_file_path = TEST_DB_FILE_PATH if app_core.test_mode else DB_FILE_PATH
+    #Write-ahead log of the replaced database must not be applied to the backup
+    for journal_file_path in (f"{db_file_path}-wal", f"{db_file_path}-shm"):
+        if os.path.exists(journal_file_path):
+            os.remove(journal_file_path)
+    shutil.copy(backup.db_file_path, db_file_path)
+    app_core.statistics_cache.clear()
+    app_core.month_snapshots.clear()
+    app_core.balance_verified_accounts.clear()#Balances of restored accounts are verified when they are loaded
+    clear_account_views()
+    app_core.db = DBController(app_core.test_mode, app_core.test_alembic_config, app_core.config.db_profile)
 
     
     backup_accounts = app_core.db.account_query.get_all_accounts()
@@ -1,3 +1,5 @@
+from functools import partial
+
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from AppObjects.windows_registry import WindowsRegistry
@@ -9,25 +11,28 @@ from project_configuration import CategoryType
 
 logger = get_logger(__name__)
 
-def calculate_current_balance() -> None:
-    """Calculate current balance. It sums up all incomes and expenses and updates the account balance."""
+def show_account_balance() -> None:
+    """Show current balance, total income and total expenses in GUI."""
 
     app_core = AppCore.instance()
-    app_core.current_total_income = 0
-    app_core.current_total_expenses = 0
+    WindowsRegistry.MainWindow.account_current_balance.setText(
+        f"{LanguageStructure.MainWindow.get_translation(0)}{app_core.current_balance}"
+    )
+    WindowsRegistry.SettingsWindow.total_income.setText(
+        f"{LanguageStructure.Statistics.get_translation(4)}{app_core.current_total_income}"
+    )
+    WindowsRegistry.SettingsWindow.total_expense.setText(
+        f"{LanguageStructure.Statistics.get_translation(6)}{app_core.current_total_expenses}"
+    )
 
-    for category in app_core.db.category_query.get_all_categories():
 
-        if category.category_type == CategoryType.Income:
-            for transaction in app_core.db.transaction_query.get_all_transactions(category.id):
-                app_core.current_total_income += transaction.value
+def calculate_current_balance() -> None:
+    """Calculate current balance from scratch. Totals are summed up by database and written to the account.
+    It's a full recalculation, so it's used only to verify (and repair) the incrementally maintained balance.
+    """
 
-        elif category.category_type == CategoryType.Expense:
-            for transaction in app_core.db.transaction_query.get_all_transactions(category.id):
-                app_core.current_total_expenses += transaction.value
-    
-    app_core.current_total_income = round(app_core.current_total_income, 2)
-    app_core.current_total_expenses = round(app_core.current_total_expenses, 2)
+    app_core = AppCore.instance()
+    app_core.current_total_income, app_core.current_total_expenses = app_core.db.account_query.get_account_totals()
 
     start_balance = app_core.db.account_query.get_account().start_balance
     app_core.current_balance = start_balance + round(app_core.current_total_income - app_core.current_total_expenses, 2)
@@ -37,19 +42,108 @@ def calculate_current_balance() -> None:
         app_core.current_total_income,
         app_core.current_total_expenses
     )
-    WindowsRegistry.MainWindow.account_current_balance.setText(
-        f"{LanguageStructure.MainWindow.get_translation(0)}{app_core.current_balance}"
-    )
-    WindowsRegistry.SettingsWindow.total_income.setText(
-        f"{LanguageStructure.Statistics.get_translation(4)}{app_core.current_total_income}"
-    )
-    WindowsRegistry.SettingsWindow.total_expense.setText(
-        f"{LanguageStructure.Statistics.get_translation(6)}{app_core.current_total_expenses}"
+    show_account_balance()
+
+
+def verify_account_balance() -> None:
+    """Verify that stored account totals match the sums of all transactions. If they don't, recalculate the balance.
+    Totals are summed up by database on a query executor worker, so loading of account isn't blocked by the full recalculation.
+    Result is dropped if account was switched meanwhile and verification is repeated if transactions were changed meanwhile.
+    """
+
+    app_core = AppCore.instance()
+    account_id = app_core.db.account_id
+    app_core.balance_verified_accounts.add(account_id)
+    write_generation = app_core.db.session_factory.write_generation
+
+    def _check_account_totals(account_totals:tuple[float, float]) -> None:
+        if app_core.db.account_id != account_id:
+            return
+        if app_core.db.session_factory.write_generation != write_generation:
+            verify_account_balance()
+            return
+
+        total_income, total_expenses = account_totals
+        balance_difference = round(app_core.current_balance - round(total_income - total_expenses, 2), 2)
+        start_balance = app_core.db.account_query.get_account().start_balance
+
+        if (
+            round(app_core.current_total_income, 2) == total_income and
+            round(app_core.current_total_expenses, 2) == total_expenses and
+            balance_difference == round(start_balance, 2)
+        ):
+            return
+
+        logger.warning(f"Stored account balance is out of sync. Stored income: {app_core.current_total_income}\
+                       | Stored expenses: {app_core.current_total_expenses}\
+                       | Calculated income: {total_income}\
+                       | Calculated expenses: {total_expenses}")
+        calculate_current_balance()
+        logger.info("Account balance has been recalculated")
+
+    app_core.query_executor.submit(
+        "balance_verification",
+        app_core.db.account_query.get_account_totals,
+        _check_account_totals,
+        partial(fail_account_balance_verification, account_id)
     )
 
 
+def fail_account_balance_verification(account_id:int|None, error:Exception) -> None:
+    """Log failed verification of account balance, so it's verified again on the next load of the account.
+
+        Arguments
+        ---------
+            `account_id` : (int|None) - Id of account which balance has been verified.
+            `error` : (Exception) - Error raised during verification.
+    """
+
+    logger.error(f"Account balance verification failed. {error}")
+    AppCore.instance().balance_verified_accounts.discard(account_id)
+
+
+def save_balance_delta(category_type:str, value_delta:float|int) -> None:
+    """Apply change of transactions sum to account balance in database. It's a query only,\
+    so it can be run inside unit of work while GUI is updated by `show_balance_delta` after the unit of work is committed.
+
+        Arguments
+        ---------
+            `category_type` : (str) - Type of the category where transactions sum has changed.
+            `value_delta` : (float|int) - Change of transactions sum. Negative if transactions value decreased.
+    """
+
+    app_core = AppCore.instance()
+
+    if category_type == CategoryType.Income:
+        app_core.db.account_query.apply_balance_delta(value_delta, 0)
+    else:
+        app_core.db.account_query.apply_balance_delta(0, value_delta)
+
+
+def show_balance_delta(category_type:str, value_delta:float|int) -> None:
+    """Apply change of transactions sum to account balance kept in memory and show it in GUI.
+
+        Arguments
+        ---------
+            `category_type` : (str) - Type of the category where transactions sum has changed.
+            `value_delta` : (float|int) - Change of transactions sum. Negative if transactions value decreased.
+    """
+
+    app_core = AppCore.instance()
+
+    if category_type == CategoryType.Income:
+        app_core.current_total_income = round(app_core.current_total_income + value_delta, 2)
+        app_core.current_balance = round(app_core.current_balance + value_delta, 2)
+    else:
+        app_core.current_total_expenses = round(app_core.current_total_expenses + value_delta, 2)
+        app_core.current_balance = round(app_core.current_balance - value_delta, 2)
+
+    show_account_balance()
+
+
 def load_account_balance() -> None:
-    """Load account balance from database. If total income and expenses are 0, recalculate the balance."""
+    """Load account balance from database and show it. On the first load of account in session
+    balance is verified against transactions totals in background."""
 
     app_core = AppCore.instance()
     logger.info("Loading account balance")
@@ -58,19 +152,9 @@ def load_account_balance() -> None:
     app_core.current_total_income = account.current_total_income
     app_core.current_total_expenses = account.current_total_expenses
 
-    if app_core.current_total_income == 0 and app_core.current_total_expenses == 0:
-        logger.info("Recalculating account balance")
-        calculate_current_balance()
-
-    WindowsRegistry.MainWindow.account_current_balance.setText(
-        f"{LanguageStructure.MainWindow.get_translation(0)}{app_core.current_balance}"
-    )
-    WindowsRegistry.SettingsWindow.total_income.setText(
-        f"{LanguageStructure.Statistics.get_translation(4)}{app_core.current_total_income}"
-    )
-    WindowsRegistry.SettingsWindow.total_expense.setText(
-        f"{LanguageStructure.Statistics.get_translation(6)}{app_core.current_total_expenses}"
-    )
+    show_account_balance()
+    if app_core.db.account_id not in app_core.balance_verified_accounts:
+        verify_account_balance()
     logger.info(f"Current balance: {app_core.current_balance}\
                 | Total income: {app_core.current_total_income}\
                 | Total expenses: {app_core.current_total_expenses}")
@@ -81,13 +165,4 @@ def update_account_balance() -> None:
 
     app_core = AppCore.instance()
     app_core.db.account_query.update_account_balance(app_core.current_balance, app_core.current_total_income, app_core.current_total_expenses)
-
-    WindowsRegistry.MainWindow.account_current_balance.setText(
-        f"{LanguageStructure.MainWindow.get_translation(0)}{app_core.current_balance}"
-    )
-    WindowsRegistry.SettingsWindow.total_income.setText(
-        f"{LanguageStructure.Statistics.get_translation(4)}{app_core.current_total_income}"
-    )
-    WindowsRegistry.SettingsWindow.total_expense.setText(
-        f"{LanguageStructure.Statistics.get_translation(6)}{app_core.current_total_expenses}"
-    )
\ No newline at end of file
+    show_account_balance()
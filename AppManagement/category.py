@@ -1,54 +1,151 @@
+from typing import cast
 from functools import partial
 
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from AppObjects.windows_registry import WindowsRegistry
+from AppObjects.month_snapshots import MonthSnapshot
+from AppObjects.category import Category
 
-from project_configuration import CategoryType
+from project_configuration import CategoryType, PREFETCHED_MONTHS_OFFSETS
+from backend.models import TransactionRow, Category as CategoryModel
+from GeneralTools.Utils import shift_month
 from languages import LanguageStructure
-from GUI.category import load_category, add_category_to_position_list, load_transactions_into_category_table
+from DesktopQtToolkit.default_drop_shadow_effect import DefaultDropShadowEffect
+from GUI.category import load_category, reuse_category, get_category_layout, add_category_to_position_list
 
 from AppManagement.information_message import show_information_message
-from AppManagement.balance import calculate_current_balance
+from AppManagement.balance import save_balance_delta, show_balance_delta
 from AppManagement.transaction import show_add_transaction_window, show_edit_transaction_window, remove_transaction
 
 
 
 logger = get_logger(__name__)
 
+def hide_category(category:Category) -> None:
+    """Hide category and remove its window from layout of main window. Widgets of category aren't destroyed.
+
+        Arguments
+        ---------
+            `category` : (Category) - Category to hide.
+    """
+
+    category.window.hide()
+    get_category_layout(category.type).removeWidget(category.window)
+    category.table_data.setGraphicsEffect(cast(DefaultDropShadowEffect, None))#Remove focus shadow
+
+
+def release_category(category:Category) -> None:
+    """Hide category and put its widgets to categories pool, so they are reused by the next loaded category.
+
+        Arguments
+        ---------
+            `category` : (Category) - Category to release.
+    """
+
+    deactivate_category(category)
+    hide_category(category)
+    category.table_data.clearSelection()
+    category.transactions.set_transactions([])
+    AppCore.instance().categories_pool.append(category)
+
+
+def show_category(category:CategoryModel, transactions:list[TransactionRow], category_total:float) -> Category:
+    """Show category in main window. Widgets from categories pool are reused, new widgets are created only if pool is empty.
+
+        Arguments
+        ---------
+            `category` : (CategoryModel) - Category to show.
+            `transactions` : (list[TransactionRow]) - Month transactions of category.
+            `category_total` : (float) - Month total of category.
+        Returns
+        -------
+            `Category` - Shown category.
+    """
+
+    app_core = AppCore.instance()
+    if len(app_core.categories_pool) != 0:
+        return reuse_category(app_core.categories_pool.pop(), category, transactions, category_total)
+
+    return load_category(
+        category, app_core.db, app_core.current_year, app_core.current_month, transactions, category_total
+    )
+
+
 def remove_categories_from_list() -> None:
-    """Remove all categories from Session.categories. It's used in case you need to update or load all categories."""
+    """Remove all categories from Session.categories. It's used in case you need to update or load all categories.
+    Widgets of categories aren't destroyed, they are kept in categories pool.
+    """
 
     app_core = AppCore.instance()
-    for category in app_core.categories.copy():
-        app_core.categories[category].window.deleteLater()
-        app_core.categories[category].settings.deleteLater()
-        app_core.categories[category].add_transaction.deleteLater()
-        app_core.categories[category].edit_transaction.deleteLater()
-        app_core.categories[category].delete_transaction.deleteLater()
-        del app_core.categories[category]
+    for category in app_core.categories.values():
+        release_category(category)
+    app_core.categories.clear()
+
+
+def get_month_snapshot(categories_id:list[int], year:int, month:int) -> MonthSnapshot:
+    """Get transactions and totals of categories in month. Cached snapshot is used if month was loaded or prefetched before.
+
+        Arguments
+        ---------
+            `categories_id` : (list[int]) - Categories to load.
+            `year` : (int) - Year of month.
+            `month` : (int) - Month to load.
+        Returns
+        -------
+            `MonthSnapshot` - Transactions grouped by category id and total of every category.
+    """
+
+    app_core = AppCore.instance()
+    month_key = (app_core.db.account_id, year, month)
+    snapshot = app_core.month_snapshots.get(month_key, categories_id)
+    if snapshot is None:
+        snapshot = app_core.db.transaction_query.get_categories_transactions_by_month(categories_id, year, month)
+        app_core.month_snapshots.put(month_key, categories_id, snapshot)
+    else:
+        logger.debug(f"Month {month}.{year} loaded from cache")
+    return snapshot
+
+
+def prefetch_adjacent_months() -> None:
+    """Load months around the current one on worker threads, so switching to them doesn't wait on database.
+    Every offset has its own channel, so prefetch of the previous navigation is cancelled by the next one.
+    """
+
+    app_core = AppCore.instance()
+    categories_id = list(app_core.categories)
+    transaction_query = app_core.db.transaction_query
+
+    for months_offset in PREFETCHED_MONTHS_OFFSETS:
+        year, month = shift_month(app_core.current_year, app_core.current_month, months_offset)
+        month_key = (app_core.db.account_id, year, month)
+        if app_core.month_snapshots.contains(month_key, categories_id):
+            continue
+
+        generation = app_core.month_snapshots.get_generation(month_key)
+        app_core.query_executor.submit(
+            f"month_prefetch_{months_offset}",
+            partial(transaction_query.get_categories_transactions_by_month, categories_id, year, month),
+            partial(app_core.month_snapshots.put, month_key, categories_id, generation=generation),
+            lambda error: logger.error(f"Month prefetch failed. {error}")
+        )
 
 
 def load_categories_data() -> None:
-    """Load all categories data from database. It loads all monthly transactions for each category """
+    """Load all categories data for current month. Cached month snapshot is used if it exists,
+    then months around the current one are prefetched.
+    """
 
     app_core = AppCore.instance()
+    categories_transactions, categories_totals = get_month_snapshot(
+        list(app_core.categories), app_core.current_year, app_core.current_month
+    )
+
     for category in app_core.categories:
-        category_data = app_core.categories[category].table_data
-        if category_data.rowCount() != 0:#Remove current category transactions if it exist
-            for row in range(1,category_data.rowCount()+1):
-                category_data.removeRow(row)
-        category_data.setRowCount(0)
-
-        transactions = app_core.db.transaction_query.get_transactions_by_month(
-            category,
-            app_core.current_year,
-            app_core.current_month
-        )
-        if len(transactions) != 0:
-            load_transactions_into_category_table(category_data, transactions)
+        app_core.categories[category].transactions.set_transactions(categories_transactions[category])#Replaces current transactions with one model reset
+        update_category_total_value(category, categories_totals[category])
 
-        update_category_total_value(category)
+    prefetch_adjacent_months()
 
 
 def create_category() -> int:
@@ -67,40 +164,20 @@ def create_category() -> int:
     if app_core.db.category_query.category_exists(category_name, category_type):
         return WindowsRegistry.Messages.category_exists.exec()
     
-    position = app_core.db.category_query.get_available_position(category_type) 
+    with app_core.db.unit_of_work():
+        position = app_core.db.category_query.get_available_position(category_type) 
 
-    app_core.db.category_query.create_category(category_name, category_type, position)
-    category = app_core.db.category_query.get_category(category_name, category_type)
+        app_core.db.category_query.create_category(category_name, category_type, position)
+        category = app_core.db.category_query.get_category(category_name, category_type)
 
-    if category is None:
-        logger.error(f"Category {category_name} haven't been created.")
-        raise RuntimeError(f"Category {category_name} haven't been created.")
-    
-    category_id = category.id 
-    app_core.categories[category_id] = load_category(
-        category,
-        app_core.db,
-        app_core.current_year,
-        app_core.current_month
-    )
+        if category is None:
+            logger.error(f"Category {category_name} haven't been created.")
+            raise RuntimeError(f"Category {category_name} haven't been created.")
+        
+        category_id = category.id 
+        app_core.categories[category_id] = show_category(category, [], 0)
 
-    #Activate Category
-    app_core.categories[category_id].settings.clicked.connect(
-        partial(show_category_settings, app_core.categories[category_id].name)
-    )
-    app_core.categories[category_id].add_transaction.clicked.connect(
-        partial(show_add_transaction_window, app_core.categories[category_id].name)
-    )
-    app_core.categories[category_id].edit_transaction.clicked.connect(
-        partial(
-            show_edit_transaction_window,
-            app_core.categories[category_id].name,
-            app_core.categories[category_id].table_data
-        )
-    )
-    app_core.categories[category_id].delete_transaction.clicked.connect(
-        partial(remove_transaction, app_core.categories[category_id].table_data, category_id)
-    )
+    activate_category(app_core.categories[category_id])
     logger.debug(f"Category {category_name} created")
 
     WindowsRegistry.AddCategoryWindow.category_name.setText("")
@@ -115,14 +192,17 @@ def load_categories() -> None:
     """Load all categories from database for current account."""
 
     app_core = AppCore.instance()
-    for category in app_core.db.category_query.get_all_categories():
-        app_core.categories[category.id] = load_category(
-            category,
-            app_core.db,
-            app_core.current_year,
-            app_core.current_month
+    categories = app_core.db.category_query.get_all_categories()
+    categories_transactions, categories_totals = get_month_snapshot(
+        [category.id for category in categories], app_core.current_year, app_core.current_month
+    )
+
+    for category in categories:
+        app_core.categories[category.id] = show_category(
+            category, categories_transactions[category.id], categories_totals[category.id]
         )
         logger.debug(f"Category {category.name} loaded")
+    app_core.account_view_states.shown_account_id = app_core.db.account_id
     reset_focused_category()
         
 
@@ -153,29 +233,32 @@ def remove_category() -> None:
         return
     
     category_type = CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex())
-    category = app_core.db.category_query.get_category(category_name, category_type)
-    if category is None:
-        logger.error(f"Category {category_name} not found. Category can't be removed.")
-        raise RuntimeError(f"Category {category_name} not found. Category can't be removed.")
-    
-    category_id = category.id
-    app_core.db.category_query.delete_category(category_id)
+    with app_core.db.unit_of_work():
+        category = app_core.db.category_query.get_category(category_name, category_type)
+        if category is None:
+            logger.error(f"Category {category_name} not found. Category can't be removed.")
+            raise RuntimeError(f"Category {category_name} not found. Category can't be removed.")
+        
+        category_id = category.id
+        category_total = app_core.db.transaction_query.get_category_transactions_sum(category_id)
+        app_core.db.category_query.delete_category(category_id)
+        categories_positions = {
+            loaded_category_id:app_core.db.category_query.get_category_by_id(loaded_category_id).position
+            for loaded_category_id in app_core.categories if loaded_category_id != category_id
+        }
+        save_balance_delta(category_type, -category_total)
+
+    app_core.month_snapshots.clear()#Id of removed category can be given to a new category
     WindowsRegistry.CategorySettingsWindow.setWindowTitle(" ")
     WindowsRegistry.CategorySettingsWindow.hide()
 
-    app_core.categories[category_id].window.deleteLater()
-    app_core.categories[category_id].settings.deleteLater()
-    app_core.categories[category_id].add_transaction.deleteLater()
-    app_core.categories[category_id].edit_transaction.deleteLater()
-    app_core.categories[category_id].delete_transaction.deleteLater()
-    del app_core.categories[category_id]
+    release_category(app_core.categories.pop(category_id))
     logger.debug(f"Category {category_name} removed")
 
-    for category_id in app_core.categories:
-        category = app_core.db.category_query.get_category_by_id(category_id)
-        app_core.categories[category_id].position = category.position
+    for loaded_category_id, position in categories_positions.items():
+        app_core.categories[loaded_category_id].position = position
 
-    calculate_current_balance()
+    show_balance_delta(category_type, -category_total)
     reset_focused_category()
     show_information_message(LanguageStructure.Categories.get_translation(7))
 
@@ -296,35 +379,104 @@ def change_category_position() -> int:
     app_core.db.category_query.change_category_position(new_position, old_position, category.id, category_type)
     logger.debug(f"Category {category_name} position ({old_position}) changed to {new_position}")
     
-    remove_categories_from_list()
-    load_categories()
-    activate_categories()
+    reorder_categories()
     WindowsRegistry.ChangeCategoryPositionWindow.hide()
     WindowsRegistry.CategorySettingsWindow.hide()
 
     return 1
 
 
-def update_category_total_value(category_id:int) -> None:
-    """Update category total value. It updates the total value label for the category in the GUI."""
+def reorder_categories() -> None:
+    """Update positions of categories and move their widgets to new places in layouts. Widgets aren't recreated.
+    If loaded categories don't match categories in database, all categories are loaded again with pooled widgets.
+    """
 
     app_core = AppCore.instance()
-    app_core.categories[category_id].total_value_label.setText(
-        LanguageStructure.Categories.get_translation(10) +
-        str(round(app_core.db.statistics_query.get_monthly_transactions_sum(
+    categories = app_core.db.category_query.get_all_categories()
+    if {category.id for category in categories} != set(app_core.categories):
+        remove_categories_from_list()
+        load_categories()
+        activate_categories()
+        return
+
+    app_core.categories = {category.id:app_core.categories[category.id] for category in categories}
+
+    for category in categories:
+        app_core.categories[category.id].position = category.position
+
+    for category_type in (CategoryType.Income, CategoryType.Expense):
+        categories_layout = get_category_layout(category_type)
+        type_categories = [
+            loaded_category for loaded_category in app_core.categories.values() if loaded_category.type == category_type
+        ]
+        for index, loaded_category in enumerate(type_categories, start=1):#Create category button is the first widget
+            categories_layout.removeWidget(loaded_category.window)
+            categories_layout.insertWidget(index, loaded_category.window)
+    reset_focused_category()
+
+
+def update_category_total_value(category_id:int, category_total:float|None = None) -> None:
+    """Update category total value. It updates the total value label for the category in the GUI.
+
+        Arguments
+        ---------
+            `category_id` : (int) - ID of the category to update.
+            `category_total` : (float | None) - Already calculated month total. If None it is queried from db.
+    """
+
+    app_core = AppCore.instance()
+    if category_total is None:
+        category_total = app_core.db.statistics_query.get_monthly_transactions_sum(
             category_id, app_core.current_year, app_core.current_month
-        ), 2)))
+        )
+
+    app_core.categories[category_id].total_value_label.setText(
+        LanguageStructure.Categories.get_translation(10) + str(round(category_total, 2))
+    )
+
+
+def activate_category(category:Category) -> None:
+    """Connect category buttons to their respective functions.
+
+        Arguments
+        ---------
+            `category` : (Category) - Category to activate.
+    """
+
+    category.settings.clicked.connect(partial(show_category_settings, category.name))
+    category.add_transaction.clicked.connect(partial(show_add_transaction_window, category.name))
+    category.edit_transaction.clicked.connect(partial(show_edit_transaction_window, category.name, category.table_data))
+    category.delete_transaction.clicked.connect(partial(remove_transaction, category.table_data, category.id))
+    category.activated = True
+    logger.debug(f"Category {category.name} activated")
+
+
+def deactivate_category(category:Category) -> None:
+    """Disconnect category buttons before widgets of category are reused.
+
+        Arguments
+        ---------
+            `category` : (Category) - Category to deactivate.
+    """
+
+    if not category.activated:
+        return
+
+    category.settings.clicked.disconnect()
+    category.add_transaction.clicked.disconnect()
+    category.edit_transaction.clicked.disconnect()
+    category.delete_transaction.clicked.disconnect()
+    category.activated = False
 
 
 def activate_categories() -> None:
-    """Activate all categories. It connects all category buttons to their respective functions."""
-
-    for category_id, category in AppCore.instance().categories.items():
-        category.settings.clicked.connect(partial(show_category_settings, category.name))
-        category.add_transaction.clicked.connect(partial(show_add_transaction_window, category.name))
-        category.edit_transaction.clicked.connect(partial(show_edit_transaction_window, category.name, category.table_data))
-        category.delete_transaction.clicked.connect(partial(remove_transaction, category.table_data, category_id))
-        logger.debug(f"Category {category.name} activated")
+    """Activate all categories. It connects all category buttons to their respective functions.
+    Categories that are already activated are skipped, so their buttons aren't connected twice.
+    """
+
+    for category in AppCore.instance().categories.values():
+        if not category.activated:
+            activate_category(category)
 
 
 def reset_focused_category() -> None:
@@ -167,17 +167,17 @@ def change_language() -> None:
                 LanguageStructure.GeneralManagement.get_translation(4)
             )
 
-    for category in app_core.categories:
-        app_core.categories[category].delete_transaction.setText(LanguageStructure.GeneralManagement.get_translation(0))
-        app_core.categories[category].add_transaction.setText(LanguageStructure.GeneralManagement.get_translation(1))
-        app_core.categories[category].edit_transaction.setText(LanguageStructure.GeneralManagement.get_translation(7))
-        app_core.categories[category].table_data.setHorizontalHeaderLabels(
+    for category in (*app_core.categories.values(), *app_core.account_view_states.get_categories()):
+        category.delete_transaction.setText(LanguageStructure.GeneralManagement.get_translation(0))
+        category.add_transaction.setText(LanguageStructure.GeneralManagement.get_translation(1))
+        category.edit_transaction.setText(LanguageStructure.GeneralManagement.get_translation(7))
+        category.transactions.set_headers(
             (LanguageStructure.Transactions.get_translation(0),
             LanguageStructure.Transactions.get_translation(1),
             LanguageStructure.Transactions.get_translation(2))
         )
-        total_value = app_core.categories[category].total_value_label.text().split(" ")[1]
-        app_core.categories[category].total_value_label.setText(
+        total_value = category.total_value_label.text().split(" ")[1]
+        category.total_value_label.setText(
             LanguageStructure.Categories.get_translation(10) + total_value
         )
 
@@ -191,6 +191,7 @@ def change_language() -> None:
     WindowsRegistry.BackupManagementWindow.create_backup.setText(LanguageStructure.BackupManagement.get_translation(1))
     WindowsRegistry.BackupManagementWindow.delete_backup.setText(LanguageStructure.BackupManagement.get_translation(2))
     WindowsRegistry.BackupManagementWindow.load_backup.setText(LanguageStructure.BackupManagement.get_translation(3))
+    WindowsRegistry.BackupManagementWindow.rebuild_search_index.setText(LanguageStructure.BackupManagement.get_translation(23))
     WindowsRegistry.SettingsWindow.auto_backup.setText(LanguageStructure.BackupManagement.get_translation(4))
     WindowsRegistry.SettingsWindow.auto_backup_status.setText(
         f"{LanguageStructure.BackupManagement.get_translation(8)} {LanguageStructure.BackupManagement.get_translation(5)}"
@@ -285,6 +286,22 @@ def change_language() -> None:
         )
     )
 
+    WindowsRegistry.SettingsWindow.transactions_import.setText(LanguageStructure.TransactionsImport.get_translation(0))
+    WindowsRegistry.TransactionsImportWindow.setWindowTitle(LanguageStructure.TransactionsImport.get_translation(0))
+    WindowsRegistry.TransactionsImportWindow.choose_file.setText(LanguageStructure.TransactionsImport.get_translation(1))
+    if WindowsRegistry.TransactionsImportWindow.selected_file_path == "":
+        WindowsRegistry.TransactionsImportWindow.file_path.setText(LanguageStructure.TransactionsImport.get_translation(2))
+    WindowsRegistry.TransactionsImportWindow.default_income_category_label.setText(LanguageStructure.TransactionsImport.get_translation(3))
+    WindowsRegistry.TransactionsImportWindow.default_expense_category_label.setText(LanguageStructure.TransactionsImport.get_translation(4))
+    WindowsRegistry.TransactionsImportWindow.import_transactions.setText(LanguageStructure.TransactionsImport.get_translation(5))
+    WindowsRegistry.TransactionsImportWindow.file_format_description.setText(LanguageStructure.TransactionsImport.get_translation(9))
+
+    WindowsRegistry.SettingsWindow.transactions_export.setText(LanguageStructure.TransactionsExport.get_translation(0))
+    WindowsRegistry.TransactionsExportWindow.setWindowTitle(LanguageStructure.TransactionsExport.get_translation(0))
+    WindowsRegistry.TransactionsExportWindow.file_format_label.setText(LanguageStructure.TransactionsExport.get_translation(1))
+    WindowsRegistry.TransactionsExportWindow.all_accounts.setText(LanguageStructure.TransactionsExport.get_translation(2))
+    WindowsRegistry.TransactionsExportWindow.export_transactions.setText(LanguageStructure.TransactionsExport.get_translation(3))
+
 
  
 def change_language_during_add_account(language:int | str) -> None:
@@ -1,4 +1,5 @@
-from typing import cast
+from __future__ import annotations
+from typing import TYPE_CHECKING, cast
 from datetime import date
 
 from AppObjects.windows_registry import WindowsRegistry
@@ -6,7 +7,11 @@ from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 
 from languages import LanguageStructure
-from project_configuration import CategoryType
+from project_configuration import CategoryType, ERROR_LOG_FILE
+from backend.search_query import SearchCriteria
+
+if TYPE_CHECKING:
+    from backend.search_query import SearchCursor, SearchPage
 
 
 logger = get_logger(__name__)
@@ -37,6 +42,10 @@ def perform_search() -> None | int:
     WindowsRegistry.SearchWindow.categories_selection.setHidden(True)
     WindowsRegistry.SearchWindow.transactions_list.setHidden(False)
 
+    AppCore.instance().query_executor.cancel("search")#Results of previous search mustn't be shown
+    WindowsRegistry.SearchWindow.search_criteria = None
+    WindowsRegistry.SearchWindow.next_page_cursor = None
+    WindowsRegistry.SearchWindow.page_loading = False
     WindowsRegistry.SearchWindow.transactions_list.clear()
     WindowsRegistry.SearchWindow.transaction_amount.setText(
         LanguageStructure.Search.get_translation(7).replace("%transaction_amount%", str(0))
@@ -62,18 +71,85 @@ def perform_search() -> None | int:
         f"Performing search with name: {search_name}, value: {search_value} operand: {search_value_operand},"
         f" from_date: {from_date}, to_date: {to_date}, categories_id: {categories_id}"
     )
+    WindowsRegistry.SearchWindow.search_criteria = SearchCriteria(
+        search_name, search_value, search_value_operand, from_date, to_date, categories_id
+    )
+    load_search_page(None)
+    return None
+
+
+def load_search_page(cursor:SearchCursor|None) -> None:
+    """Load page of current search on a query executor worker thread. New search cancels loading of the previous one.
+
+        Arguments
+        ---------
+            `cursor` : (SearchCursor|None) - Cursor of the previous page. None for the first page.
+    """
+
+    search_criteria = WindowsRegistry.SearchWindow.search_criteria
+    if search_criteria is None:
+        return
+
     app_core = AppCore.instance()
-    transactions = app_core.db.search_query.search_transactions(
-        name_substring=search_name,
-        value=search_value,
-        value_operand=search_value_operand,
-        from_date=from_date,
-        to_date=to_date,
-        categories_id=categories_id
+    search_query = app_core.db.search_query
+    query_executor = app_core.query_executor
+    WindowsRegistry.SearchWindow.next_page_cursor = None
+    WindowsRegistry.SearchWindow.page_loading = True
+    query_executor.submit(
+        "search",
+        lambda: search_query.search_transactions_page(
+            search_criteria, cursor, is_cancelled=query_executor.is_current_query_cancelled
+        ),
+        show_search_page,
+        fail_search_page
     )
-    logger.debug(f"Found {len(transactions)} transactions matching search criteria")
 
-    for transaction in transactions:
+
+def fail_search_page(error:Exception) -> None:
+    """Show error message when page of search results couldn't be loaded. Search can be performed again.
+
+        Arguments
+        ---------
+            `error` : (Exception) - Error raised during search.
+    """
+
+    logger.error(f"Search failed. {error}")
+    WindowsRegistry.SearchWindow.page_loading = False
+    WindowsRegistry.Messages.failed_query.setText(
+        LanguageStructure.Messages.get_translation(39).replace(r"%error_log%", ERROR_LOG_FILE)
+    )
+    WindowsRegistry.Messages.failed_query.exec()
+
+
+def load_next_search_page(scroll_value:int) -> None:
+    """Load next page of search results when transactions list is scrolled close to its end.
+
+        Arguments
+        ---------
+            `scroll_value` : (int) - Current value of transactions list vertical scroll bar.
+    """
+
+    scroll_bar = WindowsRegistry.SearchWindow.transactions_list.verticalScrollBar()
+    if WindowsRegistry.SearchWindow.page_loading or WindowsRegistry.SearchWindow.next_page_cursor is None:
+        return
+
+    if scroll_value >= scroll_bar.maximum() - scroll_bar.pageStep():
+        load_search_page(WindowsRegistry.SearchWindow.next_page_cursor)
+
+
+def show_search_page(search_page:SearchPage) -> None:
+    """Add found transactions to search window. Sums of all found transactions are shown with the first page.
+
+        Arguments
+        ---------
+            `search_page` : (SearchPage) - Page of found transactions.
+    """
+
+    app_core = AppCore.instance()
+    WindowsRegistry.SearchWindow.next_page_cursor = search_page.next_cursor
+    WindowsRegistry.SearchWindow.page_loading = False
+
+    for transaction in search_page.transactions:
         transaction_name = transaction.name
         if transaction_name == "":
             transaction_name = LanguageStructure.Statistics.get_translation(12)
@@ -90,19 +166,17 @@ def perform_search() -> None | int:
             f"Date: <b>{transaction.date}</b>  Value: <b>{transaction.value}</b>"
         )
 
-    transaction_amount = len(transactions)
-    income_transactions_sum = sum(
-        transaction.value for transaction in transactions if app_core.categories[transaction.category_id].type == CategoryType.Income
-    )
-    expense_transactions_sum = sum(
-        transaction.value for transaction in transactions if app_core.categories[transaction.category_id].type == CategoryType.Expense
-    )
+    if search_page.summary is None:
+        return
 
-    income_transactions_display = round(income_transactions_sum, 2) or LanguageStructure.GeneralManagement.get_translation(12)
-    expense_transactions_display = round(expense_transactions_sum, 2) or LanguageStructure.GeneralManagement.get_translation(12)
+    logger.debug(f"Found {search_page.summary.transactions_count} transactions matching search criteria")
+    income_transactions_display = search_page.summary.income_sum or LanguageStructure.GeneralManagement.get_translation(12)
+    expense_transactions_display = search_page.summary.expense_sum or LanguageStructure.GeneralManagement.get_translation(12)
 
     WindowsRegistry.SearchWindow.transaction_amount.setText(
-        LanguageStructure.Search.get_translation(7).replace("%transaction_amount%", str(transaction_amount))
+        LanguageStructure.Search.get_translation(7).replace(
+            "%transaction_amount%", str(search_page.summary.transactions_count)
+        )
     )
 
     WindowsRegistry.SearchWindow.income_transactions_sum.setText(
@@ -112,5 +186,3 @@ def perform_search() -> None | int:
     WindowsRegistry.SearchWindow.expense_transactions_sum.setText(
         LanguageStructure.Search.get_translation(9).replace(r"%expense_sum%", f"{expense_transactions_display}")
     )
-
-    return None
\ No newline at end of file
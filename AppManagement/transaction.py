@@ -1,40 +1,58 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from PySide6.QtCore import Qt
+from typing import TYPE_CHECKING, cast
 from datetime import date
 from calendar import monthrange
 
-from GUI.gui_constants import ALIGNMENT
-
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from AppObjects.windows_registry import WindowsRegistry
-from DesktopQtToolkit.table_widget import CustomTableWidgetItem
-from DesktopQtToolkit.Utils import get_table_widget_item
+from GUI.ComplexWidgets.transactions_table_model import TransactionsTableModel
 
 from languages import LanguageStructure
 from project_configuration import CategoryType
-from AppManagement.balance import update_account_balance
+from AppManagement.balance import save_balance_delta, show_balance_delta
 from project_configuration import MAX_TRANSACTION_VALUE
 
 if TYPE_CHECKING:
-    from DesktopQtToolkit.table_widget import CustomTableWidget
+    from PySide6.QtCore import QModelIndex
+    from DesktopQtToolkit.table_view import CustomTableView
+    from backend.models import Transaction
 
 
 
 logger = get_logger(__name__)
 
-def show_edit_transaction_window(category_name:str, category_data:CustomTableWidget) -> int:
+
+def get_selected_cells(category_data:CustomTableView) -> list[QModelIndex]:
+    """Get selected cells of category table ordered by row and column.
+
+        Arguments
+        ---------
+
+        `category_data` : (CustomTableView) - Table view with transaction data.
+    """
+
+    return sorted(category_data.selectionModel().selectedIndexes(), key=lambda cell: (cell.row(), cell.column()))
+
+
+def invalidate_current_month() -> None:
+    """Remove cached snapshot of the current month after its transactions were changed."""
+
+    app_core = AppCore.instance()
+    app_core.month_snapshots.invalidate((app_core.db.account_id, app_core.current_year, app_core.current_month))
+
+
+def show_edit_transaction_window(category_name:str, category_data:CustomTableView) -> int:
     """Show edit transaction window. It allows to edit transaction data.
 
         Arguments
         ---------
 
         `category_name` : (str) - Name of the category. It will be shown in the window title.
-        `category_data` : (CustomTableWidget) - Table widget with transaction data. It will be used to get selected row data.
+        `category_data` : (CustomTableView) - Table view with transaction data. It will be used to get selected row data.
     """
 
-    selected_row = category_data.selectedItems()
+    selected_row = get_selected_cells(category_data)
 
     if len(selected_row) == 0 or len(selected_row) < 3:
         return WindowsRegistry.Messages.unselected_row.exec()
@@ -46,17 +64,19 @@ def show_edit_transaction_window(category_name:str, category_data:CustomTableWid
     WindowsRegistry.TransactionManagementWindow.message.setText(LanguageStructure.TransactionsMessages.get_translation(0))
     WindowsRegistry.TransactionManagementWindow.setWindowTitle(category_name)
 
-    WindowsRegistry.TransactionManagementWindow.transaction_name.setText(selected_row[0].text())
+    WindowsRegistry.TransactionManagementWindow.transaction_name.setText(str(selected_row[0].data()))
     WindowsRegistry.TransactionManagementWindow.transaction_name.setFocus()
-    WindowsRegistry.TransactionManagementWindow.transaction_day.setText(selected_row[1].text())
-    WindowsRegistry.TransactionManagementWindow.transaction_value.setText(selected_row[2].text())
+    WindowsRegistry.TransactionManagementWindow.transaction_day.setText(str(selected_row[1].data()))
+    WindowsRegistry.TransactionManagementWindow.transaction_value.setText(str(selected_row[2].data()))
 
-    WindowsRegistry.TransactionManagementWindow.transaction_id = int(get_table_widget_item(category_data, selected_row[0].row(), 3).text())
+    transactions = cast(TransactionsTableModel, category_data.model())
+    WindowsRegistry.TransactionManagementWindow.transaction_id = transactions.get_transaction_id(selected_row[0].row())
     return WindowsRegistry.TransactionManagementWindow.exec()
 
 
-def update_transaction(transaction_id:int, transaction_name:str, transaction_day:int, transaction_value:float, category_data:CustomTableWidget) -> None:
-    """Update transaction data. It updates transaction data in database and GUI.
+def update_transaction(transaction_id:int, transaction_name:str, transaction_day:int, transaction_value:float, transactions:TransactionsTableModel) -> float:
+    """Update transaction in database and apply change of its value to account balance.
+    It only runs queries, so it's run inside unit of work and GUI is updated after the unit of work is committed.
 
         Arguments
         ---------
@@ -65,32 +85,18 @@ def update_transaction(transaction_id:int, transaction_name:str, transaction_day
         `transaction_name` : (str) - Transaction name.
         `transaction_day` : (int) - Transaction day.
         `transaction_value` : (float) - Transaction value.
-        `category_data` : (CustomTableWidget) - Table widget with transaction data. It will be used to update selected row data.
+        `transactions` : (TransactionsTableModel) - Model of category table. Previous value of transaction is read from it.
+        Returns
+        -------
+        `float` - Difference between new and previous value of transaction.
     """
 
     app_core = AppCore.instance()
+    category_type = CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex())
+    values_difference = transaction_value - transactions.get_value(transactions.get_row(transaction_id))
     app_core.db.transaction_query.update_transaction(transaction_id, transaction_name, transaction_day, transaction_value)
-                
-    for row in range(category_data.rowCount()):
-        if int(get_table_widget_item(category_data, row, 3).text()) == transaction_id:
-            get_table_widget_item(category_data, row, 0).setText(transaction_name)
-            get_table_widget_item(category_data, row, 1).setText(str(transaction_day))
-
-            old_value = float(get_table_widget_item(category_data, row, 2).text())
-            values_difference = transaction_value - old_value
-
-            if CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex()) == CategoryType.Income:
-                app_core.current_total_income += values_difference
-                app_core.current_balance += values_difference
-            else:
-                app_core.current_total_expenses += values_difference
-                app_core.current_balance -=  values_difference
-            
-            app_core.current_balance = round(app_core.current_balance, 2)
-            app_core.current_total_income = round(app_core.current_total_income, 2)
-            app_core.current_total_expenses = round(app_core.current_total_expenses, 2)
-
-            get_table_widget_item(category_data, row, 2).setText(str(transaction_value))
+    save_balance_delta(category_type, values_difference)
+    return values_difference
 
 
 def show_add_transaction_window(category_name:str) -> None:
@@ -113,16 +119,20 @@ def show_add_transaction_window(category_name:str) -> None:
     WindowsRegistry.TransactionManagementWindow.exec()
 
 
-def add_transaction(transaction_name:str, transaction_day:int, transaction_value:int|float, category_data:CustomTableWidget, category_id:int) -> None:
-    """Add transaction data. It adds transaction data to database and GUI.
+def add_transaction(transaction_name:str, transaction_day:int, transaction_value:int|float, category_id:int) -> Transaction:
+    """Add transaction to database and apply its value to account balance.
+    It only runs queries, so it's run inside unit of work and GUI is updated after the unit of work is committed.
+
         Arguments
         ---------
 
         `transaction_name` : (str) - Transaction name.
         `transaction_day` : (int) - Transaction day.
         `transaction_value` : (int|float) - Transaction value.
-        `category_data` : (CustomTableWidget) - Table widget with transaction data. It will be used to update selected row data.
         `category_id` : (int) - Category id. It will be used to find category which transaction should be added to.
+        Returns
+        -------
+        `Transaction` - Added transaction.
     """
 
     app_core = AppCore.instance()
@@ -132,36 +142,8 @@ def add_transaction(transaction_name:str, transaction_day:int, transaction_value
         transaction_value,
         transaction_name
     )
-
-    if CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex()) == CategoryType.Income:
-        app_core.current_total_income = round(app_core.current_total_income + transaction_value, 2)
-        app_core.current_balance = round(app_core.current_balance + transaction_value, 2)
-    else:
-        app_core.current_total_expenses = round(app_core.current_total_expenses + transaction_value, 2)
-        app_core.current_balance = round(app_core.current_balance - transaction_value, 2)
-
-    row = category_data.rowCount()
-    category_data.setRowCount(row+1)
-
-    day = CustomTableWidgetItem(str(transaction.date.day))
-    day.setTextAlignment(ALIGNMENT.AlignCenter)
-    day.setFlags(~ Qt.ItemFlag.ItemIsEditable)# symbol ~ mean invert bytes in this case cells in table can't be edited
-
-    value = CustomTableWidgetItem(str(transaction.value))
-    value.setTextAlignment(ALIGNMENT.AlignCenter)
-    value.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-
-    transaction_id = CustomTableWidgetItem(str(transaction.id))
-    transaction_id.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-
-    name = CustomTableWidgetItem(transaction_name)
-    name.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-
-    category_data.setItem(row, 0, name)
-    category_data.setItem(row, 1, day)
-    category_data.setItem(row, 2, value)
-    category_data.setItem(row, 3, transaction_id)
-    WindowsRegistry.TransactionManagementWindow.hide()
+    save_balance_delta(CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex()), transaction_value)
+    return transaction
 
 
 def transaction_data_handler() -> int:
@@ -174,17 +156,6 @@ def transaction_data_handler() -> int:
     raw_transaction_value = WindowsRegistry.TransactionManagementWindow.transaction_value.text()
 
     app_core = AppCore.instance()
-    category_type = CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex())
-    category = app_core.db.category_query.get_category(
-        WindowsRegistry.TransactionManagementWindow.windowTitle(), category_type
-    )
-    if category is None:
-        logger.error(f"Category {WindowsRegistry.TransactionManagementWindow.windowTitle()} not found. Transaction haven't been handled.")
-        raise RuntimeError(f"Category {WindowsRegistry.TransactionManagementWindow.windowTitle()} not found. Transaction haven't been handled.")
-    
-    category_id = category.id
-    category_data = app_core.categories[category_id].table_data
-
     _, max_month_day = monthrange(app_core.current_year, app_core.current_month)
 
     if raw_transaction_day == "" or raw_transaction_value == "":
@@ -200,10 +171,37 @@ def transaction_data_handler() -> int:
         return WindowsRegistry.Messages.day_out_range.exec()
 
     transaction_value = float(raw_transaction_value)
+    category_type = CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex())
+    is_update = WindowsRegistry.TransactionManagementWindow.button.text() == LanguageStructure.GeneralManagement.get_translation(5)
+
+    #Category lookup, write, balance change and month total are one unit of work. Messages and GUI are handled after it.
+    with app_core.db.unit_of_work():
+        category = app_core.db.category_query.get_category(
+            WindowsRegistry.TransactionManagementWindow.windowTitle(), category_type
+        )
+        if category is None:
+            logger.error(f"Category {WindowsRegistry.TransactionManagementWindow.windowTitle()} not found. Transaction haven't been handled.")
+            raise RuntimeError(f"Category {WindowsRegistry.TransactionManagementWindow.windowTitle()} not found. Transaction haven't been handled.")
+        
+        category_id = category.id
+        transactions = app_core.categories[category_id].transactions
+
+        min_value = category.transaction_min_value if category.transaction_min_value is not None else 0
+        max_value = category.transaction_max_value if category.transaction_max_value is not None else 0
+        value_anomalous = min_value != 0 and transaction_value < min_value or max_value != 0 and transaction_value > max_value
+
+        if not value_anomalous:
+            if is_update:
+                transaction_id = WindowsRegistry.TransactionManagementWindow.transaction_id
+                values_difference = update_transaction(transaction_id, transaction_name, transaction_day, transaction_value, transactions)
+            else:
+                transaction = add_transaction(transaction_name, transaction_day, transaction_value, category_id)
+                values_difference = transaction_value
+            category_total = app_core.db.statistics_query.get_monthly_transactions_sum(
+                category_id, app_core.current_year, app_core.current_month
+            )
 
-    min_value = category.transaction_min_value if category.transaction_min_value is not None else 0
-    max_value = category.transaction_max_value if category.transaction_max_value is not None else 0
-    if min_value != 0 and transaction_value < min_value or max_value != 0 and transaction_value > max_value:
+    if value_anomalous:
         WindowsRegistry.Messages.transaction_value_anomalous.setText(
             LanguageStructure.Messages.get_translation(37)
             .replace("%transaction_value%", str(transaction_value))
@@ -212,73 +210,67 @@ def transaction_data_handler() -> int:
         )
         return WindowsRegistry.Messages.transaction_value_anomalous.exec()
 
-    if WindowsRegistry.TransactionManagementWindow.button.text() == LanguageStructure.GeneralManagement.get_translation(5): #Update 
-        transaction_id = WindowsRegistry.TransactionManagementWindow.transaction_id
-        update_transaction(transaction_id, transaction_name, transaction_day, transaction_value, category_data)
+    invalidate_current_month()
+    if is_update:
+        transactions.update_transaction(transaction_id, transaction_day, transaction_value, transaction_name)
         logger.debug(f"Transaction updated: {transaction_name}\
                      | {transaction_day}\
                      | {transaction_value}\
                      | Transaction id: {transaction_id}\
                      | Category id: {category_id}")
-    else: #Add
-        add_transaction(transaction_name, transaction_day, transaction_value, category_data, category_id)
+    else:
+        transactions.add_transaction(transaction.id, transaction.date.day, transaction.value, transaction_name)
         logger.debug(f"Transaction added: {transaction_name}\
                      | {transaction_day}\
                      | {transaction_value}\
                      | Category id: {category_id}")
 
+    show_balance_delta(category_type, values_difference)
+    update_category_total_value(category_id, category_total)
 
-    update_category_total_value(category_id)
-    
-    update_account_balance()
     WindowsRegistry.TransactionManagementWindow.hide()
     return 1
         
 
 
-def remove_transaction(category_data:CustomTableWidget, category_id:int) -> int:
+def remove_transaction(category_data:CustomTableView, category_id:int) -> int:
     """Remove transaction. It removes transaction from database and GUI.
 
         Arguments
         ---------
 
-        `category_data` : (CustomTableWidget) - Table widget with transaction data. It will be used to delete selected row data.
+        `category_data` : (CustomTableView) - Table view with transaction data. It will be used to delete selected row data.
         `category_id` : (int) - Category id. It will be used to find category which transaction should be removed from.
     """
     from AppManagement.category import update_category_total_value
 
     app_core = AppCore.instance()
-    selected_row = category_data.selectedItems()
+    transactions = cast(TransactionsTableModel, category_data.model())
+    selected_row = get_selected_cells(category_data)
 
     if len(selected_row) == 0 or len(selected_row) < 3:
         return WindowsRegistry.Messages.unselected_row.exec()
     
     if len(selected_row) == 3 and selected_row[0].row() == selected_row[1].row() and selected_row[0].row() == selected_row[2].row():
-        transaction_id = int(get_table_widget_item(category_data, selected_row[0].row(), 3).text())
+        transaction_id = transactions.get_transaction_id(selected_row[0].row())
     else:
         return WindowsRegistry.Messages.only_one_row.exec()
 
     WindowsRegistry.Messages.delete_transaction_confirmation.exec()
     ok_button = WindowsRegistry.Messages.delete_transaction_confirmation.ok_button
     if WindowsRegistry.Messages.delete_transaction_confirmation.clickedButton() == ok_button:
-        transaction_value = float(selected_row[2].text())
-        app_core.db.transaction_query.delete_transaction(transaction_id)
-
-        category_data.removeRow(selected_row[0].row())
-
-        update_category_total_value(category_id)
-
-        if CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex()) == CategoryType.Income:
-            app_core.current_total_income -= transaction_value
-            app_core.current_balance -= transaction_value
-        else:
-            app_core.current_total_expenses -= transaction_value
-            app_core.current_balance += transaction_value
-        
-        app_core.current_balance = round(app_core.current_balance, 2)
-        app_core.current_total_income = round(app_core.current_total_income, 2)
-        app_core.current_total_expenses = round(app_core.current_total_expenses, 2)
-
-        update_account_balance()
+        category_type = CategoryType.get(WindowsRegistry.MainWindow.Incomes_and_expenses.currentIndex())
+        transaction_value = transactions.get_value(transactions.get_row(transaction_id))
+        with app_core.db.unit_of_work():
+            app_core.db.transaction_query.delete_transaction(transaction_id)
+            save_balance_delta(category_type, -transaction_value)
+            category_total = app_core.db.statistics_query.get_monthly_transactions_sum(
+                category_id, app_core.current_year, app_core.current_month
+            )
+
+        invalidate_current_month()
+        transactions.remove_transaction(transaction_id)
+        update_category_total_value(category_id, category_total)
+        show_balance_delta(category_type, -transaction_value)
     
     return 1
\ No newline at end of file
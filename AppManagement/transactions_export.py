@@ -0,0 +1,226 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import os
+import csv
+import json
+from itertools import islice
+from contextlib import closing
+
+from PySide6.QtWidgets import QFileDialog
+
+from AppObjects.app_core import AppCore
+from AppObjects.logger import get_logger
+from AppObjects.windows_registry import WindowsRegistry
+
+from languages import LanguageStructure
+from project_configuration import EXPORT_CHUNK_SIZE, EXPORT_FILES_FILTERS
+
+if TYPE_CHECKING:
+    from typing import Iterable, Callable, TextIO
+    from backend.transaction_query import ExportedTransaction
+
+
+
+logger = get_logger(__name__)
+
+EXPORT_COLUMNS = ("account", "date", "value", "name", "category")
+
+
+def write_csv_chunk(file:TextIO, transactions:list[ExportedTransaction], write_header:bool) -> None:
+    """Write transactions to CSV file. Columns are compatible with transactions import.
+
+        Arguments
+        ---------
+            `file` : (TextIO) - Opened file.
+            `transactions` : (list[ExportedTransaction]) - Transactions to write.
+            `write_header` : (bool) - Write columns names before transactions.
+    """
+
+    writer = csv.writer(file)
+    if write_header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(
+        (account_name, transaction_date.isoformat(), round(value, 2), name, category_name)
+        for account_name, transaction_date, value, name, category_name in transactions
+    )
+
+
+def write_jsonl_chunk(file:TextIO, transactions:list[ExportedTransaction], write_header:bool) -> None:
+    """Write transactions to JSON Lines file. Every transaction is a JSON object on its own line.
+
+        Arguments
+        ---------
+            `file` : (TextIO) - Opened file.
+            `transactions` : (list[ExportedTransaction]) - Transactions to write.
+            `write_header` : (bool) - Not used, JSON Lines files don't have header.
+    """
+
+    file.writelines(
+        json.dumps(dict(zip(
+            EXPORT_COLUMNS, (account_name, transaction_date.isoformat(), round(value, 2), name, category_name)
+        )), ensure_ascii=False) + "\n"
+        for account_name, transaction_date, value, name, category_name in transactions
+    )
+
+
+EXPORT_WRITERS:dict[str, Callable[[TextIO, list[ExportedTransaction], bool], None]] = {
+    "csv":write_csv_chunk,
+    "jsonl":write_jsonl_chunk
+}
+
+
+def write_transactions(
+        file_path:str,
+        file_format:str,
+        transactions:Iterable[ExportedTransaction],
+        progress_callback:Callable[[int], None]|None = None
+    ) -> int:
+    """Write transactions to file chunk by chunk, so only one chunk is kept in memory.
+    Transactions are written to a temporary file that replaces the target file only when export succeeds.
+
+        Arguments
+        ---------
+            `file_path` : (str) - Path to export file.
+            `file_format` : (str) - Key of EXPORT_WRITERS.
+            `transactions` : (Iterable[ExportedTransaction]) - Transactions to write. Can be a generator.
+            `progress_callback` : (Callable|None) - Function called with amount of written transactions after every chunk.
+        Returns
+        -------
+            `int` - Amount of exported transactions.
+    """
+
+    if file_format not in EXPORT_WRITERS:
+        logger.error(f"Unknown export format {file_format}")
+        raise ValueError(f"Unknown export format {file_format}")
+
+    write_chunk = EXPORT_WRITERS[file_format]
+    temporary_file_path = f"{file_path}.part"
+    exported = 0
+    transactions_iterator = iter(transactions)
+
+    try:
+        with open(temporary_file_path, "w", newline="", encoding="utf-8") as file:
+            write_chunk(file, [], True)
+
+            while chunk := list(islice(transactions_iterator, EXPORT_CHUNK_SIZE)):
+                write_chunk(file, chunk, False)
+                exported += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(exported)
+
+        os.replace(temporary_file_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_file_path):
+            os.remove(temporary_file_path)
+        raise
+
+    return exported
+
+
+def show_transactions_export_window() -> int:
+    """Show transactions export window."""
+
+    WindowsRegistry.TransactionsExportWindow.export_status.setText("")
+    WindowsRegistry.TransactionsExportWindow.export_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsExportWindow.export_progress.setValue(0)
+    return WindowsRegistry.TransactionsExportWindow.exec()
+
+
+def choose_export_file() -> None:
+    """Show file dialog to choose export file and start export."""
+
+    file_format:str = WindowsRegistry.TransactionsExportWindow.file_format.currentData()
+    file_path, _ = QFileDialog.getSaveFileName(
+        WindowsRegistry.TransactionsExportWindow,
+        LanguageStructure.TransactionsExport.get_translation(7),
+        filter=EXPORT_FILES_FILTERS[file_format]
+    )
+    if file_path:
+        export_transactions(file_path)
+
+
+def show_export_progress(exported_transactions:int) -> None:
+    """Show amount of exported transactions.
+
+        Arguments
+        ---------
+            `exported_transactions` : (int) - Amount of transactions written to file.
+    """
+
+    WindowsRegistry.TransactionsExportWindow.export_status.setText(
+        LanguageStructure.TransactionsExport.get_translation(4).replace("%exported%", str(exported_transactions))
+    )
+
+
+def finish_export(exported_transactions:int) -> None:
+    """Show export result.
+
+        Arguments
+        ---------
+            `exported_transactions` : (int) - Amount of exported transactions.
+    """
+
+    logger.info(f"Transactions exported: {exported_transactions}")
+    WindowsRegistry.TransactionsExportWindow.export_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsExportWindow.export_progress.setValue(1)
+    WindowsRegistry.TransactionsExportWindow.export_status.setText(
+        LanguageStructure.TransactionsExport.get_translation(5).replace("%exported%", str(exported_transactions))
+    )
+    WindowsRegistry.TransactionsExportWindow.export_transactions.setEnabled(True)
+
+
+def fail_export(error:Exception) -> None:
+    """Show export error. Partially written file is removed.
+
+        Arguments
+        ---------
+            `error` : (Exception) - Error raised during export.
+    """
+
+    logger.error(f"Transactions export failed. {error}")
+    WindowsRegistry.TransactionsExportWindow.export_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsExportWindow.export_progress.setValue(0)
+    WindowsRegistry.TransactionsExportWindow.export_status.setText(
+        LanguageStructure.TransactionsExport.get_translation(6).replace("%error%", str(error))
+    )
+    WindowsRegistry.TransactionsExportWindow.export_transactions.setEnabled(True)
+
+
+def export_transactions(file_path:str) -> None:
+    """Export transactions to file. Transactions are read and written on a query executor worker thread.
+
+        Arguments
+        ---------
+            `file_path` : (str) - Path to export file. Extension of chosen format is added if it's missing.
+    """
+
+    app_core = AppCore.instance()
+    file_format:str = WindowsRegistry.TransactionsExportWindow.file_format.currentData()
+    all_accounts = WindowsRegistry.TransactionsExportWindow.all_accounts.isChecked()
+    if os.path.splitext(file_path)[1].lower() != f".{file_format}":
+        file_path = f"{file_path}.{file_format}"
+    transaction_query = app_core.db.transaction_query
+
+    WindowsRegistry.TransactionsExportWindow.export_transactions.setEnabled(False)
+    WindowsRegistry.TransactionsExportWindow.export_progress.setRange(0, 0)#Busy indicator, amount of transactions is unknown
+    show_export_progress(0)
+    logger.info(f"Exporting transactions to {file_path}")
+
+    def _export() -> int:
+        """Stream transactions into file. Generator is closed on the worker thread, so its session is closed there too."""
+
+        with closing(transaction_query.stream_transactions_for_export(all_accounts)) as transactions:
+            return write_transactions(
+                file_path,
+                file_format,
+                transactions,
+                lambda exported_transactions: app_core.query_executor.report_progress("transactions_export", exported_transactions)
+            )
+
+    app_core.query_executor.submit(
+        "transactions_export",
+        _export,
+        finish_export,
+        fail_export,
+        show_export_progress
+    )
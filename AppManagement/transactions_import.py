@@ -0,0 +1,290 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, NamedTuple
+import os
+import re
+import csv
+from datetime import date
+
+from PySide6.QtWidgets import QFileDialog
+
+from AppObjects.app_core import AppCore
+from AppObjects.logger import get_logger
+from AppObjects.windows_registry import WindowsRegistry
+
+from languages import LanguageStructure
+from project_configuration import CategoryType, IMPORT_FILES_FILTER
+from AppManagement.balance import calculate_current_balance
+from AppManagement.category import remove_categories_from_list, load_categories, activate_categories
+
+if TYPE_CHECKING:
+    from typing import Iterator, Iterable
+    from backend.transaction_query import ImportedTransaction
+
+
+
+logger = get_logger(__name__)
+
+OFX_TAG_PATTERN = re.compile(r"<(/?)(\w+)>([^<\r\n]*)")
+CSV_COLUMNS = ("date", "value", "name", "category")
+
+
+class ParsedTransaction(NamedTuple):
+    """Transaction read from imported file. Negative value means expense. Import id is set only for OFX transactions (FITID)."""
+
+    date: date
+    value: float
+    name: str
+    category_name: str | None
+    import_id: str | None = None
+
+
+def parse_csv_transactions(file_path:str) -> Iterator[ParsedTransaction]:
+    """Read transactions from CSV file line by line. File must have date (YYYY-MM-DD) and value columns,\
+    name and category columns are optional.
+
+        Arguments
+        ---------
+            `file_path` : (str) - Path to CSV file.
+        Yields
+        ------
+            `ParsedTransaction` - Transaction of the line.
+    """
+
+    with open(file_path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None or not {"date", "value"} <= {column.strip().lower() for column in reader.fieldnames}:
+            logger.error(f"CSV file {file_path} doesn't have date and value columns.")
+            raise ValueError(f"CSV file must have columns: {', '.join(CSV_COLUMNS)}")
+        reader.fieldnames = [column.strip().lower() for column in reader.fieldnames]
+
+        for line_number, row in enumerate(reader, start=2):
+            try:
+                transaction_date = date.fromisoformat(row["date"].strip())
+                value = float(row["value"].strip().replace(",", "."))
+            except (ValueError, AttributeError) as ex:
+                logger.error(f"Invalid transaction in line {line_number} of CSV file {file_path}. {ex}")
+                raise ValueError(f"Invalid transaction in line {line_number}: {ex}") from ex
+
+            category_name = (row.get("category") or "").strip()
+            yield ParsedTransaction(transaction_date, value, (row.get("name") or "").strip(), category_name or None)
+
+
+def parse_ofx_transactions(file_path:str) -> Iterator[ParsedTransaction]:
+    """Read transactions (STMTTRN blocks) from OFX or QFX file line by line. Both SGML (OFX 1) and XML (OFX 2) files are supported.
+
+        Arguments
+        ---------
+            `file_path` : (str) - Path to OFX file.
+        Yields
+        ------
+            `ParsedTransaction` - Transaction of the block. OFX doesn't have categories, so category name is None.
+    """
+
+    def _build_transaction(fields:dict[str, str]) -> ParsedTransaction:
+        try:
+            transaction_date = date(int(fields["DTPOSTED"][:4]), int(fields["DTPOSTED"][4:6]), int(fields["DTPOSTED"][6:8]))
+            value = float(fields["TRNAMT"].replace(",", "."))
+        except (KeyError, ValueError) as ex:
+            logger.error(f"Invalid transaction {fields} in OFX file {file_path}. {ex}")
+            raise ValueError(f"Invalid OFX transaction {fields.get('FITID', '')}: {ex}") from ex
+
+        return ParsedTransaction(
+            transaction_date, value, fields.get("NAME") or fields.get("MEMO") or "", None, fields.get("FITID") or None
+        )
+
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        transaction_fields:dict[str, str]|None = None
+        for line in file:
+            for closing, tag, value in OFX_TAG_PATTERN.findall(line):
+                if tag == "STMTTRN":
+                    if closing and transaction_fields is not None:
+                        yield _build_transaction(transaction_fields)
+                        transaction_fields = None
+                    elif not closing:
+                        transaction_fields = {}
+                elif transaction_fields is not None and not closing:
+                    transaction_fields[tag] = value.strip()
+
+
+def resolve_transactions_categories(
+        transactions:Iterable[ParsedTransaction],
+        categories:dict[tuple[str, str], int],
+        default_income_category_id:int,
+        default_expense_category_id:int
+    ) -> Iterator[ImportedTransaction]:
+    """Convert parsed transactions into imported transactions of account categories.
+    Category is found by name among categories of the value sign type (negative value is expense),\
+    so transactions never change their sign. Transactions without known category of their type are added to default categories.
+
+        Arguments
+        ---------
+            `transactions` : (Iterable[ParsedTransaction]) - Parsed transactions.
+            `categories` : (dict) - Category id by category name and type.
+            `default_income_category_id` : (int) - Category of incomes without known category.
+            `default_expense_category_id` : (int) - Category of expenses without known category.
+        Yields
+        ------
+            `ImportedTransaction` - Date, value (always positive), name, category id and import id of transaction.
+    """
+
+    for transaction in transactions:
+        if transaction.value < 0:
+            category_type, default_category_id = CategoryType.Expense, default_expense_category_id
+        else:
+            category_type, default_category_id = CategoryType.Income, default_income_category_id
+
+        category_id = default_category_id
+        if transaction.category_name is not None:
+            category_id = categories.get((transaction.category_name, category_type), default_category_id)
+
+        yield transaction.date, abs(transaction.value), transaction.name, category_id, transaction.import_id
+
+
+def show_transactions_import_window() -> int:
+    """Show transactions import window. Default categories are filled with current account categories."""
+
+    app_core = AppCore.instance()
+    Incomes_categories, Expenses_categories = app_core.get_income_and_expense_categories()
+    if len(Incomes_categories) == 0 or len(Expenses_categories) == 0:
+        return WindowsRegistry.Messages.no_category.exec()
+
+    WindowsRegistry.TransactionsImportWindow.default_income_category.clear()
+    WindowsRegistry.TransactionsImportWindow.default_expense_category.clear()
+    for category in Incomes_categories:
+        WindowsRegistry.TransactionsImportWindow.default_income_category.addItem(category.name, category.id)
+    for category in Expenses_categories:
+        WindowsRegistry.TransactionsImportWindow.default_expense_category.addItem(category.name, category.id)
+
+    WindowsRegistry.TransactionsImportWindow.import_status.setText("")
+    WindowsRegistry.TransactionsImportWindow.import_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsImportWindow.import_progress.setValue(0)
+    return WindowsRegistry.TransactionsImportWindow.exec()
+
+
+def choose_import_file() -> None:
+    """Show file dialog to choose CSV or OFX file to import."""
+
+    file_path, _ = QFileDialog.getOpenFileName(
+        WindowsRegistry.TransactionsImportWindow,
+        LanguageStructure.TransactionsImport.get_translation(1),
+        filter=IMPORT_FILES_FILTER
+    )
+    if file_path:
+        set_import_file(file_path)
+
+
+def set_import_file(file_path:str) -> None:
+    """Set file to import.
+
+        Arguments
+        ---------
+            `file_path` : (str) - Path to CSV or OFX file.
+    """
+
+    WindowsRegistry.TransactionsImportWindow.selected_file_path = file_path
+    WindowsRegistry.TransactionsImportWindow.file_path.setText(os.path.basename(file_path))
+
+
+def show_import_progress(processed_transactions:int) -> None:
+    """Show amount of processed transactions.
+
+        Arguments
+        ---------
+            `processed_transactions` : (int) - Amount of imported and skipped transactions.
+    """
+
+    WindowsRegistry.TransactionsImportWindow.import_status.setText(
+        LanguageStructure.TransactionsImport.get_translation(6).replace("%processed%", str(processed_transactions))
+    )
+
+
+def finish_import(import_result:tuple[int, int]) -> None:
+    """Reload categories and account balance after import and show import result.
+
+        Arguments
+        ---------
+            `import_result` : (tuple[int, int]) - Amount of imported transactions and amount of skipped duplicates.
+    """
+
+    imported, skipped = import_result
+    logger.info(f"Transactions imported: {imported} | Skipped duplicates: {skipped}")
+
+    AppCore.instance().month_snapshots.clear()#Imported transactions can be in any month
+    remove_categories_from_list()
+    load_categories()
+    activate_categories()
+    calculate_current_balance()
+
+    WindowsRegistry.TransactionsImportWindow.import_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsImportWindow.import_progress.setValue(1)
+    WindowsRegistry.TransactionsImportWindow.import_status.setText(
+        LanguageStructure.TransactionsImport.get_translation(7)
+        .replace("%imported%", str(imported))
+        .replace("%skipped%", str(skipped))
+    )
+    WindowsRegistry.TransactionsImportWindow.import_transactions.setEnabled(True)
+
+
+def fail_import(error:Exception) -> None:
+    """Show import error. Nothing is imported since import is a single transaction.
+
+        Arguments
+        ---------
+            `error` : (Exception) - Error raised during import.
+    """
+
+    logger.error(f"Transactions import failed. {error}")
+    WindowsRegistry.TransactionsImportWindow.import_progress.setRange(0, 1)
+    WindowsRegistry.TransactionsImportWindow.import_progress.setValue(0)
+    WindowsRegistry.TransactionsImportWindow.import_status.setText(
+        LanguageStructure.TransactionsImport.get_translation(8).replace("%error%", str(error))
+    )
+    WindowsRegistry.TransactionsImportWindow.import_transactions.setEnabled(True)
+
+
+def import_transactions() -> None:
+    """Import transactions from chosen file. File is parsed and imported on a query executor worker thread."""
+
+    app_core = AppCore.instance()
+    file_path = WindowsRegistry.TransactionsImportWindow.selected_file_path
+    if file_path == "":
+        WindowsRegistry.TransactionsImportWindow.import_status.setText(LanguageStructure.TransactionsImport.get_translation(2))
+        return
+
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        parse_transactions = parse_csv_transactions
+    else:
+        parse_transactions = parse_ofx_transactions
+
+    categories = {(category.name, category.type):category_id for category_id, category in app_core.categories.items()}
+    default_income_category_id:int = WindowsRegistry.TransactionsImportWindow.default_income_category.currentData()
+    default_expense_category_id:int = WindowsRegistry.TransactionsImportWindow.default_expense_category.currentData()
+    transaction_query = app_core.db.transaction_query
+
+    WindowsRegistry.TransactionsImportWindow.import_transactions.setEnabled(False)
+    WindowsRegistry.TransactionsImportWindow.import_progress.setRange(0, 0)#Busy indicator, amount of transactions is unknown
+    show_import_progress(0)
+    logger.info(f"Importing transactions from {file_path}")
+
+    search_query = app_core.db.search_query
+
+    def _import() -> tuple[int, int]:
+        """Import transactions and merge search index segments created by bulk insert."""
+
+        import_result = transaction_query.import_transactions(
+            resolve_transactions_categories(
+                parse_transactions(file_path), categories, default_income_category_id, default_expense_category_id
+            ),
+            lambda processed_transactions: app_core.query_executor.report_progress("transactions_import", processed_transactions)
+        )
+        if import_result[0] != 0:
+            search_query.optimize_index()
+        return import_result
+
+    app_core.query_executor.submit(
+        "transactions_import",
+        _import,
+        finish_import,
+        fail_import,
+        show_import_progress
+    )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from collections import OrderedDict
+
+from project_configuration import ACCOUNT_VIEW_STATES_CACHE_SIZE
+
+if TYPE_CHECKING:
+    from AppObjects.category import Category
+
+
+
+class AccountViewState:
+    """View of account that isn't shown now. Widgets of its categories are hidden but keep loaded month transactions,
+    so switching back to the account doesn't load categories and balance again.
+    """
+
+    def __init__(
+            self,
+            categories:dict[int, Category],
+            year:int,
+            month:int,
+            created_date:str,
+            current_balance:float,
+            current_total_income:float,
+            current_total_expenses:float
+        ) -> None:
+
+        self.categories = categories
+        self.year = year
+        self.month = month
+        self.created_date = created_date
+        self.current_balance = current_balance
+        self.current_total_income = current_total_income
+        self.current_total_expenses = current_total_expenses
+
+
+
+class AccountViewStatesCache:
+    """LRU cache of views of recently used accounts. Only accounts that aren't shown are cached,
+    view of shown account is always up to date, so account writes only have to remove views of other accounts.
+    `shown_account_id` is id of account which categories are shown, it can differ from account id of database controller
+    while new account is created.
+    """
+
+    def __init__(self, max_size:int = ACCOUNT_VIEW_STATES_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.states:OrderedDict[int, AccountViewState] = OrderedDict()
+        self.shown_account_id:int|None = None
+
+
+    def put(self, account_id:int, state:AccountViewState) -> list[AccountViewState]:
+        """Cache view of account that is switched from.
+
+            Arguments
+            ---------
+                `account_id` : (int) - Id of account.
+                `state` : (AccountViewState) - View of account.
+            Returns
+            -------
+                `list[AccountViewState]` - Least recently used views removed from cache. Their widgets must be released.
+        """
+
+        evicted_states:list[AccountViewState] = []
+        previous_state = self.states.pop(account_id, None)
+        if previous_state is not None:
+            evicted_states.append(previous_state)
+
+        self.states[account_id] = state
+        while len(self.states) > self.max_size:
+            evicted_states.append(self.states.popitem(last=False)[1])
+        return evicted_states
+
+
+    def take(self, account_id:int) -> AccountViewState|None:
+        """Remove view of account from cache to show it.
+
+            Arguments
+            ---------
+                `account_id` : (int) - Id of account.
+            Returns
+            -------
+                `AccountViewState|None` - Cached view. None if account isn't cached.
+        """
+
+        return self.states.pop(account_id, None)
+
+
+    def get_categories(self) -> list[Category]:
+        """Get categories of all cached views."""
+
+        return [category for state in self.states.values() for category in state.categories.values()]
+
+
+    def clear(self) -> list[AccountViewState]:
+        """Remove all views. Used when database is replaced.
+
+            Returns
+            -------
+                `list[AccountViewState]` - Removed views. Their widgets must be released.
+        """
+
+        states = list(self.states.values())
+        self.states.clear()
+        self.shown_account_id = None
+        return states
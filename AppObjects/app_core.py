@@ -9,11 +9,15 @@ from PySide6.QtWidgets import QApplication
 
 from project_configuration import USER_CONF_PATH, APP_DIRECTORY, BACKUPS_DIRECTORY, TEST_BACKUPS_DIRECTORY,\
 DEVELOPMENT_MODE, ERROR_LOG_FILE, ERROR_LOG_START_MESSAGE, APP_HASHES_DIRECTORY, CACHE_DIRECTORY, VERSION_FILE_NAME,\
-CategoryType
+STATISTICS_CACHE_DIRECTORY, TEST_STATISTICS_CACHE_DIRECTORY, CategoryType
 
 from AppObjects.single_instance_guard import SingleInstanceGuard
 from AppObjects.backup import Backup
 from AppObjects.user_config import UserConfig
+from AppObjects.query_executor import QueryExecutor
+from AppObjects.statistics_cache import StatisticsCache
+from AppObjects.month_snapshots import MonthSnapshotsCache
+from AppObjects.account_view_states import AccountViewStatesCache
 from AppObjects.logger import get_logger
 
 if TYPE_CHECKING:
@@ -58,13 +62,19 @@ class AppCore:
         self.current_balance = 0.0
         self.current_total_income = 0.0
         self.current_total_expenses = 0.0
+        self.balance_verified_accounts:set[int|None] = set()#Balance of account is verified against transactions once per session
 
         self.accounts_list:list[Account] = []
         self.categories:dict[int, Category] = {}
+        self.categories_pool:list[Category] = []
         self.focused_income_category:Category | None
         self.focused_expense_category:Category | None
 
         self.db = db_controller
+        self.query_executor = QueryExecutor()
+        self.statistics_cache = StatisticsCache(TEST_STATISTICS_CACHE_DIRECTORY if test_mode else STATISTICS_CACHE_DIRECTORY)
+        self.month_snapshots = MonthSnapshotsCache()
+        self.account_view_states = AccountViewStatesCache()
         self.backups:dict[str, Backup] = {}
 
         self.instance_guard = single_instance_guard
@@ -107,6 +117,8 @@ class AppCore:
         self.config.load_user_config()
         logger.info("User configuration loaded")
 
+        self.db.set_db_profile(self.config.db_profile)
+
         if self.test_mode:
             os.makedirs(TEST_BACKUPS_DIRECTORY, exist_ok=True)
         else:
@@ -151,6 +163,7 @@ class AppCore:
         """End session. It closes the database connection, removes the instance guard, and closes all sockets."""
 
         self.instance_guard.close_sockets()
+        self.query_executor.shutdown()
         self.db.close_connection()
         logger.info("Ending session")
     
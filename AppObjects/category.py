@@ -3,7 +3,8 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from PySide6.QtWidgets import QLabel, QPushButton, QToolButton, QWidget
-    from DesktopQtToolkit.table_widget import CustomTableWidget
+    from DesktopQtToolkit.table_view import CustomTableView
+    from GUI.ComplexWidgets.transactions_table_model import TransactionsTableModel
 
 
 class Category:
@@ -11,7 +12,8 @@ class Category:
     Represents a category in the application.
     It contains the `id`, `type` (income or expense), `name`, `position` (for sorting),
     and labels like `total_value_label`, `name_label`, buttons like `settings`, 
-    `table_data`, `add_transaction`, `delete_transaction`, and `edit_transaction` for displaying and managing the category.
+    `table_data` with its `transactions` model, `add_transaction`, `delete_transaction`, and `edit_transaction` for displaying and managing the category.
+    `activated` shows if buttons are connected, widgets of removed categories are disconnected and reused.
     """
 
     def __init__(
@@ -26,7 +28,8 @@ class Category:
             total_value_label:QLabel,
             name_label:QLabel,
             settings:QToolButton,
-            table_data:CustomTableWidget,
+            table_data:CustomTableView,
+            transactions:TransactionsTableModel,
             add_transaction:QPushButton,
             delete_transaction:QPushButton,
             edit_transaction:QPushButton,
@@ -44,7 +47,9 @@ class Category:
         self.name_label = name_label
         self.settings = settings
         self.table_data = table_data
+        self.transactions = transactions
         self.add_transaction = add_transaction
         self.delete_transaction = delete_transaction
         self.edit_transaction = edit_transaction
-        self.window = window
\ No newline at end of file
+        self.window = window
+        self.activated = False
\ No newline at end of file
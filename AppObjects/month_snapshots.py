@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, TypeAlias
+from collections import OrderedDict
+
+from project_configuration import MONTH_SNAPSHOTS_CACHE_SIZE
+
+if TYPE_CHECKING:
+    from backend.models import TransactionRow
+
+
+
+MonthKey:TypeAlias = tuple[int|None, int, int]#Account id, year and month
+MonthSnapshot:TypeAlias = tuple[dict[int, list["TransactionRow"]], dict[int, float]]#Transactions and totals of categories
+
+
+class MonthSnapshotsCache:
+    """In memory LRU cache of loaded months. Snapshot of a month is the transactions and totals of its categories,
+    so switching to a cached month doesn't query database. Snapshots are used only from the GUI thread.
+    Month is invalidated when its transactions are changed, and every invalidation increases generation of the month,
+    so snapshot prefetched before the change isn't cached.
+    """
+
+    def __init__(self, max_size:int = MONTH_SNAPSHOTS_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.snapshots:OrderedDict[MonthKey, tuple[tuple[int, ...], MonthSnapshot]] = OrderedDict()
+        self.generations:dict[MonthKey, int] = {}
+        self.clears_amount = 0
+
+
+    def get(self, month_key:MonthKey, categories_id:list[int]) -> MonthSnapshot|None:
+        """Get snapshot of month.
+
+            Arguments
+            ---------
+                `month_key` : (MonthKey) - Account id, year and month.
+                `categories_id` : (list[int]) - Categories that are loaded.
+            Returns
+            -------
+                `MonthSnapshot|None` - Snapshot. None if month isn't cached or was cached for other categories.
+        """
+
+        cached_snapshot = self.snapshots.get(month_key)
+        if cached_snapshot is None or cached_snapshot[0] != tuple(categories_id):
+            return None
+
+        self.snapshots.move_to_end(month_key)
+        return cached_snapshot[1]
+
+
+    def contains(self, month_key:MonthKey, categories_id:list[int]) -> bool:
+        """Check if snapshot of month is cached for categories without marking it as recently used."""
+
+        cached_snapshot = self.snapshots.get(month_key)
+        return cached_snapshot is not None and cached_snapshot[0] == tuple(categories_id)
+
+
+    def get_generation(self, month_key:MonthKey) -> int:
+        """Get amount of invalidations of month and clears of cache. Prefetch saves it before query is started."""
+
+        return self.generations.get(month_key, 0) + self.clears_amount
+
+
+    def put(self, month_key:MonthKey, categories_id:list[int], snapshot:MonthSnapshot, generation:int|None = None) -> None:
+        """Cache snapshot of month and remove least recently used snapshots if there are too many of them.
+
+            Arguments
+            ---------
+                `month_key` : (MonthKey) - Account id, year and month.
+                `categories_id` : (list[int]) - Categories of snapshot.
+                `snapshot` : (MonthSnapshot) - Transactions and totals of categories.
+                `generation` : (int|None) - Generation of month when snapshot query was started.\
+                    Snapshot isn't cached if month was invalidated since then.
+        """
+
+        if generation is not None and generation != self.get_generation(month_key):
+            return
+
+        self.snapshots[month_key] = (tuple(categories_id), snapshot)
+        self.snapshots.move_to_end(month_key)
+        while len(self.snapshots) > self.max_size:
+            self.snapshots.popitem(last=False)
+
+
+    def invalidate(self, month_key:MonthKey) -> None:
+        """Remove snapshot of month after its transactions were added, updated or deleted."""
+
+        self.snapshots.pop(month_key, None)
+        self.generations[month_key] = self.generations.get(month_key, 0) + 1
+
+
+    def clear(self) -> None:
+        """Remove all snapshots. Used when transactions of unknown months were changed or database was replaced."""
+
+        self.snapshots.clear()
+        self.clears_amount += 1
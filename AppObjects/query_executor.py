@@ -0,0 +1,225 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, TypeVar
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError, wait
+from threading import Lock, local
+
+from PySide6.QtCore import QObject, Signal
+
+from AppObjects.logger import get_logger
+from project_configuration import QUERY_EXECUTOR_MAX_WORKERS
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+
+
+logger = get_logger(__name__)
+T = TypeVar("T")
+
+class QueryExecutor(QObject):
+    """This class is used to run database queries on worker threads, so the GUI thread doesn't block on SQLite.
+    Every worker session takes its own connection from the engine pool. Results are delivered back to the GUI thread
+    through a Qt signal. Queries are submitted to named channels and a new query cancels the previous query of its channel.
+    """
+
+    query_done = Signal(object)
+    query_progress = Signal(object)
+
+    def __init__(self, max_workers:int = QUERY_EXECUTOR_MAX_WORKERS) -> None:
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="QueryExecutor")
+        self.lock = Lock()
+        self.channels_generations:dict[str, int] = {}
+        self.channels_futures:dict[str, Future[Any]] = {}
+        self.pending_futures:set[Future[Any]] = set()
+        self.channels_progress_callbacks:dict[str, Callable[[int], None]] = {}
+        self.worker_data = local()
+
+        self.query_done.connect(self.deliver_result)
+        self.query_progress.connect(self.deliver_progress)
+
+
+    def submit(
+            self,
+            channel:str,
+            query:Callable[[], T],
+            on_result:Callable[[T], None],
+            on_error:Callable[[Exception], None]|None = None,
+            on_progress:Callable[[int], None]|None = None
+        ) -> Future[T]:
+        """Run query on a worker thread. Previous query of the same channel is cancelled, and its result is dropped.
+
+            Arguments
+            ---------
+                `channel` : (str) - Name of the channel. Only the latest query of the channel delivers its result.
+                `query` : (Callable) - Function that runs database queries. It must not touch any widget.
+                `on_result` : (Callable) - Function called on the GUI thread with query result.
+                `on_error` : (Callable|None) - Function called on the GUI thread with query exception.\
+                    If not set exception is raised on the GUI thread.
+                `on_progress` : (Callable|None) - Function called on the GUI thread with progress reported by the query.
+            Returns
+            -------
+                `Future` - Future of the query.
+        """
+
+        self.cancel(channel)
+        with self.lock:
+            generation = self.channels_generations.get(channel, 0)
+            future = self.executor.submit(self.run_query, channel, generation, query)
+            self.channels_futures[channel] = future
+            self.pending_futures.add(future)
+            if on_progress is not None:
+                self.channels_progress_callbacks[channel] = on_progress
+
+        future.add_done_callback(
+            lambda done_future: self.query_done.emit((channel, generation, done_future, on_result, on_error))
+        )
+        return future
+
+
+    def run_query(self, channel:str, generation:int, query:Callable[[], T]) -> T:
+        """Run query on the worker thread. Channel and generation of the query are saved, so the query can check
+        if it was cancelled with `is_current_query_cancelled`.
+
+            Arguments
+            ---------
+                `channel` : (str) - Name of the channel of the query.
+                `generation` : (int) - Generation of the channel when query was submitted.
+                `query` : (Callable) - Function that runs database queries.
+            Returns
+            -------
+                Query result.
+        """
+
+        self.worker_data.current_query = (channel, generation)
+        try:
+            return query()
+        finally:
+            self.worker_data.current_query = None
+
+
+    def is_current_query_cancelled(self) -> bool:
+        """Check if query running on the current worker thread was cancelled or superseded by a newer query of its channel.
+        Long queries call it to stop early.
+
+            Returns
+            -------
+                `bool` - True if query result won't be delivered.
+        """
+
+        current_query:tuple[str, int]|None = getattr(self.worker_data, "current_query", None)
+        if current_query is None:
+            return False
+
+        channel, generation = current_query
+        with self.lock:
+            return self.channels_generations.get(channel, 0) != generation
+
+
+    def cancel(self, channel:str) -> None:
+        """Cancel query of the channel. If it is already running, its result won't be delivered.
+
+            Arguments
+            ---------
+                `channel` : (str) - Name of the channel to cancel.
+        """
+
+        with self.lock:
+            self.channels_generations[channel] = self.channels_generations.get(channel, 0) + 1
+            future = self.channels_futures.pop(channel, None)
+            self.channels_progress_callbacks.pop(channel, None)
+
+        if future is not None and future.cancel():
+            logger.debug(f"Query of channel {channel} cancelled")
+
+
+    def cancel_all(self) -> None:
+        """Cancel queries of all channels and wait until running queries finish."""
+
+        for channel in list(self.channels_futures):
+            self.cancel(channel)
+
+        with self.lock:
+            running_futures = list(self.pending_futures)
+        wait(running_futures)
+
+
+    def has_pending_queries(self) -> bool:
+        """Check if there are queries whose results haven't been delivered yet.
+
+            Returns
+            -------
+                `bool` - True if any query is still running or waiting for delivery.
+        """
+
+        with self.lock:
+            return len(self.pending_futures) != 0
+
+
+    def report_progress(self, channel:str, progress:int) -> None:
+        """Report progress of the query. It's called from the worker thread, progress is delivered on the GUI thread.
+
+            Arguments
+            ---------
+                `channel` : (str) - Name of the channel of the query.
+                `progress` : (int) - Progress value. Its meaning is defined by the query.
+        """
+
+        self.query_progress.emit((channel, progress))
+
+
+    def deliver_progress(self, progress_data:tuple[str, int]) -> None:
+        """Deliver query progress on the GUI thread. Progress of cancelled queries is dropped.
+
+            Arguments
+            ---------
+                `progress_data` : (tuple) - Channel and progress value of the query.
+        """
+
+        channel, progress = progress_data
+        with self.lock:
+            on_progress = self.channels_progress_callbacks.get(channel)
+
+        if on_progress is not None:
+            on_progress(progress)
+
+
+    def deliver_result(self, result_data:tuple[
+        str, int, Future[Any], Callable[[Any], None], Callable[[Exception], None]|None
+    ]) -> None:
+        """Deliver query result on the GUI thread. Results of cancelled and superseded queries are dropped.
+
+            Arguments
+            ---------
+                `result_data` : (tuple) - Channel, generation, future and callbacks of the query.
+        """
+
+        channel, generation, future, on_result, on_error = result_data
+        with self.lock:
+            self.pending_futures.discard(future)
+            superseded = self.channels_generations.get(channel, 0) != generation
+            if not superseded:
+                self.channels_futures.pop(channel, None)
+                self.channels_progress_callbacks.pop(channel, None)
+
+        if superseded:
+            return
+
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as ex:
+            if on_error is None:
+                raise
+            on_error(ex)
+            return
+
+        on_result(result)
+
+
+    def shutdown(self) -> None:
+        """Cancel all queries and stop worker threads."""
+
+        self.cancel_all()
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+from threading import Lock
+
+from AppObjects.logger import get_logger
+from project_configuration import STATISTICS_CACHE_MAX_SIZE
+
+if TYPE_CHECKING:
+    from typing import Hashable
+
+
+
+logger = get_logger(__name__)
+
+
+def encode_statistics(data:Any) -> Any:
+    """Convert statistics to JSON compatible data. Dictionaries with integer keys and tuples are tagged,
+    so `decode_statistics` restores them exactly.
+
+        Arguments
+        ---------
+            `data` : (Any) - Statistics made of dicts, tuples, lists, numbers, strings and None.
+        Returns
+        -------
+            `Any` - JSON compatible data.
+    """
+
+    if isinstance(data, dict):
+        return {"d":[[encode_statistics(key), encode_statistics(value)] for key, value in data.items()]}
+    if isinstance(data, tuple):
+        return {"t":[encode_statistics(item) for item in data]}
+    if isinstance(data, list):
+        return [encode_statistics(item) for item in data]
+    return data
+
+
+def decode_statistics(data:Any) -> Any:
+    """Restore statistics converted by `encode_statistics`.
+
+        Arguments
+        ---------
+            `data` : (Any) - Data loaded from JSON.
+        Returns
+        -------
+            `Any` - Statistics.
+    """
+
+    if isinstance(data, dict):
+        if "d" in data:
+            return {decode_statistics(key):decode_statistics(value) for key, value in data["d"]}
+        return tuple(decode_statistics(item) for item in data["t"])
+    if isinstance(data, list):
+        return [decode_statistics(item) for item in data]
+    return data
+
+
+
+class StatisticsCache:
+    """Disk cache of collected statistics. Every entry is a JSON file stored with data version of its period,
+    entry is used only while period data version is the same. Least recently used entries are removed
+    when cache is bigger than `max_size`.
+    """
+
+    def __init__(self, directory:str, max_size:int = STATISTICS_CACHE_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.lock = Lock()
+
+
+    def get_entry_path(self, key:Hashable) -> str:
+        """Get path of entry file. File name is hash of the key."""
+
+        return os.path.join(self.directory, f"{hashlib.sha256(repr(key).encode()).hexdigest()}.json")
+
+
+    def get(self, key:Hashable, version:int) -> Any|None:
+        """Get cached statistics.
+
+            Arguments
+            ---------
+                `key` : (Hashable) - Key of statistics made of builtin types (kind, account, period and categories).
+                `version` : (int) - Current data version of the period.
+            Returns
+            -------
+                `Any|None` - Cached statistics. None if they aren't cached or were cached with different data version.
+        """
+
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, encoding="utf-8") as file:
+                entry = json.load(file)
+            if entry["key"] != repr(key) or entry["version"] != version:
+                return None
+
+            os.utime(entry_path)#Modification time is used as last access time by eviction
+            return decode_statistics(entry["data"])
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.error(f"Statistics cache entry {entry_path} can't be read. {ex}")
+            return None
+
+
+    def put(self, key:Hashable, version:int, data:Any) -> None:
+        """Write statistics to cache and remove least recently used entries if cache is too big.
+        Entry is written to a temporary file that replaces the entry file, so readers never see a partially written entry.
+
+            Arguments
+            ---------
+                `key` : (Hashable) - Key of statistics made of builtin types (kind, account, period and categories).
+                `version` : (int) - Data version of the period that statistics were collected from.
+                `data` : (Any) - Statistics made of dicts, tuples, lists, numbers, strings and None.
+        """
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.directory, suffix=".part", delete=False, encoding="utf-8"
+            ) as file:
+                json.dump({"key":repr(key), "version":version, "data":encode_statistics(data)}, file, separators=(",", ":"))
+            os.replace(file.name, self.get_entry_path(key))
+        except OSError as ex:
+            logger.error(f"Statistics can't be written to cache. {ex}")
+            return
+
+        self.evict()
+
+
+    def evict(self) -> None:
+        """Remove least recently used entries until cache fits `max_size`."""
+
+        with self.lock:
+            entries:list[tuple[float, int, str]] = []
+            with os.scandir(self.directory) as directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.name.endswith(".json"):
+                        entry_stat = directory_entry.stat()
+                        entries.append((entry_stat.st_mtime, entry_stat.st_size, directory_entry.path))
+
+            cache_size = sum(entry_size for _, entry_size, _ in entries)
+            for _, entry_size, entry_path in sorted(entries):
+                if cache_size <= self.max_size:
+                    break
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    pass
+                cache_size -= entry_size
+
+
+    def clear(self) -> None:
+        """Remove all entries. Used when database is replaced, because data versions of other database don't match cached ones."""
+
+        with self.lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+        logger.info("Statistics cache cleared")
@@ -32,6 +32,14 @@ class UserConfig:
         PRE_RELEASE = "prerelease"
 
 
+    class DBProfile(Enum):
+        """Database profile class. It stores all SQLite durability/performance profiles."""
+
+        SAFE = "safe"
+        BALANCED = "balanced"
+        FAST = "fast"
+
+
     class ShortcutId:
         """Shortcut ID class. It stores all shortcut names, that are used in the app."""
 
@@ -64,6 +72,7 @@ class UserConfig:
         self.max_legacy_backups:int = MAX_RECOMMENDED_LEGACY_BACKUPS
         self.auto_backup_removal_enabled:bool = True
         self.update_channel:str = UserConfig.UpdateChannel.RELEASE.value
+        self.db_profile:str = UserConfig.DBProfile.BALANCED.value
 
         self.default_shortcuts_values = {
             UserConfig.ShortcutId.CLOSE_CURRENT_WINDOW:"X",
@@ -113,6 +122,10 @@ class UserConfig:
                 "Auto_backup_removal_enabled", self.auto_backup_removal_enabled)
             )
 
+            self.db_profile = str(User_conf.get("Database", {}).get("Profile", self.db_profile))
+            if self.db_profile not in [profile.value for profile in UserConfig.DBProfile]:
+                self.db_profile = UserConfig.DBProfile.BALANCED.value
+
             for shortcut_id, shortcut_value in self.shortcuts.items():
                 if shortcut_id in User_conf["Shortcuts"]:
                     self.shortcuts[shortcut_id] = str(User_conf["Shortcuts"].get(shortcut_id, shortcut_value))
@@ -149,6 +162,9 @@ class UserConfig:
                 "Max_legacy_backups":MAX_RECOMMENDED_LEGACY_BACKUPS,
                 "Auto_backup_removal_enabled":True
             },
+            "Database":{
+                "Profile":UserConfig.DBProfile.BALANCED.value
+            },
             "Shortcuts":{
                 **self.shortcuts,
             }
@@ -178,6 +194,9 @@ class UserConfig:
                 "Max_legacy_backups":self.max_legacy_backups,
                 "Auto_backup_removal_enabled":self.auto_backup_removal_enabled
             },
+            "Database":{
+                "Profile":self.db_profile
+            },
             "Shortcuts":{
                 **self.shortcuts
             }
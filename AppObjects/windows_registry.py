@@ -14,6 +14,8 @@ from GUI.windows.update_progress import UpdateProgressWindow
 from GUI.windows.information_message import InformationMessage
 from GUI.windows.shortcuts import ShortcutsWindow
 from GUI.windows.search import SearchWindow
+from GUI.windows.transactions_import import TransactionsImportWindow
+from GUI.windows.transactions_export import TransactionsExportWindow
 
 
 
@@ -62,3 +64,5 @@ class WindowsRegistry:
 
     ShortcutsWindow = ShortcutsWindow(MainWindow, MainWindow.sub_windows)
     SearchWindow = SearchWindow(MainWindow, MainWindow.sub_windows)
+    TransactionsImportWindow = TransactionsImportWindow(MainWindow, MainWindow.sub_windows)
+    TransactionsExportWindow = TransactionsExportWindow(MainWindow, MainWindow.sub_windows)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from time import monotonic
+
+from PySide6.QtCore import QObject, QTimer, QEvent
+
+from project_configuration import LAZY_PANEL_RELEASE_TIMEOUT, LAZY_PANEL_RELEASE_CHECK_INTERVAL
+
+if TYPE_CHECKING:
+    from typing import Callable
+    from PySide6.QtWidgets import QListWidget, QScrollArea
+
+
+
+class LazyPanel:
+    """List widget that is populated by `populate` function only while it's visible."""
+
+    def __init__(self, data:QListWidget, populate:Callable[[], None]) -> None:
+        self.data = data
+        self.populate = populate
+        self.populated = False
+        self.last_visible_time = 0.0
+
+
+
+class LazyPanels(QObject):
+    """Populates list widgets placed in scroll areas only when they become visible.
+    Panels that weren't visible for LAZY_PANEL_RELEASE_TIMEOUT milliseconds are cleared and populated again when they are shown.
+    """
+
+    def __init__(self, parent:QObject|None = None) -> None:
+        super().__init__(parent)
+        self.panels:list[LazyPanel] = []
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.timeout.connect(self.populate_visible)
+
+        self.release_timer = QTimer(self)
+        self.release_timer.setInterval(LAZY_PANEL_RELEASE_CHECK_INTERVAL)
+        self.release_timer.timeout.connect(self.release_hidden)
+
+
+    def watch_scroll_area(self, scroll_area:QScrollArea) -> None:
+        """Check visibility of panels when scroll area is scrolled, resized or shown.
+
+            Arguments
+            ---------
+                `scroll_area` : (QScrollArea) - Scroll area that contains panels.
+        """
+
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_update)
+        scroll_area.horizontalScrollBar().valueChanged.connect(self.schedule_update)
+        scroll_area.viewport().installEventFilter(self)
+
+
+    def eventFilter(self, watched:QObject, event:QEvent) -> bool:
+        """Schedule visibility check when watched viewport is resized or shown."""
+
+        if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+            self.schedule_update()
+        return False
+
+
+    def schedule_update(self) -> None:
+        """Check visibility of panels once control returns to event loop. Several scroll events are handled by one check."""
+
+        self.update_timer.start(0)
+
+
+    def set_panel(self, data:QListWidget, populate:Callable[[], None]) -> None:
+        """Register panel. It's populated immediately if it's visible.
+
+            Arguments
+            ---------
+                `data` : (QListWidget) - List widget of panel.
+                `populate` : (Callable) - Function that adds items to list widget.
+        """
+
+        self.panels.append(LazyPanel(data, populate))
+        self.schedule_update()
+        self.release_timer.start()
+
+
+    def clear(self) -> None:
+        """Forget all panels and clear their list widgets."""
+
+        for panel in self.panels:
+            panel.data.clear()
+        self.panels.clear()
+        self.update_timer.stop()
+        self.release_timer.stop()
+
+
+    @staticmethod
+    def is_visible(panel:LazyPanel) -> bool:
+        """Check if any part of panel is shown on screen. Parts hidden by scroll areas aren't visible."""
+
+        return panel.data.isVisible() and not panel.data.visibleRegion().isEmpty()
+
+
+    @staticmethod
+    def populate_panel(panel:LazyPanel) -> None:
+        """Populate panel if it isn't populated yet."""
+
+        if not panel.populated:
+            panel.data.setUpdatesEnabled(False)
+            panel.populate()
+            panel.data.setUpdatesEnabled(True)
+            panel.populated = True
+
+
+    def populate_visible(self) -> None:
+        """Populate panels that are visible now."""
+
+        current_time = monotonic()
+        for panel in self.panels:
+            if self.is_visible(panel):
+                panel.last_visible_time = current_time
+                self.populate_panel(panel)
+
+
+    def populate_all(self) -> None:
+        """Populate all panels. Used when content of every panel is needed, for example to copy it."""
+
+        current_time = monotonic()
+        for panel in self.panels:
+            panel.last_visible_time = current_time
+            self.populate_panel(panel)
+
+
+    def release_hidden(self) -> None:
+        """Clear populated panels that weren't visible for LAZY_PANEL_RELEASE_TIMEOUT milliseconds."""
+
+        self.populate_visible()
+        release_time = monotonic() - LAZY_PANEL_RELEASE_TIMEOUT / 1000
+        for panel in self.panels:
+            if panel.populated and panel.last_visible_time < release_time:
+                panel.data.clear()
+                panel.populated = False
@@ -1,32 +1,87 @@
 from __future__ import annotations
+from collections import OrderedDict
 from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
 from PySide6.QtGui import QTextDocument, QPainter, QAbstractTextDocumentLayout, QPalette
 from PySide6.QtCore import Qt, QSize, QPersistentModelIndex, QModelIndex
-from typing import Any, cast
+from typing import Any, TypeAlias, cast
 
+from project_configuration import RICH_TEXT_DOCUMENTS_CACHE_SIZE, RICH_TEXT_SIZES_CACHE_SIZE
 
 
 
 
+LayoutKey:TypeAlias = tuple[str, int, str, int]#HTML, text width, font key and palette cache key
+
+
 class QRichTextDelegate(QStyledItemDelegate):
     """
     Item delegate that renders item DisplayRole data as Qt rich text (HTML fragment).
     Use for QListWidget / QTableWidget / any QAbstractItemView to get <span>, <b>, colors, etc.
+
+    Laid out documents and item sizes are kept in LRU caches shared by all delegates,
+    so HTML isn't parsed again while list is scrolled or repainted. Call `clear_layout_cache` when theme changes.
     """
 
+    documents_cache:OrderedDict[LayoutKey, QTextDocument] = OrderedDict()
+    sizes_cache:OrderedDict[LayoutKey, QSize] = OrderedDict()
+
+
+    @staticmethod
+    def create_layout_key(html:str, width:int, option:QStyleOptionViewItem) -> LayoutKey:
+        """Create key of laid out document. Layout depends on text width and font, painted text color depends on palette."""
+
+        return (html, width, cast(Any, option).font.key(), cast(Any, option).palette.cacheKey())
+
+
+    @classmethod
+    def clear_layout_cache(cls) -> None:
+        """Remove all cached documents and sizes. Theme change can change fonts and palettes of items."""
+
+        cls.documents_cache.clear()
+        cls.sizes_cache.clear()
+
+
+    @classmethod
+    def get_document(cls, html:str, width:int, option:QStyleOptionViewItem) -> QTextDocument:
+        """Get document laid out with `width` for painting. It's created only if it isn't cached.
+
+            Arguments
+            ---------
+                `html` : (str) - HTML fragment of item.
+                `width` : (int) - Text width.
+                `option` : (QStyleOptionViewItem) - Style option of item.
+            Returns
+            -------
+                `QTextDocument` - Laid out document.
+        """
+
+        layout_key = cls.create_layout_key(html, width, option)
+        doc = cls.documents_cache.get(layout_key)
+        if doc is not None:
+            cls.documents_cache.move_to_end(layout_key)
+            return doc
+
+        doc = QTextDocument()
+        doc.setHtml(f"<div style='line-height: 0.7;'>{html}</div>")
+        doc.setDocumentMargin(0)
+        doc.setTextWidth(width)
+        doc.documentLayout()#Lay out document now, so painting cached document doesn't do it
+
+        cls.documents_cache[layout_key] = doc
+        if len(cls.documents_cache) > RICH_TEXT_DOCUMENTS_CACHE_SIZE:
+            cls.documents_cache.popitem(last=False)
+        return doc
+
+
     def paint(self, painter:QPainter, option:QStyleOptionViewItem, index:QModelIndex | QPersistentModelIndex) -> None:
-        """Custom paint builds a QTextDocument from the HTML string."""
+        """Custom paint draws a cached QTextDocument built from the HTML string."""
 
         html = index.data(Qt.ItemDataRole.DisplayRole)
         if not html:
             super().paint(painter, option, index)
             return
-        html = f"<div style='line-height: 0.7;'>{html}</div>"
 
-        doc = QTextDocument()
-        doc.setHtml(html)
-        doc.setDocumentMargin(0)
-        doc.setTextWidth(cast(Any, option).rect.width())
+        doc = self.get_document(str(html), cast(Any, option).rect.width(), option)
 
         painter.save()
         painter.translate(cast(Any, option).rect.topLeft())
@@ -39,19 +94,28 @@ class QRichTextDelegate(QStyledItemDelegate):
 
 
     def sizeHint(self, option:QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> QSize:
-        """Return the preferred (width, height) for the item given its HTML content."""
+        """Return the preferred (width, height) for the item given its HTML content. Sizes are cached."""
 
         html = index.data(Qt.ItemDataRole.DisplayRole)
         if not html:
             return super().sizeHint(option, index)
-        html = f"<div style='line-height: 0.7;'>{html}</div>"
-        
-        doc = QTextDocument()
-        doc.setHtml(html)
 
         # Determine a working width: if option.rect.width() == 0 (first pass),
         # pick a reasonable fallback (e.g. 400) so multi-line text expands.
         width = cast(Any, option).rect.width() if cast(Any, option).rect.width() > 0 else 400
+
+        layout_key = self.create_layout_key(str(html), width, option)
+        size = self.sizes_cache.get(layout_key)
+        if size is not None:
+            self.sizes_cache.move_to_end(layout_key)
+            return QSize(size)
+
+        doc = QTextDocument()
+        doc.setHtml(f"<div style='line-height: 0.7;'>{html}</div>")
         doc.setTextWidth(width)
 
-        return QSize(int(width), int(doc.size().height()))
\ No newline at end of file
+        size = QSize(int(width), int(doc.size().height()))
+        self.sizes_cache[layout_key] = size
+        if len(self.sizes_cache) > RICH_TEXT_SIZES_CACHE_SIZE:
+            self.sizes_cache.popitem(last=False)
+        return QSize(size)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from PySide6.QtWidgets import QTableView, QApplication
+from PySide6.QtCore import Qt
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QWidget
+    from PySide6.QtGui import QKeyEvent, QWheelEvent
+
+
+
+# pyright: reportIncompatibleMethodOverride=false
+class CustomTableView(QTableView):
+    """
+    This class is used to create a custom table view
+    that allows for copying multiple cells to the clipboard
+    and prevents scrolling out of widget when the table view runs out of rows.
+    """
+
+    def __init__(self, parent:QWidget|None = None) -> None:
+        super().__init__(parent)
+
+
+    def rowCount(self) -> int:
+        """Get amount of rows of the model."""
+
+        model = self.model()
+        return model.rowCount() if model is not None else 0
+
+
+    def currentRow(self) -> int:
+        """Get row of the current index. It's -1 if there is no current index."""
+
+        return self.currentIndex().row()
+
+
+    def keyPressEvent(self, event:QKeyEvent) -> None:
+        "Allows copy multiple cell's text to the clipboard"
+
+        super().keyPressEvent(event)
+        if event.key() == Qt.Key.Key_C and (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+            copied_cells = sorted(self.selectedIndexes(), key=lambda cell: (cell.row(), cell.column()))
+            if len(copied_cells) == 0:
+                return
+
+            copy_text = ''
+            max_column = max(cell.column() for cell in copied_cells)
+            for cell in copied_cells:
+                copy_text += str(cell.data(Qt.ItemDataRole.DisplayRole))
+                if cell.column() == max_column:
+                    copy_text += '\n'
+                else:
+                    copy_text += '\t'
+
+            QApplication.clipboard().setText(copy_text)
+
+
+    def wheelEvent(self, event:QWheelEvent) -> None:
+        "Prevents scrolling out of widget when TableView run out of rows and is nested into a ScrollArea"
+
+        vertical_scrollbar = self.verticalScrollBar()
+        if vertical_scrollbar.isVisible() and vertical_scrollbar.minimum() < vertical_scrollbar.maximum():
+            super().wheelEvent(event)
+            event.accept()
+        else:
+            event.ignore()
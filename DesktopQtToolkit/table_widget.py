@@ -1,10 +1,12 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, overload, Any
+from contextlib import contextmanager
 from PySide6.QtWidgets import QTableWidget, QApplication, QTableWidgetItem
 from PySide6.QtCore import Qt
 from DesktopQtToolkit.Utils import get_table_widget_item
 
 if TYPE_CHECKING:
+    from typing import Iterator
     from PySide6.QtWidgets import QWidget
     from PySide6.QtGui import QKeyEvent, QWheelEvent, QPixmap, QIcon
 
@@ -23,6 +25,22 @@ class CustomTableWidget(QTableWidget):
     def __init__(self, rows: int, columns: int, parent: QWidget|None = ...) -> None: ...
     def __init__(self, *args:Any, **kwargs:Any) -> None:
         super().__init__(*args, **kwargs)
+
+
+    @contextmanager
+    def bulk_population(self) -> Iterator[None]:
+        """Suspend sorting and repaints while many rows are added to the table.
+        Rows are sorted once when the block ends instead of after every inserted item.
+        """
+
+        sorting_enabled = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+            self.setSortingEnabled(sorting_enabled)
     
 
     def keyPressEvent(self, event:QKeyEvent) -> None:
@@ -59,6 +77,7 @@ class CustomTableWidget(QTableWidget):
 class CustomTableWidgetItem(QTableWidgetItem):
     """This class is used to create a custom table widget item that allows for sorting by string or float values.
     It overrides the less than operator to compare the values of the items.
+    Sort key is converted once when text of item is set, so comparisons don't parse text.
     """
 
     @overload
@@ -71,16 +90,33 @@ class CustomTableWidgetItem(QTableWidgetItem):
     def __init__(self, type: int = ...) -> None: ...
     def __init__(self, *args:Any, **kwargs:Any) -> None:
         super().__init__(*args, **kwargs)
+        self.sort_key = self.create_sort_key(self.data(Qt.ItemDataRole.EditRole))
+
+
+    @staticmethod
+    def create_sort_key(value:Any) -> float|None:
+        """Convert value of item to float. It's None if value isn't a number, then items are compared by text."""
+
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+
+    def setData(self, role:int, value:Any) -> None:
+        super().setData(role, value)
+        if role in (Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole):
+            self.sort_key = self.create_sort_key(value)
     
 
     def __lt__(self, other:object) -> bool:
         if not isinstance(other, QTableWidgetItem):
             raise TypeError(f"Cannot compare CustomTableWidgetItem with {type(other)}")
-        
-        try:
-            return float(self.data(Qt.ItemDataRole.EditRole)) < float(other.data(Qt.ItemDataRole.EditRole))
-        except ValueError:
-            # If conversion to float fails, fallback to string comparison
-            return self.text() < other.text()
+
+        other_sort_key = other.sort_key if isinstance(other, CustomTableWidgetItem) else self.create_sort_key(other.text())
+        if self.sort_key is not None and other_sort_key is not None:
+            return self.sort_key < other_sort_key
+        # If any value isn't a number, fallback to string comparison
+        return self.text() < other.text()
 
             
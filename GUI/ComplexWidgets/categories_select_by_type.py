@@ -265,11 +265,16 @@ class CategoriesSelectionByType(QWidget):
         Clears all selected categories from the selection list and removes them from options to select.
         """
 
+        #takeAt passes layout item to Python, so its wrapper doesn't outlive the item deleted by Qt
         while self.incomes_categories_list_layout.count():
-            get_widget_from_layout(self.incomes_categories_list_layout, 0).setParent(None)
+            widget = self.incomes_categories_list_layout.takeAt(0).widget()
+            if widget:
+                widget.setParent(None)
 
         while self.expenses_categories_list_layout.count():
-            get_widget_from_layout(self.expenses_categories_list_layout, 0).setParent(None)
+            widget = self.expenses_categories_list_layout.takeAt(0).widget()
+            if widget:
+                widget.setParent(None)
 
         self.selected_categories_list.clear()
         self.selected_categories_data.clear()
@@ -0,0 +1,293 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from array import array
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QPersistentModelIndex, QObject
+
+from GUI.gui_constants import ALIGNMENT
+
+if TYPE_CHECKING:
+    from typing import Callable
+    from backend.models import TransactionRow
+
+
+
+SORT_ROLE = Qt.ItemDataRole.UserRole#Raw name, day or value of transaction that rows are sorted by
+
+
+class TransactionsTableModel(QAbstractTableModel):
+    """Table model of category transactions. Columns are name, day and value.
+    Transactions are kept in compact arrays (ids, days, values and indices of deduplicated names) instead of Qt items,
+    and row of transaction is found by its id through a dictionary.
+    """
+
+    COLUMNS_AMOUNT = 3
+
+    def __init__(self, parent:QObject|None = None) -> None:
+        super().__init__(parent)
+        self.ids:array[int] = array("q")
+        self.days:array[int] = array("b")
+        self.values:array[float] = array("d")
+        self.name_indices:array[int] = array("l")
+        self.names:list[str] = []
+        self.names_indices:dict[str, int] = {}
+        self.rows_by_id:dict[int, int] = {}
+        self.headers:tuple[str, ...] = ()
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+
+
+    def get_name_index(self, name:str) -> int:
+        """Get index of name in names list. Name is added to the list if it isn't there yet."""
+
+        name_index = self.names_indices.get(name)
+        if name_index is None:
+            name_index = len(self.names)
+            self.names.append(name)
+            self.names_indices[name] = name_index
+        return name_index
+
+
+    def compact_names(self) -> None:
+        """Remove names that aren't used by any row after rows were updated or removed.
+        Names are rebuilt only when stale names outnumber used ones, so a single change stays cheap.
+        """
+
+        used_name_indices = sorted(set(self.name_indices))
+        if len(self.names) <= 2 * len(used_name_indices):
+            return
+
+        new_name_indices = {old_name_index:new_name_index for new_name_index, old_name_index in enumerate(used_name_indices)}
+        self.names = [self.names[name_index] for name_index in used_name_indices]
+        self.names_indices = {name:name_index for name_index, name in enumerate(self.names)}
+        self.name_indices = array("l", [new_name_indices[name_index] for name_index in self.name_indices])
+
+
+    def rebuild_rows_by_id(self) -> None:
+        """Map transactions ids to their rows after rows were moved or removed."""
+
+        self.rows_by_id = {transaction_id:row for row, transaction_id in enumerate(self.ids)}
+
+
+    def set_transactions(self, transactions:list[TransactionRow]) -> None:
+        """Replace all transactions of the table with one model reset.
+
+            Arguments
+            ---------
+                `transactions` : (list[TransactionRow]) - Transactions to show.
+        """
+
+        self.beginResetModel()
+        self.names = []
+        self.names_indices = {}
+        self.ids = array("q", [transaction.id for transaction in transactions])
+        self.days = array("b", [transaction.date.day for transaction in transactions])
+        self.values = array("d", [transaction.value for transaction in transactions])
+        self.name_indices = array("l", [self.get_name_index(str(transaction.name)) for transaction in transactions])
+        self.rebuild_rows_by_id()
+        self.sort_rows()
+        self.endResetModel()
+
+
+    def add_transaction(self, transaction_id:int, day:int, value:float, name:str) -> None:
+        """Add transaction to the end of the table and keep current sorting.
+
+            Arguments
+            ---------
+                `transaction_id` : (int) - Id of transaction.
+                `day` : (int) - Day of transaction.
+                `value` : (float) - Value of transaction.
+                `name` : (str) - Name of transaction.
+        """
+
+        row = len(self.ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.ids.append(transaction_id)
+        self.days.append(day)
+        self.values.append(value)
+        self.name_indices.append(self.get_name_index(name))
+        self.rows_by_id[transaction_id] = row
+        self.endInsertRows()
+        self.resort()
+
+
+    def update_transaction(self, transaction_id:int, day:int, value:float, name:str) -> float:
+        """Update transaction shown in the table and keep current sorting.
+
+            Arguments
+            ---------
+                `transaction_id` : (int) - Id of transaction.
+                `day` : (int) - New day of transaction.
+                `value` : (float) - New value of transaction.
+                `name` : (str) - New name of transaction.
+            Returns
+            -------
+                `float` - Previous value of transaction.
+        """
+
+        row = self.rows_by_id[transaction_id]
+        old_value = self.values[row]
+        self.days[row] = day
+        self.values[row] = value
+        self.name_indices[row] = self.get_name_index(name)
+        self.compact_names()
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.COLUMNS_AMOUNT - 1))
+        self.resort()
+        return old_value
+
+
+    def remove_transaction(self, transaction_id:int) -> None:
+        """Remove transaction from the table.
+
+            Arguments
+            ---------
+                `transaction_id` : (int) - Id of transaction.
+        """
+
+        row = self.rows_by_id[transaction_id]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.ids[row]
+        del self.days[row]
+        del self.values[row]
+        del self.name_indices[row]
+        self.compact_names()
+        self.rebuild_rows_by_id()
+        self.endRemoveRows()
+
+
+    def get_transaction_id(self, row:int) -> int:
+        """Get id of transaction shown in row."""
+
+        return self.ids[row]
+
+
+    def get_row(self, transaction_id:int) -> int:
+        """Get row of transaction. It's a dictionary lookup."""
+
+        return self.rows_by_id[transaction_id]
+
+
+    def get_value(self, row:int) -> float:
+        """Get value of transaction shown in row."""
+
+        return self.values[row]
+
+
+    def set_headers(self, headers:tuple[str, ...]) -> None:
+        """Set names of columns."""
+
+        self.headers = headers
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.COLUMNS_AMOUNT - 1)
+
+
+    def rowCount(self, parent:QModelIndex|QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.ids)
+
+
+    def columnCount(self, parent:QModelIndex|QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.COLUMNS_AMOUNT
+
+
+    def get_sort_key(self, row:int, column:int) -> str|int|float:
+        """Get raw value of cell that rows are sorted by."""
+
+        if column == 0:
+            return self.names[self.name_indices[row]]
+        if column == 1:
+            return self.days[row]
+        return self.values[row]
+
+
+    def get_column_sort_key(self, column:int) -> Callable[[int], str|int|float]:
+        """Get function that returns typed sort key of row in column. Days and values are read from arrays directly,
+        names are compared by index order of their texts, so text of every name is compared only once.
+        """
+
+        if column == 1:
+            return self.days.__getitem__
+        if column == 2:
+            return self.values.__getitem__
+
+        names_order = {name_index:order for order, name_index in enumerate(
+            sorted(range(len(self.names)), key=self.names.__getitem__)
+        )}
+        return lambda row: names_order[self.name_indices[row]]
+
+
+    def data(self, index:QModelIndex|QPersistentModelIndex, role:int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.get_sort_key(row, column))
+        if role == SORT_ROLE:
+            return self.get_sort_key(row, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != 0:
+            return ALIGNMENT.AlignCenter
+        return None
+
+
+    def headerData(self, section:int, orientation:Qt.Orientation, role:int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal and section < len(self.headers):
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+
+    def flags(self, index:QModelIndex|QPersistentModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+
+    def sort_rows(self) -> list[int]:
+        """Reorder arrays by current sort column. Stable, so rows with equal keys keep their order.
+
+            Returns
+            -------
+                `list[int]` - New row of every old row.
+        """
+
+        rows_amount = len(self.ids)
+        if self.sort_column < 0:
+            return list(range(rows_amount))
+
+        order = sorted(
+            range(rows_amount), key=self.get_column_sort_key(self.sort_column),
+            reverse=self.sort_order == Qt.SortOrder.DescendingOrder
+        )
+
+        self.ids = array("q", [self.ids[row] for row in order])
+        self.days = array("b", [self.days[row] for row in order])
+        self.values = array("d", [self.values[row] for row in order])
+        self.name_indices = array("l", [self.name_indices[row] for row in order])
+        self.rebuild_rows_by_id()
+
+        new_rows = [0] * rows_amount
+        for new_row, old_row in enumerate(order):
+            new_rows[old_row] = new_row
+        return new_rows
+
+
+    def sort(self, column:int, order:Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Sort rows by raw values of column (text for names, numbers for days and values)."""
+
+        self.sort_column = column
+        self.sort_order = order
+        self.resort()
+
+
+    def resort(self) -> None:
+        """Sort rows again after they were changed. Selection follows moved rows."""
+
+        if self.sort_column < 0:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        new_rows = self.sort_rows()
+        self.changePersistentIndexList(
+            persistent_indexes,
+            [self.index(new_rows[index.row()], index.column()) for index in persistent_indexes]
+        )
+        self.layoutChanged.emit()
@@ -3,19 +3,20 @@ import os
 
 from typing import TYPE_CHECKING
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QToolButton, QHeaderView
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import QSize
 from PySide6.QtGui import QIcon
 
 from project_configuration import TRANSACTIONS_DIRECTORY, GENERAL_ICONS_DIRECTORY, CategoryType
 from languages import LanguageStructure
 from AppObjects.category import Category
 from AppObjects.windows_registry import WindowsRegistry
-from backend.models import Transaction, Category as CategoryModel
+from backend.models import TransactionRow, Category as CategoryModel
 
-from DesktopQtToolkit.table_widget import CustomTableWidget, CustomTableWidgetItem
+from DesktopQtToolkit.table_view import CustomTableView
 from DesktopQtToolkit.create_button import create_button
 from DesktopQtToolkit.default_drop_shadow_effect import DefaultDropShadowEffect
 
+from GUI.ComplexWidgets.transactions_table_model import TransactionsTableModel
 from GUI.gui_constants import ALIGNMENT, ALIGN_H_CENTER, ALIGN_V_CENTER, ICON_SIZE, BASIC_FONT
 
 if TYPE_CHECKING:
@@ -26,39 +27,22 @@ REMOVE_TRANSACTION_ICON = QIcon(os.path.join(TRANSACTIONS_DIRECTORY, "remove tra
 EDIT_TRANSACTION_ICON = QIcon(os.path.join(TRANSACTIONS_DIRECTORY, "edit transaction.png"))
 
 
-def load_transactions_into_category_table(category_data:CustomTableWidget, transactions:list[Transaction]) -> None:
-    """Load transactions into category table widget
+def get_category_layout(category_type:str) -> QHBoxLayout:
+    """Get layout of main window that shows categories of the type."""
 
-        Arguments
-        -------
-            `category_data` (CustomTableWidget): Table widget to load transactions into<br>
-            `transactions` (list[Transaction]): List of transactions to load into the table
-    """
-
-    category_data.setRowCount(len(transactions))
-    for index,transaction in enumerate(transactions):
-
-        transaction_day = CustomTableWidgetItem(str(transaction.date.day))
-        transaction_day.setTextAlignment(ALIGNMENT.AlignCenter)
-        transaction_day.setFlags(~ Qt.ItemFlag.ItemIsEditable)# symbol ~ mean invert bytes so items can't be edited
-
-        transaction_value = CustomTableWidgetItem(str(transaction.value))
-        transaction_value.setTextAlignment(ALIGNMENT.AlignCenter)
-        transaction_value.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-
-        transaction_id = CustomTableWidgetItem(str(transaction.id))
-        transaction_id.setFlags(~ Qt.ItemFlag.ItemIsEditable)
-
-        transaction_name = CustomTableWidgetItem(str(transaction.name))
-        transaction_name.setFlags(~ Qt.ItemFlag.ItemIsEditable)
+    if category_type == CategoryType.Income:
+        return WindowsRegistry.MainWindow.Incomes_window_layout
+    return WindowsRegistry.MainWindow.Expenses_window_layout
 
-        category_data.setItem(index, 0, transaction_name)
-        category_data.setItem(index, 1, transaction_day)
-        category_data.setItem(index, 2, transaction_value)
-        category_data.setItem(index, 3, transaction_id)
 
-
-def load_category(category:CategoryModel, db:DBController, year:int, month:int) -> Category:
+def load_category(
+        category:CategoryModel,
+        db:DBController,
+        year:int,
+        month:int,
+        transactions:list[TransactionRow]|None = None,
+        category_total:float|None = None
+    ) -> Category:
     """Add category to user window
 
         Arguments
@@ -66,7 +50,9 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
             `category` (CategoryModel): Category model object to load into the window<br>
             `db` (DBController): Database controller to get transactions and statistics data<br>
             `year` (int): Year of transactions to load<br>
-            `month` (int): Month of transactions to load
+            `month` (int): Month of transactions to load<br>
+            `transactions` (list[TransactionRow] | None): Already loaded month transactions. If None they are queried from db<br>
+            `category_total` (float | None): Already calculated month total. If None it is queried from db
 
         Returns
         ------
@@ -95,15 +81,15 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
     Category_general_info.addWidget(category_name, alignment=ALIGN_H_CENTER)
     Category_general_info.addWidget(category_settings,alignment=ALIGNMENT.AlignRight)
 
-    category_data = CustomTableWidget()
+    category_data = CustomTableView()
     category_data.setProperty("class", "category_data")
 
+    transactions_model = TransactionsTableModel(category_data)
+    category_data.setModel(transactions_model)
+
     category_data.setMinimumWidth(600)
     category_data.setMinimumHeight(270)
 
-    category_data.setColumnCount(4)
-    category_data.setColumnHidden(3, True)
-
     row = category_data.horizontalHeader()
     row.setFont(BASIC_FONT)
     row.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
@@ -115,19 +101,21 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
     column.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
     column.setStretchLastSection(True)
 
-    category_data.setHorizontalHeaderLabels((
+    transactions_model.set_headers((
         LanguageStructure.Transactions.get_translation(0),
         LanguageStructure.Transactions.get_translation(1),
         LanguageStructure.Transactions.get_translation(2)
     ))
 
-    transactions = db.transaction_query.get_transactions_by_month(category.id, year, month)
+    if transactions is None:
+        transactions = db.transaction_query.get_transactions_by_month(category.id, year, month)
     
-    if len(transactions) > 0: #Check if transactions are in db
-        load_transactions_into_category_table(category_data, transactions)
-    category_total = round(db.statistics_query.get_monthly_transactions_sum(category.id, year, month), 2)
+    transactions_model.set_transactions(transactions)
+
+    if category_total is None:
+        category_total = db.statistics_query.get_monthly_transactions_sum(category.id, year, month)
     category_total_value.setText(
-        f"{LanguageStructure.Categories.get_translation(10)}{category_total}"
+        f"{LanguageStructure.Categories.get_translation(10)}{round(category_total, 2)}"
     )
     category_data.setSortingEnabled(True)
 
@@ -156,11 +144,7 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
 
     category_window.setLayout(category_layout)
 
-    if category.category_type == CategoryType.Income:
-        WindowsRegistry.MainWindow.Incomes_window_layout.addWidget(category_window)
-    else:
-        WindowsRegistry.MainWindow.Expenses_window_layout.addWidget(category_window)
-
+    get_category_layout(category.category_type).addWidget(category_window)
 
     return Category(
         category.id,
@@ -174,6 +158,7 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
         category_name,
         category_settings,
         category_data,
+        transactions_model,
         add_transaction,
         delete_transaction,
         edit_transaction,
@@ -181,6 +166,53 @@ def load_category(category:CategoryModel, db:DBController, year:int, month:int)
     )
 
 
+def reuse_category(
+        pooled_category:Category,
+        category:CategoryModel,
+        transactions:list[TransactionRow],
+        category_total:float
+    ) -> Category:
+    """Show category with widgets of previously removed category instead of creating new widgets.
+
+        Arguments
+        -------
+            `pooled_category` (Category): Removed category which widgets are reused<br>
+            `category` (CategoryModel): Category model object to load into the window<br>
+            `transactions` (list[TransactionRow]): Month transactions of category<br>
+            `category_total` (float): Month total of category
+
+        Returns
+        ------
+            `category` (Category): Reused category object with data of the loaded category
+    """
+
+    pooled_category.id = category.id
+    pooled_category.type = category.category_type
+    pooled_category.name = category.name
+    pooled_category.position = category.position
+    pooled_category.transaction_min_value = category.transaction_min_value
+    pooled_category.transaction_max_value = category.transaction_max_value
+
+    #Language could be changed while category was in pool
+    pooled_category.name_label.setText(category.name)
+    pooled_category.total_value_label.setText(
+        f"{LanguageStructure.Categories.get_translation(10)}{round(category_total, 2)}"
+    )
+    pooled_category.add_transaction.setText(LanguageStructure.GeneralManagement.get_translation(1))
+    pooled_category.delete_transaction.setText(LanguageStructure.GeneralManagement.get_translation(0))
+    pooled_category.edit_transaction.setText(LanguageStructure.GeneralManagement.get_translation(7))
+    pooled_category.transactions.set_headers((
+        LanguageStructure.Transactions.get_translation(0),
+        LanguageStructure.Transactions.get_translation(1),
+        LanguageStructure.Transactions.get_translation(2)
+    ))
+    pooled_category.transactions.set_transactions(transactions)
+
+    get_category_layout(category.category_type).addWidget(pooled_category.window)
+    pooled_category.window.show()
+    return pooled_category
+
+
 def add_category_to_position_list(category:Category) -> None:
     """Add category to categories positions list
 
@@ -11,6 +11,7 @@ from project_configuration import THEME_DIRECTORY
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from GUI.gui_constants import app, DWMWA_USE_IMMERSIVE_DARK_MODE
+from DesktopQtToolkit.qrich_text_delegate import QRichTextDelegate
 
 if TYPE_CHECKING:
     from PySide6.QtWidgets import QWidget
@@ -46,7 +47,7 @@ QLabel,QToolButton,QCheckBox{
     background-color:transparent;
 }
 
-QTableWidget{
+QTableWidget,QTableView{
     border:none;
 }
 """
@@ -232,6 +233,7 @@ def switch_theme() -> None:
             theme_value = ctypes.c_uint(2)
         logger.info("Theme switched to Dark")
 
+    QRichTextDelegate.clear_layout_cache()
     from AppObjects.windows_registry import WindowsRegistry
     if platform == "win32":
         set_theme_mode_on_window(WindowsRegistry.MainWindow, theme_value) # pyright: ignore[reportPossiblyUnboundVariable]
@@ -270,6 +272,7 @@ def load_theme() -> None:
             theme_value = ctypes.c_uint(0)
         logger.info("Light theme loaded")
 
+    QRichTextDelegate.clear_layout_cache()
     from AppObjects.windows_registry import WindowsRegistry
     if platform == "win32":
             set_theme_mode_on_window(WindowsRegistry.MainWindow, theme_value) # pyright: ignore[reportPossiblyUnboundVariable]
@@ -41,11 +41,13 @@ class BackupManagementWindow(SubWindow):
         self.create_backup = create_button("Create backup", (245, 40))
         self.delete_backup = create_button("Delete backup", (245, 40))
         self.load_backup = create_button("Restore backup", (245, 40))
+        self.rebuild_search_index = create_button("Rebuild search index", (245, 40))
 
         self.buttons_layout = QHBoxLayout()
         self.buttons_layout.addWidget(self.create_backup, alignment=ALIGN_H_CENTER)
         self.buttons_layout.addWidget(self.delete_backup, alignment=ALIGN_H_CENTER)
         self.buttons_layout.addWidget(self.load_backup, alignment=ALIGN_H_CENTER)
+        self.buttons_layout.addWidget(self.rebuild_search_index, alignment=ALIGN_H_CENTER)
 
         self.backups_layout = QVBoxLayout()
         self.backups_layout.addWidget(self.backups_table)
@@ -148,4 +148,7 @@ class Messages(metaclass=QSingleton):
         )
         self.search_name_too_short = MessageWindow(
             main_window, message_windows, False, QMessageBox.Icon.Information, APP_NAME
+        )
+        self.failed_query = MessageWindow(
+            main_window, message_windows, False, QMessageBox.Icon.Critical, APP_NAME
         )
\ No newline at end of file
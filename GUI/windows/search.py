@@ -17,6 +17,7 @@ from project_configuration import MIN_TRANSACTION_VALUE, MAX_TRANSACTION_VALUE
 
 if TYPE_CHECKING:
     from GUI.windows.main_window import MainWindow
+    from backend.search_query import SearchCriteria, SearchCursor
 
 
 
@@ -75,6 +76,9 @@ class SearchWindow(SubWindow):
         self.search.setDefault(True)
 
         self.transactions_list = CustomListWidget()
+        self.search_criteria:SearchCriteria|None = None
+        self.next_page_cursor:SearchCursor|None = None
+        self.page_loading = False
 
         self.transaction_amount = DefaultLabel("Transactions found: 0")
         self.income_transactions_sum = DefaultLabel("Income sum: 0.00")
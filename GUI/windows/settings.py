@@ -86,6 +86,10 @@ class SettingsWindow(SubWindow):
         self.backup_section.section_layout.addWidget(self.backup_management, alignment=ALIGN_H_CENTER | ALIGN_V_CENTER)
         self.backup_section.section_layout.addWidget(self.auto_backup, alignment=ALIGN_H_CENTER | ALIGN_V_CENTER)
         self.backup_section.section_layout.addWidget(self.auto_backup_status, alignment=ALIGN_H_CENTER | ALIGN_V_CENTER)
+        self.transactions_import = create_button("Import transactions", (280, 40))
+        self.backup_section.section_layout.addWidget(self.transactions_import, alignment=ALIGN_H_CENTER | ALIGN_V_CENTER)
+        self.transactions_export = create_button("Export transactions", (280, 40))
+        self.backup_section.section_layout.addWidget(self.transactions_export, alignment=ALIGN_H_CENTER | ALIGN_V_CENTER)
 
         self.total_income = QLabel()
         self.total_income.setProperty("class", "light-text")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import NamedTuple, TYPE_CHECKING
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QProgressBar
 from PySide6.QtCore import Qt
 
 from DesktopQtToolkit.sub_window import SubWindow
@@ -8,6 +8,7 @@ from DesktopQtToolkit.create_button import create_button
 from DesktopQtToolkit.create_date_input import create_date_input
 from DesktopQtToolkit.list_widget import CustomListWidget
 from DesktopQtToolkit.horizontal_scroll_area import HorizontalScrollArea
+from DesktopQtToolkit.lazy_panels import LazyPanels
 from DesktopQtToolkit.default_drop_shadow_effect import DefaultDropShadowEffect
 
 from GUI.gui_constants import ALIGNMENT, ALIGN_H_CENTER, ALIGN_V_CENTER, BASIC_FONT
@@ -19,6 +20,17 @@ if TYPE_CHECKING:
     from GUI.windows.main_window import MainWindow
 
 
+
+def create_statistics_progress() -> QProgressBar:
+    """Create hidden progress bar that is shown while statistics are collected."""
+
+    statistics_progress = QProgressBar()
+    statistics_progress.setTextVisible(False)
+    statistics_progress.setMaximumHeight(10)
+    statistics_progress.setVisible(False)
+    return statistics_progress
+
+
 class StatisticsWindow(SubWindow):
     """Represents Statistics window structure."""
 
@@ -86,6 +98,7 @@ class MonthlyStatistic(SubWindow):
         self.statistics = CustomListWidget()
         self.statistics.setMinimumWidth(500)
         self.statistics.setMinimumHeight(450)
+        self.statistics_progress = create_statistics_progress()
 
         self.copy_statistics = create_button("Copy month statistics", (275,40))
         self.copy_statistics_layout = QHBoxLayout()
@@ -93,6 +106,7 @@ class MonthlyStatistic(SubWindow):
 
         self.main_layout = QVBoxLayout()
         self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.statistics_progress)
         self.main_layout.addWidget(self.statistics)
         self.main_layout.addLayout(self.copy_statistics_layout)
         self.main_layout.setContentsMargins(50, 10, 50, 20)
@@ -109,7 +123,8 @@ class QuarterlyStatistics(SubWindow):
         `TotalQuarterStatisticsView` - is a NamedTuple that contains the label and data for the total quarter statistics.\n
         `MonthlyStatisticsView` - is a NamedTuple that contains the month number, label and data for the monthly statistics in quarter.\n
         `QuarterStatisticsView` - is a NamedTuple that contains the quarter number, label, total quarter statistics and monthly statistics.\n
-        `StatisticsView` - is a NamedTuple that contains all quarters statistics.
+        `StatisticsView` - is a NamedTuple that contains all quarters statistics.\n
+        `lazy_panels` - populates statistics lists only when they become visible.
     """
 
     def __init__(self, main_window:MainWindow, sub_windows:dict[int, SubWindow]) -> None:
@@ -125,6 +140,7 @@ class QuarterlyStatistics(SubWindow):
 
         self.statistics_layout = QVBoxLayout()
         self.statistics_window = QWidget()
+        self.lazy_panels = LazyPanels(self)
 
         TotalQuarterStatisticsView = NamedTuple(
             "TotalQuarterStatisticsView", [("label", QLabel), ("data", CustomListWidget)]
@@ -191,6 +207,7 @@ class QuarterlyStatistics(SubWindow):
             self.quarter_scroll.setWidget(self.quarter_window)
             self.quarter_scroll.setWidgetResizable(True)
             self.quarter_scroll.setMinimumHeight(350)
+            self.lazy_panels.watch_scroll_area(self.quarter_scroll)
             self.statistics_layout.addWidget(self.quarter_scroll)
 
         self.statistics = StatisticsView(self.quarters_statistics_list)
@@ -208,9 +225,12 @@ class QuarterlyStatistics(SubWindow):
         self.window_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.window_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.window_scroll.setMinimumSize(1100, 700)
+        self.lazy_panels.watch_scroll_area(self.window_scroll)
+        self.statistics_progress = create_statistics_progress()
 
         self.main_layout = QVBoxLayout()
         self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.statistics_progress)
         self.main_layout.addWidget(self.window_scroll)
 
         self.window_container.setLayout(self.main_layout)
@@ -226,6 +246,7 @@ class YearlyStatistics(SubWindow):
         `TotalYearStatisticsView` - is a NamedTuple that contains the label and data for the total year statistics.\n
         `MonthlyStatisticsView` - is a NamedTuple that contains the month number, label and data for the monthly statistics in year.\n
         `StatisticsView` - is a NamedTuple that contains the total year statistics and monthly statistics.\n
+        `lazy_panels` - populates statistics lists only when they become visible.
     """
 
     def __init__(self, main_window:MainWindow, sub_windows:dict[int, SubWindow]) -> None:
@@ -248,6 +269,7 @@ class YearlyStatistics(SubWindow):
 
         self.statistics_window = QWidget()
         self.statistics_window_layout = QVBoxLayout()
+        self.lazy_panels = LazyPanels(self)
         total_year_statistics:TotalYearStatisticsView = TotalYearStatisticsView(QLabel(), CustomListWidget())
 
         self.yearly_statistics_parts_list:list[YMonthlyStatisticsView] = []
@@ -289,9 +311,12 @@ class YearlyStatistics(SubWindow):
         self.statistics_scroll.setWidgetResizable(True)
         self.statistics_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.statistics_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.lazy_panels.watch_scroll_area(self.statistics_scroll)
+        self.statistics_progress = create_statistics_progress()
 
         self.main_layout = QVBoxLayout()
         self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.statistics_progress)
         self.main_layout.addWidget(self.statistics_scroll)
         self.main_layout.setContentsMargins(30, 10, 30, 20)
 
@@ -402,9 +427,11 @@ class CustomRangeStatisticsView(SubWindow):
         self.content_layout.addStretch(2)
         self.content_layout.addLayout(self.transactions_layout)
         self.content_layout.addStretch(1)
+        self.statistics_progress = create_statistics_progress()
 
         self.main_layout = QVBoxLayout()
         self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.statistics_progress)
         self.main_layout.addLayout(self.content_layout)
         self.main_layout.setContentsMargins(30, 10, 30, 20)
 
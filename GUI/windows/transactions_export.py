@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QProgressBar
+
+from DesktopQtToolkit.sub_window import SubWindow
+from DesktopQtToolkit.create_button import create_button
+from DesktopQtToolkit.default_label import DefaultLabel
+from DesktopQtToolkit.create_wrapper_widget import create_wrapper_widget
+
+from GUI.gui_constants import ALIGN_H_CENTER, BASIC_FONT
+
+if TYPE_CHECKING:
+    from GUI.windows.main_window import MainWindow
+
+
+
+class TransactionsExportWindow(SubWindow):
+    """Represents Transactions export window structure."""
+
+    def __init__(self, main_window:MainWindow, sub_windows:dict[int, SubWindow]) -> None:
+        super().__init__(main_window, sub_windows)
+
+        self.file_format_label = DefaultLabel("File format")
+        self.file_format = QComboBox()
+        self.file_format.setFont(BASIC_FONT)
+        self.file_format.setMinimumWidth(200)
+        self.file_format.addItem("CSV", "csv")
+        self.file_format.addItem("JSON Lines", "jsonl")
+
+        self.file_format_layout = QHBoxLayout()
+        self.file_format_layout.setSpacing(15)
+        self.file_format_layout.addWidget(self.file_format_label)
+        self.file_format_layout.addWidget(self.file_format)
+
+        self.all_accounts = QCheckBox("All accounts")
+        self.all_accounts.setFont(BASIC_FONT)
+        self.all_accounts.setProperty("class", "light-text")
+
+        self.export_parameters_layout = QVBoxLayout()
+        self.export_parameters_layout.setSpacing(15)
+        self.export_parameters_layout.addLayout(self.file_format_layout)
+        self.export_parameters_layout.addWidget(self.all_accounts, alignment=ALIGN_H_CENTER)
+        self.export_parameters_wrapper = create_wrapper_widget(self.export_parameters_layout)
+
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 1)
+        self.export_progress.setTextVisible(False)
+        self.export_status = DefaultLabel()
+        self.export_status.setMinimumWidth(400)
+
+        self.export_progress_layout = QVBoxLayout()
+        self.export_progress_layout.addWidget(self.export_progress)
+        self.export_progress_layout.addWidget(self.export_status)
+        self.export_progress_wrapper = create_wrapper_widget(self.export_progress_layout)
+
+        self.export_transactions = create_button("Export", (140, 40))
+        self.export_transactions.setDefault(True)
+
+        self.main_layout = QVBoxLayout()
+        self.main_layout.setSpacing(20)
+        self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.export_parameters_wrapper)
+        self.main_layout.addWidget(self.export_progress_wrapper)
+        self.main_layout.addWidget(self.export_transactions, alignment=ALIGN_H_CENTER)
+        self.main_layout.setContentsMargins(30, 10, 30, 20)
+
+        self.window_container.setLayout(self.main_layout)
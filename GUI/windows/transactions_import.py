@@ -0,0 +1,75 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from PySide6.QtWidgets import QVBoxLayout, QGridLayout, QComboBox, QProgressBar
+
+from DesktopQtToolkit.sub_window import SubWindow
+from DesktopQtToolkit.create_button import create_button
+from DesktopQtToolkit.default_label import DefaultLabel
+from DesktopQtToolkit.create_wrapper_widget import create_wrapper_widget
+
+from GUI.gui_constants import ALIGN_H_CENTER, BASIC_FONT
+
+if TYPE_CHECKING:
+    from GUI.windows.main_window import MainWindow
+
+
+
+class TransactionsImportWindow(SubWindow):
+    """Represents Transactions import window structure."""
+
+    def __init__(self, main_window:MainWindow, sub_windows:dict[int, SubWindow]) -> None:
+        super().__init__(main_window, sub_windows)
+
+        self.file_format_description = DefaultLabel("CSV columns: date, value, name, category", True)
+
+        self.choose_file = create_button("Choose file", (180, 40))
+        self.file_path = DefaultLabel("No file selected", True)
+        self.file_path.setMinimumWidth(400)
+        self.selected_file_path = ""
+
+        self.default_income_category_label = DefaultLabel("Default income category")
+        self.default_income_category = QComboBox()
+        self.default_income_category.setFont(BASIC_FONT)
+        self.default_income_category.setMinimumWidth(200)
+
+        self.default_expense_category_label = DefaultLabel("Default expense category")
+        self.default_expense_category = QComboBox()
+        self.default_expense_category.setFont(BASIC_FONT)
+        self.default_expense_category.setMinimumWidth(200)
+
+        self.default_categories_layout = QGridLayout()
+        self.default_categories_layout.addWidget(self.default_income_category_label, 0, 0)
+        self.default_categories_layout.addWidget(self.default_income_category, 0, 1)
+        self.default_categories_layout.addWidget(self.default_expense_category_label, 1, 0)
+        self.default_categories_layout.addWidget(self.default_expense_category, 1, 1)
+
+        self.import_parameters_layout = QVBoxLayout()
+        self.import_parameters_layout.setSpacing(15)
+        self.import_parameters_layout.addWidget(self.file_format_description)
+        self.import_parameters_layout.addWidget(self.choose_file, alignment=ALIGN_H_CENTER)
+        self.import_parameters_layout.addWidget(self.file_path, alignment=ALIGN_H_CENTER)
+        self.import_parameters_layout.addLayout(self.default_categories_layout)
+        self.import_parameters_wrapper = create_wrapper_widget(self.import_parameters_layout)
+
+        self.import_progress = QProgressBar()
+        self.import_progress.setRange(0, 1)
+        self.import_progress.setTextVisible(False)
+        self.import_status = DefaultLabel()
+
+        self.import_progress_layout = QVBoxLayout()
+        self.import_progress_layout.addWidget(self.import_progress)
+        self.import_progress_layout.addWidget(self.import_status)
+        self.import_progress_wrapper = create_wrapper_widget(self.import_progress_layout)
+
+        self.import_transactions = create_button("Import", (140, 40))
+        self.import_transactions.setDefault(True)
+
+        self.main_layout = QVBoxLayout()
+        self.main_layout.setSpacing(20)
+        self.main_layout.addLayout(self.window_menu_layout)
+        self.main_layout.addWidget(self.import_parameters_wrapper)
+        self.main_layout.addWidget(self.import_progress_wrapper)
+        self.main_layout.addWidget(self.import_transactions, alignment=ALIGN_H_CENTER)
+        self.main_layout.setContentsMargins(30, 10, 30, 20)
+
+        self.window_container.setLayout(self.main_layout)
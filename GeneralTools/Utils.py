@@ -1,22 +1,34 @@
 from datetime import date
-from calendar import monthrange
 
 
 
-def generate_month_range(year:int, month:int) -> tuple[date, date]:
-    """Generate the start and end date for a given month and year.
+def generate_month_bounds(year:int, month:int) -> tuple[date, date]:
+    """Generate half-open date bounds for a given month and year. The end date is the first day of the next month
+    and must be excluded, so filter looks like `start_date <= date < end_date`.
 
         Arguments
         ---------
-            `year` : (int) - The year for which to generate the date range.
-            `month` : (int) - The month for which to generate the date range.
+            `year` : (int) - The year for which to generate the date bounds.
+            `month` : (int) - The month for which to generate the date bounds.
     """
-    _, last_day = monthrange(year, month)
     start_date = date(year, month, 1)
-    end_date = date(year, month, last_day)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
     return start_date, end_date
 
 
+def shift_month(year:int, month:int, months_amount:int) -> tuple[int, int]:
+    """Get year and month that are `months_amount` months after the given month. Negative amount goes back.
+
+        Arguments
+        ---------
+            `year` : (int) - Year of the month.
+            `month` : (int) - Month to shift.
+            `months_amount` : (int) - Amount of months to shift by.
+    """
+    months_index = year * 12 + month - 1 + months_amount
+    return months_index // 12, months_index % 12 + 1
+
+
 def convert_to_megabytes(size_in_bytes:int, decimals:int = 2) -> float:
     """Convert size from bytes to megabytes.
 
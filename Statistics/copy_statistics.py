@@ -70,6 +70,7 @@ def copy_quarterly_statistics() -> None:
 
     if WindowsRegistry.QuarterlyStatistics.copy_statistics.isEnabled():
         WindowsRegistry.QuarterlyStatistics.copy_statistics.setEnabled(False)
+        WindowsRegistry.QuarterlyStatistics.lazy_panels.populate_all()
         statistics = WindowsRegistry.QuarterlyStatistics.statistics
         result = ""
 
@@ -98,6 +99,7 @@ def copy_yearly_statistics() -> None:
 
     if WindowsRegistry.YearlyStatistics.copy_statistics.isEnabled():
         WindowsRegistry.YearlyStatistics.copy_statistics.setEnabled(False)
+        WindowsRegistry.YearlyStatistics.lazy_panels.populate_all()
         statistics = WindowsRegistry.YearlyStatistics.statistics
         result = ""
 
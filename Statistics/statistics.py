@@ -1,138 +1,154 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, TypeAlias, cast
+from typing import TYPE_CHECKING, TypeAlias, TypeVar, cast
 from datetime import date, timedelta
 from calendar import monthrange
-from collections import defaultdict, Counter
+from collections import defaultdict
+from functools import partial
 from textwrap import dedent
 
 from languages import LanguageStructure
-from project_configuration import CategoryType
+from project_configuration import CategoryType, ERROR_LOG_FILE
 
 from AppObjects.app_core import AppCore
 from AppObjects.logger import get_logger
 from AppObjects.windows_registry import WindowsRegistry
 
+from Statistics.statistics_engine import StatisticsEngine, MinAndMaxCategories, CategoriesTotalValues,\
+CategoriesWithHighestTotalValue, CategoriesWithLowestTotalValue
 
 if TYPE_CHECKING:
-    from PySide6.QtWidgets import QListWidget
-    from backend.models import Transaction
+    from typing import Callable
+    from PySide6.QtWidgets import QListWidget, QProgressBar
+    from backend.models import TransactionRow
     from AppObjects.category import Category
 
 
 
 
 logger = get_logger(__name__)
-CountedTransactionsWithLowestValue:TypeAlias = dict[str, int]
-CountedTransactionsWithHighestValue:TypeAlias = dict[str, int]
+T = TypeVar("T")
+MonthStatisticsData:TypeAlias = tuple[MinAndMaxCategories, MinAndMaxCategories]
+PeriodStatisticsData:TypeAlias = tuple[CategoriesTotalValues, CategoriesTotalValues, dict[int, MonthStatisticsData|None]]
+CustomRangeStatisticsData:TypeAlias = tuple[
+    CategoriesTotalValues, CategoriesTotalValues, "dict[Category, list[TransactionRow]]", "dict[Category, list[TransactionRow]]"
+]
+
+
+def load_statistics_engine(
+        categories_id:list[int],
+        year:int,
+        months:list[int],
+        is_cancelled:Callable[[], bool]|None = None
+    ) -> StatisticsEngine:
+    """Load aggregates of categories in consecutive months with one query.
+    It only reads database, so it can be run on a query executor worker thread.
 
-CategoriesWithHighestTotalValue:TypeAlias = dict[int, tuple[
-    CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
-]]
-CategoriesWithLowestTotalValue:TypeAlias = dict[int, tuple[
-    CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
-]]
-CategoriesTotalValues:TypeAlias = dict[int, float]
+        Arguments
+        ---------
+            `categories_id` (list): categories to load transactions
+            `year` (int): year to load transactions
+            `months` (list): consecutive months to load transactions
+            `is_cancelled` (Callable|None): function that returns True if statistics collection was cancelled
+        Returns
+        -------
+            `StatisticsEngine` - aggregated transactions of the period
+    """
 
+    return StatisticsEngine(
+        AppCore.instance().db.statistics_query.get_period_categories_months_statistics(categories_id, year, months, is_cancelled)
+    )
 
-def get_min_and_max_categories(unsorted_categories:list[int], month:int) -> tuple[
-    CategoriesWithHighestTotalValue, float, CategoriesWithLowestTotalValue, float, CategoriesTotalValues
-]:
-    """Get categories with highest and lowest values based on transactions in month
+
+def get_cached_statistics(
+        statistics_kind:str,
+        Incomes_categories:list[int],
+        Expenses_categories:list[int],
+        year:int,
+        months:list[int],
+        collect_statistics:Callable[[], T],
+        is_cancelled:Callable[[], bool]
+    ) -> T:
+    """Get statistics from disk cache or collect and cache them. It can be run on a query executor worker thread.
+    Data version is read before statistics are collected, so statistics changed meanwhile are cached with older version and never used.
 
         Arguments
-        -------
-            `unsorted_categories` (list): categories to sort
-            `month` (int): month to get transactions
+        ---------
+            `statistics_kind` (str): kind of statistics (monthly, quarterly or yearly)
+            `Incomes_categories` (list): income categories of statistics
+            `Expenses_categories` (list): expense categories of statistics
+            `year` (int): year of statistics
+            `months` (list): months of statistics
+            `collect_statistics` (Callable): function that collects statistics if they aren't cached
+            `is_cancelled` (Callable): function that returns True if statistics collection was cancelled.\
+                Statistics of cancelled collection are incomplete, so they aren't cached
         Returns
         -------
-            `Categories_with_highest_total_value` (dict): - all categories with highest value,\
-                if more than one category have the same top value
-            `Categories_with_lowest_total_value` (dict): - all categories with lowest value,\
-                if more than one category have the same bottom value returns 0 categories if only 1 category exists<br/>
-            `Categories_total_values` (dict): - all categories with their total value
+            `Any` - Statistics returned by `collect_statistics`.
     """
 
     app_core = AppCore.instance()
-    Categories_total_values:CategoriesTotalValues = {}
-    categories_sums = app_core.db.statistics_query.get_categories_monthly_transactions_sum(
-        unsorted_categories, app_core.current_year, month
+    statistics_key = (
+        statistics_kind, app_core.db.statistics_query.account_id, year, tuple(months),
+        tuple(Incomes_categories), tuple(Expenses_categories)
     )
-    for category, total in zip(unsorted_categories, categories_sums):
-        Categories_total_values[category] = round(total, 2)
+    data_version = app_core.db.statistics_query.get_period_data_version(year, months)
 
-    highest_total_value = max(Categories_total_values.values())
+    cached_statistics = app_core.statistics_cache.get(statistics_key, data_version)
+    if cached_statistics is not None:
+        logger.debug(f"{statistics_kind.capitalize()} statistics of {year} loaded from cache")
+        return cast(T, cached_statistics)
 
-    def _get_min_and_max_transactions(category:int, year:int, month:int) -> tuple[
-        CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
-    ]:
-        """Get transactions with highest and lowest value in category
+    statistics = collect_statistics()
+    if not is_cancelled():
+        app_core.statistics_cache.put(statistics_key, data_version, statistics)
+    return statistics
 
-            Arguments
-            ---------
-                `category` (int): category to get transactions
-                `year` (int): year to get transactions
-                `month` (int): month to get transactions
-            Returns
-            -------
-                `tuple`:
-                    `transactions_with_highest_value` (dict) - transactions with highest value in category<br/>
-                    `highest_transaction_value` (float) - highest transaction value in category<br/>
-                    `transactions_with_lowest_value` (dict) - transactions with lowest value in category<br/>
-                    `lowest_transaction_value` (float) - lowest transaction value in category
-        """
 
-        #Highest transactions
-        highest_transaction_value = app_core.db.statistics_query.get_monthly_transactions_max_value(category, year, month)
-        transactions_with_highest_value = app_core.db.statistics_query.get_monthly_transactions_by_value(
-            category, year, month, highest_transaction_value
-        )
+def start_statistics_progress(statistics_progress:QProgressBar, steps_amount:int) -> None:
+    """Show progress bar of statistics collection.
 
-        transactions_names = [str(transaction.name) for transaction in transactions_with_highest_value]
-        counted_transactions_with_highest_value:CountedTransactionsWithHighestValue = Counter(transactions_names)
-        
-        #Lowest transactions
-        lowest_transaction_value = app_core.db.statistics_query.get_monthly_transactions_min_value(category, year, month)
-        transactions_with_lowest_value = app_core.db.statistics_query.get_monthly_transactions_by_value(
-            category, year, month, lowest_transaction_value
-        )
+        Arguments
+        ---------
+            `statistics_progress` (QProgressBar): progress bar of statistics window
+            `steps_amount` (int): amount of reported steps. 0 shows busy indicator
+    """
 
-        transactions_names = [str(transaction.name) for transaction in transactions_with_lowest_value]
-        counted_transactions_with_lowest_value:CountedTransactionsWithLowestValue = Counter(transactions_names)
-
-        return counted_transactions_with_highest_value,\
-            highest_transaction_value,\
-            counted_transactions_with_lowest_value,\
-            lowest_transaction_value
-
-    #Highest categories
-    Categories_with_highest_total_value:CategoriesWithHighestTotalValue = {}
-    for category in Categories_total_values:
-        if Categories_total_values[category] == highest_total_value:
-            transactions_statistic = _get_min_and_max_transactions(category, app_core.current_year, month)
-            Categories_with_highest_total_value[category] = (*transactions_statistic,)
-
-    #Lowest categories
-    for category,total_value in Categories_total_values.copy().items():
-        if total_value == 0:
-            del Categories_total_values[category]
-
-    Categories_with_lowest_total_value:CategoriesWithLowestTotalValue = {}
-    lowest_total_value = 0.0
-    if len(Categories_total_values) != 0:
-        lowest_total_value = min([total_value for total_value in Categories_total_values.values() if total_value])
-        
-        for category in Categories_total_values:
-            if Categories_total_values[category] == lowest_total_value and Categories_total_values[category] != highest_total_value:#If we have only one category don't add it to lowest categories (it is already highest)
-                transactions_statistic = _get_min_and_max_transactions(category, app_core.current_year, month)
-                Categories_with_lowest_total_value[category] = (*transactions_statistic,)
+    statistics_progress.setRange(0, steps_amount)
+    statistics_progress.setValue(0)
+    statistics_progress.setVisible(True)
+
+
+def cancel_statistics(channel:str, statistics_progress:QProgressBar) -> None:
+    """Cancel statistics collection when statistics window is closed.
+
+        Arguments
+        ---------
+            `channel` (str): query executor channel of statistics
+            `statistics_progress` (QProgressBar): progress bar of statistics window
+    """
+
+    AppCore.instance().query_executor.cancel(channel)
+    statistics_progress.setVisible(False)
 
-    return (Categories_with_highest_total_value, highest_total_value, Categories_with_lowest_total_value, lowest_total_value, Categories_total_values)
 
+def fail_statistics(statistics_progress:QProgressBar, error:Exception) -> None:
+    """Hide progress bar and show error message when statistics collection failed.
 
-def add_statistic(statistic_list:QListWidget, statistic_data:tuple[
-        CategoriesWithHighestTotalValue, float, CategoriesWithLowestTotalValue, float, CategoriesTotalValues],
-        words:list[int]
-) -> None:
+        Arguments
+        ---------
+            `statistics_progress` (QProgressBar): progress bar of statistics window
+            `error` (Exception): error raised during statistics collection
+    """
+
+    logger.error(f"Statistics collection failed. {error}")
+    statistics_progress.setVisible(False)
+    WindowsRegistry.Messages.failed_query.setText(
+        LanguageStructure.Messages.get_translation(39).replace(r"%error_log%", ERROR_LOG_FILE)
+    )
+    WindowsRegistry.Messages.failed_query.exec()
+
+
+def add_statistic(statistic_list:QListWidget, statistic_data:MinAndMaxCategories, words:list[int]) -> None:
     """Add statistic to the list
 
         Arguments
@@ -301,20 +317,102 @@ def add_total_statistics(
         )
 
 
-def add_month_statistics(
+def collect_month_statistics(
+        Incomes_categories:list[int],
+        Expenses_categories:list[int],
+        year:int,
+        month:int,
+        statistics_engine:StatisticsEngine|None = None
+    ) -> MonthStatisticsData:
+    """Collect month statistics data. It only reads database, so it can be run on a query executor worker thread.
+
+        Arguments
+        ---------
+            `Incomes_categories` (list): income categories to collect statistics
+            `Expenses_categories` (list): expense categories to collect statistics
+            `year` (int): year to collect statistics
+            `month` (int): month to collect statistics
+            `statistics_engine` (StatisticsEngine|None): already loaded transactions of period that includes the month.\
+                If None transactions of the month are loaded
+        Returns
+        -------
+            `tuple` - Income and expense categories with highest and lowest values.
+    """
+
+    if statistics_engine is None:
+        statistics_engine = load_statistics_engine(Incomes_categories + Expenses_categories, year, [month])
+
+    Incomes_statistic = statistics_engine.get_min_and_max_categories(Incomes_categories, month)
+    Expenses_statistic = statistics_engine.get_min_and_max_categories(Expenses_categories, month)
+    return Incomes_statistic, Expenses_statistic
+
+
+def collect_period_statistics(
         Incomes_categories:list[int],
         Expenses_categories:list[int],
+        year:int,
+        months:list[int],
+        statistics_engine:StatisticsEngine|None = None,
+        progress_callback:Callable[[int], None]|None = None,
+        is_cancelled:Callable[[], bool]|None = None
+    ) -> PeriodStatisticsData:
+    """Collect statistics data of period (quarter or year). It only reads database, so it can be run on a query executor worker thread.
+    Transactions of the whole period are loaded with one query.
+
+        Arguments
+        ---------
+            `Incomes_categories` (list): income categories to collect statistics
+            `Expenses_categories` (list): expense categories to collect statistics
+            `year` (int): year to collect statistics
+            `months` (list): consecutive months of the period
+            `statistics_engine` (StatisticsEngine|None): already loaded transactions of period that includes the months.\
+                If None transactions of the months are loaded
+            `progress_callback` (Callable|None): function called with amount of collected months
+            `is_cancelled` (Callable|None): function that returns True if statistics collection was cancelled
+        Returns
+        -------
+            `tuple` - Income categories total values, expense categories total values and statistics data of every month.\
+                Month statistics data is None if income or expense categories don't have transactions in this month.
+    """
+
+    if statistics_engine is None:
+        statistics_engine = load_statistics_engine(Incomes_categories + Expenses_categories, year, months, is_cancelled)
+    Incomes_categories_total_values = statistics_engine.get_categories_period_total(Incomes_categories, months)
+    Expenses_categories_total_values = statistics_engine.get_categories_period_total(Expenses_categories, months)
+
+    months_statistics:dict[int, MonthStatisticsData|None] = {}
+    for collected_months, month in enumerate(months, 1):
+        if is_cancelled is not None and is_cancelled():
+            break#Result of cancelled collection isn't delivered, so there is no need to finish it
+
+        if (
+            statistics_engine.categories_have_transactions(Incomes_categories, month)
+            and statistics_engine.categories_have_transactions(Expenses_categories, month)
+        ):
+            months_statistics[month] = collect_month_statistics(Incomes_categories, Expenses_categories, year, month, statistics_engine)
+        else:
+            months_statistics[month] = None
+
+        if progress_callback is not None:
+            progress_callback(collected_months)
+
+    return Incomes_categories_total_values, Expenses_categories_total_values, months_statistics
+
+
+def add_month_statistics(
+        month_statistics_data:MonthStatisticsData|None,
         month_statistics:QListWidget,
-        current_month:int
+        year:int,
+        month:int
     ) -> None:
     """Add month statistics to the list
 
         Arguments
         ---------
-            `Incomes_categories` (dict): income categories to add statistics
-            `Expenses_categories` (dict): expense categories to add statistics
+            `month_statistics_data` (tuple|None): collected month statistics. None if month doesn't have transactions
             `month_statistics` (QListWidget): list to add statistic
-            `current_month` (int): month to add statistics
+            `year` (int): year of statistics
+            `month` (int): month of statistics
     """
 
     def add_categories_months_sum(categories:dict[int, float], category_type:str) -> None:
@@ -336,12 +434,15 @@ def add_month_statistics(
                 )
             )
 
-    Incomes_statistic = get_min_and_max_categories(Incomes_categories, current_month)
-    Expenses_statistic = get_min_and_max_categories(Expenses_categories, current_month)
+    if month_statistics_data is None:
+        month_statistics.addItem(WindowsRegistry.Messages.no_transactions.text())
+        return
+
+    Incomes_statistic, Expenses_statistic = month_statistics_data
 
     total_income = round(sum([Incomes_statistic[4][category_id] for category_id in Incomes_statistic[4]]), 2)
     total_expense = round(sum([Expenses_statistic[4][category_id] for category_id in Expenses_statistic[4]]), 2)
-    _, days_amount = monthrange(AppCore.instance().current_year, current_month)
+    _, days_amount = monthrange(year, month)
 
     month_statistics.addItem(f"{LanguageStructure.Statistics.get_translation(4)}{total_income}")
     month_statistics.addItem(f"{LanguageStructure.Statistics.get_translation(5)}{round(total_income/days_amount, 2)}<br/>")
@@ -360,10 +461,12 @@ def add_month_statistics(
     add_categories_months_sum(Expenses_statistic[4], CategoryType.Expense)
 
 def show_monthly_statistics() -> int:
-    """This method is used to show the monthly statistics window."""
+    """This method is used to show the monthly statistics window. Statistics are collected on a query executor worker thread.
+    If incomes or expenses categories don't have transactions in the month, it's shown in the statistics list."""
 
     app_core = AppCore.instance()
     WindowsRegistry.MonthlyStatistics.setWindowTitle(LanguageStructure.Months.get_translation(app_core.current_month))
+    app_core.query_executor.cancel("monthly_statistics")
     WindowsRegistry.MonthlyStatistics.statistics.clear()
     app_core.get_income_and_expense_categories()
     Incomes_categories, Expenses_categories = app_core.get_income_and_expense_categories_as_ids()
@@ -371,16 +474,38 @@ def show_monthly_statistics() -> int:
     if len(app_core.categories) < 2 or len(Incomes_categories) < 1 or len(Expenses_categories) < 1:
         return WindowsRegistry.Messages.no_category.exec()
 
-    Incomes_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-        Incomes_categories, app_core.current_year, app_core.current_month)
-    Expenses_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-        Expenses_categories, app_core.current_year, app_core.current_month)
+    year, month = app_core.current_year, app_core.current_month
+    transaction_query = app_core.db.transaction_query
+    is_cancelled = app_core.query_executor.is_current_query_cancelled
+
+    def _collect_month_statistics() -> MonthStatisticsData|None:
+        """Collect statistics of the month if both incomes and expenses categories have transactions in it."""
+
+        if not (
+            transaction_query.check_categories_have_transactions(Incomes_categories, year, month) and
+            transaction_query.check_categories_have_transactions(Expenses_categories, year, month)
+        ):
+            return None
+
+        return get_cached_statistics(
+            "monthly", Incomes_categories, Expenses_categories, year, [month],
+            lambda: collect_month_statistics(
+                Incomes_categories, Expenses_categories, year, month,
+                load_statistics_engine(Incomes_categories + Expenses_categories, year, [month], is_cancelled)
+            ),
+            is_cancelled
+        )
+
+    def _add_month_statistics(month_statistics_data:MonthStatisticsData|None) -> None:
+        WindowsRegistry.MonthlyStatistics.statistics_progress.setVisible(False)
+        add_month_statistics(month_statistics_data, WindowsRegistry.MonthlyStatistics.statistics, year, month)
 
-    if not (Incomes_categories_have_transactions and Expenses_categories_have_transactions):
-        return WindowsRegistry.Messages.no_transactions.exec()
-    
-    add_month_statistics(
-        Incomes_categories, Expenses_categories, WindowsRegistry.MonthlyStatistics.statistics, app_core.current_month
+    start_statistics_progress(WindowsRegistry.MonthlyStatistics.statistics_progress, 0)
+    app_core.query_executor.submit(
+        "monthly_statistics",
+        _collect_month_statistics,
+        _add_month_statistics,
+        partial(fail_statistics, WindowsRegistry.MonthlyStatistics.statistics_progress)
     )
     
     WindowsRegistry.StatisticsWindow.done(1)
@@ -388,45 +513,29 @@ def show_monthly_statistics() -> int:
     return WindowsRegistry.MonthlyStatistics.exec()
 
 
-def show_quarterly_statistics() -> int:
-    """This method is used to show the quarterly statistics window."""
+def add_quarterly_statistics(quarters_statistics_data:list[PeriodStatisticsData], year:int) -> None:
+    """Add collected statistics of every quarter to quarterly statistics window. Lists are populated when they become visible.
 
-    app_core = AppCore.instance()
-    #Clear quarters statistics
-    for quarter in WindowsRegistry.QuarterlyStatistics.statistics.quarters:
-        quarter.total_quarter_statistics.data.clear()
-        for month in quarter.months:
-            month.data.clear()
-
-    Incomes_categories, Expenses_categories = app_core.get_income_and_expense_categories_as_ids()
+        Arguments
+        ---------
+            `quarters_statistics_data` (list): collected statistics of every quarter
+            `year` (int): year of statistics
+    """
 
-    if len(app_core.categories) < 2 or len(Expenses_categories) < 1 or len(Incomes_categories) < 1:
-        return WindowsRegistry.Messages.no_category.exec()
-    
-    for quarter in WindowsRegistry.QuarterlyStatistics.statistics.quarters:
-        Incomes_categories_total_values:CategoriesTotalValues = {}
-        Expenses_categories_total_values:CategoriesTotalValues = {}
+    def _add_total_quarter_statistics(
+            Total_statistic_list:QListWidget,
+            quarter_number:int,
+            quarter_statistics_data:PeriodStatisticsData
+        ) -> None:
+        """Add statistics of entire quarter to its list."""
 
-        categories_total_values:dict[int, list[float]] = app_core.db.statistics_query.get_categories_monthly_transactions_sum_by_months(
-            Incomes_categories, app_core.current_year, [month.month_number for month in quarter.months])
-        for income_category in Incomes_categories:
-            Incomes_categories_total_values[income_category] = round(sum(categories_total_values[income_category]), 2)
-        
-        categories_total_values.clear()
-        categories_total_values = app_core.db.statistics_query.get_categories_monthly_transactions_sum_by_months(
-            Expenses_categories, app_core.current_year, [month.month_number for month in quarter.months])
-        for expenses_category in Expenses_categories:
-            Expenses_categories_total_values[expenses_category] = round(sum(categories_total_values[expenses_category]), 2)
+        Incomes_categories_total_values, Expenses_categories_total_values, _ = quarter_statistics_data
 
-        #Entire quarter statistics
         total_income:float = round(sum(total_value for total_value in Incomes_categories_total_values.values()), 2)
         total_expense:float = round(sum(total_value for total_value in Expenses_categories_total_values.values()), 2)
 
-        quarter_number = quarter.quarter_number
         months_in_quarter = range((quarter_number - 1) * 3 + 1, quarter_number * 3 + 1)
-        days_amount = sum(monthrange(app_core.current_year, month)[1] for month in months_in_quarter)
-
-        Total_statistic_list = quarter.total_quarter_statistics.data
+        days_amount = sum(monthrange(year, month)[1] for month in months_in_quarter)
 
         Total_statistic_list.addItem(LanguageStructure.Statistics.get_translation(4)+str(total_income))
         Total_statistic_list.addItem(LanguageStructure.Statistics.get_translation(25)+str(round(total_income/3, 2)))
@@ -458,56 +567,99 @@ def show_quarterly_statistics() -> int:
             3,
         )
 
+    lazy_panels = WindowsRegistry.QuarterlyStatistics.lazy_panels
+    quarters = WindowsRegistry.QuarterlyStatistics.statistics.quarters
+    for quarter, quarter_statistics_data in zip(quarters, quarters_statistics_data):
+        lazy_panels.set_panel(
+            quarter.total_quarter_statistics.data,
+            partial(_add_total_quarter_statistics, quarter.total_quarter_statistics.data, quarter.quarter_number, quarter_statistics_data)
+        )
+
         #Months statistics
+        months_statistics = quarter_statistics_data[2]
         for month in quarter.months:
-            Incomes_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-                                                        Incomes_categories, app_core.current_year, month.month_number)
-            Expenses_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-                                                        Expenses_categories, app_core.current_year, month.month_number)
-
-            if Incomes_categories_have_transactions and Expenses_categories_have_transactions:
-                add_month_statistics(Incomes_categories, Expenses_categories, month.data, month.month_number)
-            else:
-                month.data.addItem(WindowsRegistry.Messages.no_transactions.text())
-
-    WindowsRegistry.StatisticsWindow.done(1)
-    logger.debug(f"Quarterly statistics window is shown. Current year: {app_core.current_year}")
-    return WindowsRegistry.QuarterlyStatistics.exec()
+            lazy_panels.set_panel(
+                month.data,
+                partial(add_month_statistics, months_statistics[month.month_number], month.data, year, month.month_number)
+            )
 
 
-def show_yearly_statistics() -> int:
-    """This method is used to show the yearly statistics window."""
+def show_quarterly_statistics() -> int:
+    """This method is used to show the quarterly statistics window. Statistics are collected on a query executor worker thread."""
 
     app_core = AppCore.instance()
-    #Clear yearly statistics
-    WindowsRegistry.YearlyStatistics.statistics.total_year_statistics.data.clear()
-    for ymonth in WindowsRegistry.YearlyStatistics.statistics.months:
-        ymonth.data.clear()
-    
+    app_core.query_executor.cancel("quarterly_statistics")
+    WindowsRegistry.QuarterlyStatistics.lazy_panels.clear()
+    #Clear quarters statistics
+    for quarter in WindowsRegistry.QuarterlyStatistics.statistics.quarters:
+        quarter.total_quarter_statistics.data.clear()
+        for month in quarter.months:
+            month.data.clear()
+
     Incomes_categories, Expenses_categories = app_core.get_income_and_expense_categories_as_ids()
+
     if len(app_core.categories) < 2 or len(Expenses_categories) < 1 or len(Incomes_categories) < 1:
         return WindowsRegistry.Messages.no_category.exec()
     
-    Incomes_categories_total_values:CategoriesTotalValues = {}
-    Expenses_categories_total_values:CategoriesTotalValues = {}
+    year = app_core.current_year
+    quarters_months = [
+        [month.month_number for month in quarter.months] for quarter in WindowsRegistry.QuarterlyStatistics.statistics.quarters
+    ]
 
-    categories_total_values:dict[int, list[float]] = app_core.db.statistics_query.get_categories_monthly_transactions_sum_by_months(
-        Incomes_categories, app_core.current_year, list(range(1,13)))
-    for income_category in Incomes_categories:
-        Incomes_categories_total_values[income_category] = round(sum(categories_total_values[income_category]), 2)
-    
-    categories_total_values.clear()
-    categories_total_values = app_core.db.statistics_query.get_categories_monthly_transactions_sum_by_months(
-        Expenses_categories, app_core.current_year, list(range(1,13)))
-    for expenses_category in Expenses_categories:
-        Expenses_categories_total_values[expenses_category] = round(sum(categories_total_values[expenses_category]), 2)
+    def _collect_quarters_statistics() -> list[PeriodStatisticsData]:
+        """Load transactions of the year once and collect statistics of every quarter from them."""
+
+        is_cancelled = app_core.query_executor.is_current_query_cancelled
+        statistics_engine = load_statistics_engine(
+            Incomes_categories + Expenses_categories, year, list(range(1, 13)), is_cancelled
+        )
+        return [
+            collect_period_statistics(
+                Incomes_categories, Expenses_categories, year, quarter_months, statistics_engine,
+                lambda collected_months: app_core.query_executor.report_progress(
+                    "quarterly_statistics", quarter_index * len(quarter_months) + collected_months
+                ),
+                is_cancelled
+            )
+            for quarter_index, quarter_months in enumerate(quarters_months)
+        ]
+
+    def _add_quarterly_statistics(quarters_statistics_data:list[PeriodStatisticsData]) -> None:
+        WindowsRegistry.QuarterlyStatistics.statistics_progress.setVisible(False)
+        add_quarterly_statistics(quarters_statistics_data, year)
+
+    start_statistics_progress(WindowsRegistry.QuarterlyStatistics.statistics_progress, 12)
+    app_core.query_executor.submit(
+        "quarterly_statistics",
+        lambda: get_cached_statistics(
+            "quarterly", Incomes_categories, Expenses_categories, year, list(range(1, 13)),
+            _collect_quarters_statistics, app_core.query_executor.is_current_query_cancelled
+        ),
+        _add_quarterly_statistics,
+        partial(fail_statistics, WindowsRegistry.QuarterlyStatistics.statistics_progress),
+        on_progress=WindowsRegistry.QuarterlyStatistics.statistics_progress.setValue
+    )
+
+    WindowsRegistry.StatisticsWindow.done(1)
+    logger.debug(f"Quarterly statistics window is shown. Current year: {app_core.current_year}")
+    return WindowsRegistry.QuarterlyStatistics.exec()
+
+
+def add_total_year_statistics(Total_statistic_list:QListWidget, year_statistics_data:PeriodStatisticsData, year:int) -> None:
+    """Add statistics of entire year to the list
+
+        Arguments
+        ---------
+            `Total_statistic_list` (QListWidget): list to add statistics
+            `year_statistics_data` (tuple): collected statistics of the year
+            `year` (int): year of statistics
+    """
+
+    Incomes_categories_total_values, Expenses_categories_total_values, _ = year_statistics_data
 
-    #Entire year statistics
     total_income = round(sum(Incomes_categories_total_values.values()), 2)
     total_expense = round(sum(Expenses_categories_total_values.values()), 2)
-    days_amount = 365 if app_core.current_year % 4 != 0 else 366# 365 days if year is not leap
-
-    Total_statistic_list = WindowsRegistry.YearlyStatistics.statistics.total_year_statistics.data
+    days_amount = 365 if year % 4 != 0 else 366# 365 days if year is not leap
 
     Total_statistic_list.addItem(LanguageStructure.Statistics.get_translation(4)+str(total_income))
     Total_statistic_list.addItem(LanguageStructure.Statistics.get_translation(25)+str(round(total_income/12, 2)))
@@ -525,16 +677,66 @@ def show_yearly_statistics() -> int:
     Total_statistic_list.addItem("<br/><br/>"+LanguageStructure.MainWindow.get_translation(2))
     add_total_statistics(Expenses_categories_total_values, [17,20], Total_statistic_list, CategoryType.Expense, days_amount, 12 )
 
+
+def add_yearly_statistics(year_statistics_data:PeriodStatisticsData, year:int) -> None:
+    """Add collected statistics of the year to yearly statistics window. Lists are populated when they become visible.
+
+        Arguments
+        ---------
+            `year_statistics_data` (tuple): collected statistics of the year
+            `year` (int): year of statistics
+    """
+
+    lazy_panels = WindowsRegistry.YearlyStatistics.lazy_panels
+    Total_statistic_list = WindowsRegistry.YearlyStatistics.statistics.total_year_statistics.data
+    lazy_panels.set_panel(Total_statistic_list, partial(add_total_year_statistics, Total_statistic_list, year_statistics_data, year))
+
+    months_statistics = year_statistics_data[2]
     for ymonth in WindowsRegistry.YearlyStatistics.statistics.months:
-        Incomes_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-            Incomes_categories, app_core.current_year, ymonth.month_number)
-        Expenses_categories_have_transactions = app_core.db.transaction_query.check_categories_have_transactions(
-            Expenses_categories, app_core.current_year, ymonth.month_number)
+        lazy_panels.set_panel(
+            ymonth.data,
+            partial(add_month_statistics, months_statistics[ymonth.month_number], ymonth.data, year, ymonth.month_number)
+        )
 
-        if Incomes_categories_have_transactions and Expenses_categories_have_transactions:
-            add_month_statistics(Incomes_categories, Expenses_categories, ymonth.data, ymonth.month_number)
-        else:
-            ymonth.data.addItem(WindowsRegistry.Messages.no_transactions.text())
+
+def show_yearly_statistics() -> int:
+    """This method is used to show the yearly statistics window. Statistics are collected on a query executor worker thread."""
+
+    app_core = AppCore.instance()
+    app_core.query_executor.cancel("yearly_statistics")
+    WindowsRegistry.YearlyStatistics.lazy_panels.clear()
+    #Clear yearly statistics
+    WindowsRegistry.YearlyStatistics.statistics.total_year_statistics.data.clear()
+    for ymonth in WindowsRegistry.YearlyStatistics.statistics.months:
+        ymonth.data.clear()
+    
+    Incomes_categories, Expenses_categories = app_core.get_income_and_expense_categories_as_ids()
+    if len(app_core.categories) < 2 or len(Expenses_categories) < 1 or len(Incomes_categories) < 1:
+        return WindowsRegistry.Messages.no_category.exec()
+    
+    year = app_core.current_year
+
+    def _add_yearly_statistics(year_statistics_data:PeriodStatisticsData) -> None:
+        WindowsRegistry.YearlyStatistics.statistics_progress.setVisible(False)
+        add_yearly_statistics(year_statistics_data, year)
+
+    start_statistics_progress(WindowsRegistry.YearlyStatistics.statistics_progress, 12)
+    is_cancelled = app_core.query_executor.is_current_query_cancelled
+    app_core.query_executor.submit(
+        "yearly_statistics",
+        lambda: get_cached_statistics(
+            "yearly", Incomes_categories, Expenses_categories, year, list(range(1, 13)),
+            lambda: collect_period_statistics(
+                Incomes_categories, Expenses_categories, year, list(range(1,13)),
+                progress_callback=lambda collected_months: app_core.query_executor.report_progress("yearly_statistics", collected_months),
+                is_cancelled=is_cancelled
+            ),
+            is_cancelled
+        ),
+        _add_yearly_statistics,
+        partial(fail_statistics, WindowsRegistry.YearlyStatistics.statistics_progress),
+        on_progress=WindowsRegistry.YearlyStatistics.statistics_progress.setValue
+    )
 
     WindowsRegistry.StatisticsWindow.done(1)
     logger.debug(f"Yearly statistics window is shown. Current year: {app_core.current_year}")
@@ -551,9 +753,62 @@ def show_custom_range_statistics_window() -> None:
     WindowsRegistry.CustomRangeStatistics.exec()
 
 
+def collect_custom_range_statistics(
+        Incomes_categories:list[Category],
+        Expenses_categories:list[Category],
+        from_date:date,
+        to_date:date,
+        is_cancelled:Callable[[], bool]|None = None
+    ) -> CustomRangeStatisticsData:
+    """Collect totals and sorted transactions of categories in range.
+    It only reads database, so it can be run on a query executor worker thread.
+
+        Arguments
+        ---------
+            `Incomes_categories` (list): income categories to collect statistics
+            `Expenses_categories` (list): expense categories to collect statistics
+            `from_date` (date): start of the range
+            `to_date` (date): end of the range (inclusive)
+            `is_cancelled` (Callable|None): function that returns True if statistics collection was cancelled
+        Returns
+        -------
+            `tuple` - Income and expense categories total values and their transactions sorted by date.
+    """
+
+    all_transactions = AppCore.instance().db.statistics_query.get_transactions_by_range(
+        [category.id for category in Incomes_categories + Expenses_categories], from_date, to_date, is_cancelled
+    )
+
+    categorized_transactions:defaultdict[int, list[TransactionRow]] = defaultdict(list)
+    for transaction in all_transactions:
+        categorized_transactions[transaction.category_id].append(transaction)
+
+    def _collect_categories(
+            categories:list[Category]
+        ) -> tuple[CategoriesTotalValues, dict[Category, list[TransactionRow]]]:
+        """Sum transactions of every category and sort them by date."""
+
+        categories_total_values:CategoriesTotalValues = {}
+        categories_transactions:dict[Category, list[TransactionRow]] = {}
+
+        for category in categories:
+            category_transactions = categorized_transactions[category.id]
+            categories_total_values[category.id] = round(sum([transaction.value for transaction in category_transactions]), 2)
+            categories_transactions[category] = sorted(category_transactions, key=lambda transaction: transaction.date)
+        return categories_total_values, categories_transactions
+
+    Incomes_categories_total_values, Incomes_categories_transactions = _collect_categories(Incomes_categories)
+    Expenses_categories_total_values, Expenses_categories_transactions = _collect_categories(Expenses_categories)
+    return (
+        Incomes_categories_total_values, Expenses_categories_total_values,
+        Incomes_categories_transactions, Expenses_categories_transactions
+    )
+
+
 def show_custom_range_statistics_view() -> int:
-    """This method is used to show the actual custom range statistics."""
+    """This method is used to show the actual custom range statistics. Transactions are loaded on a query executor worker thread."""
 
+    AppCore.instance().query_executor.cancel("custom_range_statistics")
     #Reset statistics and transactions list
     WindowsRegistry.CustomRangeStatisticsView.statistics_list.clear()
     WindowsRegistry.CustomRangeStatisticsView.transactions_list.clear()
@@ -572,110 +827,105 @@ def show_custom_range_statistics_view() -> int:
 
     Incomes_categories, Expenses_categories = WindowsRegistry.CustomRangeStatistics.categories_selection.get_selected_income_and_expense_categories()
 
-    all_transactions = AppCore.instance().db.statistics_query.get_transactions_by_range(
-        list(map(lambda category: category.id, Incomes_categories+Expenses_categories)),
-        cast(date, from_date.toPython()), cast(date, to_date.toPython())
-    )
-    categorized_transactions:defaultdict[int, list[Transaction]] = defaultdict(list)
-    for transaction in all_transactions:
-        categorized_transactions[transaction.category_id].append(transaction)
+    from_python_date, to_python_date = cast(date, from_date.toPython()), cast(date, to_date.toPython())
 
-    Incomes_categories_total_values = {}
-    Expenses_categories_total_values = {}
+    def add_custom_range_statistics(custom_range_statistics_data:CustomRangeStatisticsData) -> None:
+        """Add custom range statistics and transactions to the lists.
 
-    Incomes_categories_transactions:dict[Category, list[Transaction]] = {}
-    Expenses_categories_transactions:dict[Category, list[Transaction]] = {}
+            Arguments
+            ---------
+                `custom_range_statistics_data` (tuple): collected totals and sorted transactions of categories
+        """
 
-    for income_category in Incomes_categories:
-        category_transactions = categorized_transactions[income_category.id]
-        total_value = round(sum([transaction.value for transaction in category_transactions]), 2)
+        WindowsRegistry.CustomRangeStatisticsView.statistics_progress.setVisible(False)
+        (
+            Incomes_categories_total_values, Expenses_categories_total_values,
+            Incomes_categories_transactions, Expenses_categories_transactions
+        ) = custom_range_statistics_data
 
-        Incomes_categories_transactions[income_category] = sorted(
-            category_transactions, key=lambda transaction: transaction.date
-        )
-        Incomes_categories_total_values[income_category.id] = total_value
-        
-    for expense_category in Expenses_categories:
-        category_transactions = categorized_transactions[expense_category.id]
-        total_value = round(sum([transaction.value for transaction in category_transactions]), 2)
+        total_income = round(sum(total_value for total_value in Incomes_categories_total_values.values()), 2)
+        total_expense = round(sum(total_value for total_value in Expenses_categories_total_values.values()), 2)
 
-        Expenses_categories_transactions[expense_category] = sorted(
-            category_transactions, key=lambda transaction: transaction.date
+        #Custom range statistics
+        WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
+            LanguageStructure.Statistics.get_translation(4)+str(total_income)
+        )
+        WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
+            LanguageStructure.Statistics.get_translation(24)+str(round(total_income/days_amount, 2))+"<br/>"
         )
-        Expenses_categories_total_values[expense_category.id] = total_value
-    
-    total_income = round(sum(total_value for total_value in Incomes_categories_total_values.values()), 2)
-    total_expense = round(sum(total_value for total_value in Expenses_categories_total_values.values()), 2)
-
-    #Custom range statistics
-    WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-        LanguageStructure.Statistics.get_translation(4)+str(total_income)
-    )
-    WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-        LanguageStructure.Statistics.get_translation(24)+str(round(total_income/days_amount, 2))+"<br/>"
-    )
-
-    WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-        LanguageStructure.Statistics.get_translation(6)+str(total_expense)
-    )
-    WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-        LanguageStructure.Statistics.get_translation(26)+str(round(total_expense/days_amount, 2))+"<br/>"
-    )
-
-    WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-        LanguageStructure.Statistics.get_translation(8)+f"{round(total_income - total_expense, 2)}"
-    )
 
-    months = (to_date.year () - from_date.year()) * 12 + (to_date.month() - from_date.month())
-    if len(Incomes_categories):
         WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-            "<br/><br/>"+LanguageStructure.MainWindow.get_translation(1)
+            LanguageStructure.Statistics.get_translation(6)+str(total_expense)
+        )
+        WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
+            LanguageStructure.Statistics.get_translation(26)+str(round(total_expense/days_amount, 2))+"<br/>"
         )
-        add_total_statistics(Incomes_categories_total_values, [9,13], WindowsRegistry.CustomRangeStatisticsView.statistics_list, CategoryType.Income, days_amount, months)
 
-    if len(Expenses_categories):
         WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
-            "<br/><br/>"+LanguageStructure.MainWindow.get_translation(2)
+            LanguageStructure.Statistics.get_translation(8)+f"{round(total_income - total_expense, 2)}"
         )
-        add_total_statistics(Expenses_categories_total_values, [17,20], WindowsRegistry.CustomRangeStatisticsView.statistics_list, CategoryType.Expense, days_amount, months)
+
+        months = (to_date.year () - from_date.year()) * 12 + (to_date.month() - from_date.month())
+        if len(Incomes_categories):
+            WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
+                "<br/><br/>"+LanguageStructure.MainWindow.get_translation(1)
+            )
+            add_total_statistics(Incomes_categories_total_values, [9,13], WindowsRegistry.CustomRangeStatisticsView.statistics_list, CategoryType.Income, days_amount, months)
+
+        if len(Expenses_categories):
+            WindowsRegistry.CustomRangeStatisticsView.statistics_list.addItem(
+                "<br/><br/>"+LanguageStructure.MainWindow.get_translation(2)
+            )
+            add_total_statistics(Expenses_categories_total_values, [17,20], WindowsRegistry.CustomRangeStatisticsView.statistics_list, CategoryType.Expense, days_amount, months)
     
-    def add_transaction_to_transactions_list(transaction:Transaction) -> None:
-        day = transaction.date.day                
-        month = transaction.date.month
-        year = transaction.date.year
-        item_text = dedent(f"""
-        <table width="100%">
-            <tr>
-                <td width="15%">{day:02}/{month:02}/{year}</td>
-                <td width="20%" align="right">{transaction.value}</td>
-                <td width="65%" align="center">{transaction.name}</td>
-            </tr>
-        </table>
-        """)
-        WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(item_text)
+        def add_transaction_to_transactions_list(transaction:TransactionRow) -> None:
+            day = transaction.date.day                
+            month = transaction.date.month
+            year = transaction.date.year
+            item_text = dedent(f"""
+            <table width="100%">
+                <tr>
+                    <td width="15%">{day:02}/{month:02}/{year}</td>
+                    <td width="20%" align="right">{transaction.value}</td>
+                    <td width="65%" align="center">{transaction.name}</td>
+                </tr>
+            </table>
+            """)
+            WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(item_text)
     
-    def add_category_to_statistics(categories_transactions:dict[Category, list[Transaction]]) -> None:
-        for category, category_transactions in categories_transactions.items():
-            if len(category_transactions) == 0:
-                WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
-                    f"<br/>{category.name} {LanguageStructure.Statistics.get_translation(39)}<br/>"
-                )
-            else:
-                WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(f"<br/>{category.name}<br/>")
-                for transaction in category_transactions:
-                    add_transaction_to_transactions_list(transaction)
-    #Transactions list
-    if len(Incomes_categories_transactions):
-        WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
-            LanguageStructure.MainWindow.get_translation(1)+"<br/>"
-        )
-        add_category_to_statistics(Incomes_categories_transactions)
+        def add_category_to_statistics(categories_transactions:dict[Category, list[TransactionRow]]) -> None:
+            for category, category_transactions in categories_transactions.items():
+                if len(category_transactions) == 0:
+                    WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
+                        f"<br/>{category.name} {LanguageStructure.Statistics.get_translation(39)}<br/>"
+                    )
+                else:
+                    WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(f"<br/>{category.name}<br/>")
+                    for transaction in category_transactions:
+                        add_transaction_to_transactions_list(transaction)
+        #Transactions list
+        if len(Incomes_categories_transactions):
+            WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
+                LanguageStructure.MainWindow.get_translation(1)+"<br/>"
+            )
+            add_category_to_statistics(Incomes_categories_transactions)
     
-    if len(Expenses_categories_transactions):
-        WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
-            "<br/><br/>"+LanguageStructure.MainWindow.get_translation(2)+"<br/>"
-        )
-        add_category_to_statistics(Expenses_categories_transactions)
+        if len(Expenses_categories_transactions):
+            WindowsRegistry.CustomRangeStatisticsView.transactions_list.addItem(
+                "<br/><br/>"+LanguageStructure.MainWindow.get_translation(2)+"<br/>"
+            )
+            add_category_to_statistics(Expenses_categories_transactions)
+
+    query_executor = AppCore.instance().query_executor
+    start_statistics_progress(WindowsRegistry.CustomRangeStatisticsView.statistics_progress, 0)
+    query_executor.submit(
+        "custom_range_statistics",
+        lambda: collect_custom_range_statistics(
+            Incomes_categories, Expenses_categories, from_python_date, to_python_date, query_executor.is_current_query_cancelled
+        ),
+        add_custom_range_statistics,
+        partial(fail_statistics, WindowsRegistry.CustomRangeStatisticsView.statistics_progress)
+    )
 
     logger.debug(f"Custom range statistics window is shown. From date: {from_date} To date: {to_date}")
     return WindowsRegistry.CustomRangeStatisticsView.exec()
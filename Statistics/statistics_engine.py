@@ -0,0 +1,173 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, TypeAlias
+from collections import Counter
+
+if TYPE_CHECKING:
+    from typing import Iterable
+    from backend.statistics_query import CategoryMonthStatisticsRow
+
+
+
+
+CountedTransactionsWithLowestValue:TypeAlias = dict[str, int]
+CountedTransactionsWithHighestValue:TypeAlias = dict[str, int]
+
+CategoriesWithHighestTotalValue:TypeAlias = dict[int, tuple[
+    CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
+]]
+CategoriesWithLowestTotalValue:TypeAlias = dict[int, tuple[
+    CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
+]]
+CategoriesTotalValues:TypeAlias = dict[int, float]
+MinAndMaxCategories:TypeAlias = tuple[
+    CategoriesWithHighestTotalValue, float, CategoriesWithLowestTotalValue, float, CategoriesTotalValues
+]
+
+
+class CategoryMonthStatistics:
+    """Aggregated transactions of one category in one month."""
+
+    def __init__(self, total:float, transactions_count:int, lowest_value:float, highest_value:float) -> None:
+        self.total = total
+        self.transactions_count = transactions_count
+        self.highest_value = highest_value
+        self.highest_value_names:Counter[str] = Counter()
+        self.lowest_value = lowest_value
+        self.lowest_value_names:Counter[str] = Counter()
+
+
+    def add_extreme_transaction(self, value:float, name:str) -> None:
+        """Count name of transaction with the highest or the lowest value.
+
+            Arguments
+            ---------
+                `value` : (float) - Value of the transaction.
+                `name` : (str) - Name of the transaction.
+        """
+
+        if value == self.highest_value:
+            self.highest_value_names[name] += 1
+        if value == self.lowest_value:
+            self.lowest_value_names[name] += 1
+
+
+
+class StatisticsEngine:
+    """Calculates statistics of a period from category months aggregates loaded with one query.
+    Statistics of every month and category are read from memory instead of querying database for each of them.
+    """
+
+    def __init__(self, categories_months_rows:Iterable[CategoryMonthStatisticsRow]) -> None:
+        self.categories_months:dict[tuple[int, int], CategoryMonthStatistics] = {}
+
+        for category_id, month, total, transactions_count, min_value, max_value, value, name in categories_months_rows:
+            category_month = self.categories_months.get((category_id, month))
+            if category_month is None:
+                category_month = CategoryMonthStatistics(total, transactions_count, min_value, max_value)
+                self.categories_months[(category_id, month)] = category_month
+            category_month.add_extreme_transaction(value, str(name))
+
+
+    def get_category_month_total(self, category_id:int, month:int) -> float:
+        """Get rounded sum of category transactions in month. It's 0 if category doesn't have transactions."""
+
+        category_month = self.categories_months.get((category_id, month))
+        return round(category_month.total, 2) if category_month is not None else 0
+
+
+    def categories_have_transactions(self, categories_id:list[int], month:int) -> bool:
+        """Check if any of the categories has transactions in month."""
+
+        return any((category_id, month) in self.categories_months for category_id in categories_id)
+
+
+    def get_categories_period_total(self, categories_id:list[int], months:list[int]) -> CategoriesTotalValues:
+        """Get sum of transactions of every category in all months.
+
+            Arguments
+            ---------
+                `categories_id` : (list[int]) - Categories to sum.
+                `months` : (list[int]) - Months of the period.
+            Returns
+            -------
+                `dict` - Category id and its rounded total value.
+        """
+
+        return {
+            category_id:round(sum(self.get_category_month_total(category_id, month) for month in months), 2)
+            for category_id in categories_id
+        }
+
+
+    def get_min_and_max_transactions(self, category_id:int, month:int) -> tuple[
+        CountedTransactionsWithHighestValue, float, CountedTransactionsWithLowestValue, float
+    ]:
+        """Get transactions with highest and lowest value in category.
+
+            Arguments
+            ---------
+                `category_id` (int): category to get transactions
+                `month` (int): month to get transactions
+            Returns
+            -------
+                `tuple`:
+                    `transactions_with_highest_value` (dict) - counted names of transactions with highest value<br/>
+                    `highest_transaction_value` (float) - highest transaction value in category<br/>
+                    `transactions_with_lowest_value` (dict) - counted names of transactions with lowest value<br/>
+                    `lowest_transaction_value` (float) - lowest transaction value in category
+        """
+
+        category_month = self.categories_months.get((category_id, month))
+        if category_month is None:
+            return {}, 0, {}, 0
+
+        return (
+            dict(category_month.highest_value_names),
+            category_month.highest_value if category_month.highest_value else 0,
+            dict(category_month.lowest_value_names),
+            category_month.lowest_value if category_month.lowest_value else 0
+        )
+
+
+    def get_min_and_max_categories(self, unsorted_categories:list[int], month:int) -> MinAndMaxCategories:
+        """Get categories with highest and lowest values based on transactions in month.
+
+            Arguments
+            -------
+                `unsorted_categories` (list): categories to sort
+                `month` (int): month to get transactions
+            Returns
+            -------
+                `Categories_with_highest_total_value` (dict): - all categories with highest value,\
+                    if more than one category have the same top value
+                `Categories_with_lowest_total_value` (dict): - all categories with lowest value,\
+                    if more than one category have the same bottom value returns 0 categories if only 1 category exists<br/>
+                `Categories_total_values` (dict): - all categories with their total value
+        """
+
+        Categories_total_values:CategoriesTotalValues = {
+            category:self.get_category_month_total(category, month) for category in unsorted_categories
+        }
+        highest_total_value = max(Categories_total_values.values())
+
+        #Highest categories
+        Categories_with_highest_total_value:CategoriesWithHighestTotalValue = {
+            category:self.get_min_and_max_transactions(category, month)
+            for category, total_value in Categories_total_values.items() if total_value == highest_total_value
+        }
+
+        #Lowest categories
+        Categories_total_values = {
+            category:total_value for category, total_value in Categories_total_values.items() if total_value != 0
+        }
+
+        Categories_with_lowest_total_value:CategoriesWithLowestTotalValue = {}
+        lowest_total_value = 0.0
+        if len(Categories_total_values) != 0:
+            lowest_total_value = min(Categories_total_values.values())
+
+            for category, total_value in Categories_total_values.items():
+                if total_value == lowest_total_value and total_value != highest_total_value:#If we have only one category don't add it to lowest categories (it is already highest)
+                    Categories_with_lowest_total_value[category] = self.get_min_and_max_transactions(category, month)
+
+        return (Categories_with_highest_total_value, highest_total_value, Categories_with_lowest_total_value, lowest_total_value, Categories_total_values)
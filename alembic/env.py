@@ -1,6 +1,7 @@
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
+from sqlalchemy import event
 from sqlalchemy import pool
 
 from alembic import context
@@ -19,6 +20,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from backend.models import Base
+from backend.fts_utils import register_fts_functions
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -63,6 +65,8 @@ def run_migrations_online() -> None:
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
+    # transactions_fts view and triggers call application SQL functions.
+    event.listen(connectable, "connect", lambda dbapi_connection, connection_record: register_fts_functions(dbapi_connection))
 
     with connectable.connect() as connection:
         context.configure(
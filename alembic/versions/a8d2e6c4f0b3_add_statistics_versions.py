@@ -0,0 +1,61 @@
+"""Add statistics_versions of months maintained by triggers
+
+Revision ID: a8d2e6c4f0b3
+Revises: f1c9d3b7a5e2
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from typing import Sequence, Union, Any, cast
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2e6c4f0b3'
+down_revision: Union[str, None] = 'f1c9d3b7a5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statements are executed through DDL, so % is escaped as %%.
+# Increments version of the month of transaction (creates the row if it doesn't exist).
+BUMP_STATISTICS_VERSION = """
+    INSERT INTO statistics_versions(year, month, version)
+    VALUES (CAST(strftime('%%Y', {row}.date) AS INTEGER), CAST(strftime('%%m', {row}.date) AS INTEGER), 1)
+    ON CONFLICT(year, month) DO UPDATE SET version = version + 1;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('statistics_versions',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'month')
+    )
+
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_statistics_version_insert AFTER INSERT ON transactions BEGIN"
+        f"{BUMP_STATISTICS_VERSION.format(row='NEW')}"
+        "END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_statistics_version_delete AFTER DELETE ON transactions BEGIN"
+        f"{BUMP_STATISTICS_VERSION.format(row='OLD')}"
+        "END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_statistics_version_update AFTER UPDATE OF date, value, name, category_id ON transactions BEGIN"
+        f"{BUMP_STATISTICS_VERSION.format(row='OLD')}"
+        f"{BUMP_STATISTICS_VERSION.format(row='NEW')}"
+        "END"
+    ))
+
+
+def downgrade() -> None:
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_statistics_version_update"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_statistics_version_delete"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_statistics_version_insert"))
+    op.drop_table('statistics_versions')
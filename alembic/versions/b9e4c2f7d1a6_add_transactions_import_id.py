@@ -0,0 +1,28 @@
+"""Add import id of transactions imported from OFX files
+
+Revision ID: b9e4c2f7d1a6
+Revises: a8d2e6c4f0b3
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union, Any, cast
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4c2f7d1a6'
+down_revision: Union[str, None] = 'a8d2e6c4f0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('import_id', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    # Batch mode recreates the table and would drop FTS and statistics triggers, so column is dropped in place (SQLite 3.35+).
+    op.execute(cast(Any, DDL)("ALTER TABLE transactions DROP COLUMN import_id"))
@@ -0,0 +1,115 @@
+"""Add category_month_stats rollup maintained by triggers
+
+Revision ID: c4e1a7d9b3f2
+Revises: b2ea7f1c4d5
+Create Date: 2026-06-02 00:00:00.000000
+
+"""
+from typing import Sequence, Union, Any, cast
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d9b3f2'
+down_revision: Union[str, None] = 'b2ea7f1c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statements are executed through DDL, so % is escaped as %%.
+# Adds transaction to the rollup row of its category and month (creates the row if it doesn't exist).
+ADD_TRANSACTION_TO_STATS = """
+    INSERT INTO category_month_stats(category_id, year, month, total, transactions_count, min_value, max_value)
+    VALUES (
+        {row}.category_id,
+        CAST(strftime('%%Y', {row}.date) AS INTEGER),
+        CAST(strftime('%%m', {row}.date) AS INTEGER),
+        {row}.value, 1, {row}.value, {row}.value
+    )
+    ON CONFLICT(category_id, year, month) DO UPDATE SET
+        total = total + excluded.total,
+        transactions_count = transactions_count + 1,
+        min_value = min(min_value, excluded.min_value),
+        max_value = max(max_value, excluded.max_value);
+"""
+
+# Removes transaction from the rollup row. Min and max can't be decremented, so they are looked up again in the month.
+REMOVE_TRANSACTION_FROM_STATS = """
+    UPDATE category_month_stats SET
+        total = total - {row}.value,
+        transactions_count = transactions_count - 1,
+        min_value = (
+            SELECT min(value) FROM transactions
+            WHERE category_id = {row}.category_id
+            AND date >= date({row}.date, 'start of month') AND date < date({row}.date, 'start of month', '+1 month')
+        ),
+        max_value = (
+            SELECT max(value) FROM transactions
+            WHERE category_id = {row}.category_id
+            AND date >= date({row}.date, 'start of month') AND date < date({row}.date, 'start of month', '+1 month')
+        )
+    WHERE category_id = {row}.category_id
+    AND year = CAST(strftime('%%Y', {row}.date) AS INTEGER)
+    AND month = CAST(strftime('%%m', {row}.date) AS INTEGER);
+
+    DELETE FROM category_month_stats
+    WHERE category_id = {row}.category_id
+    AND year = CAST(strftime('%%Y', {row}.date) AS INTEGER)
+    AND month = CAST(strftime('%%m', {row}.date) AS INTEGER)
+    AND transactions_count <= 0;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('category_month_stats',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('transactions_count', sa.Integer(), nullable=False),
+    sa.Column('min_value', sa.Float(), nullable=True),
+    sa.Column('max_value', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id', 'year', 'month')
+    )
+
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_stats_insert AFTER INSERT ON transactions BEGIN"
+        f"{ADD_TRANSACTION_TO_STATS.format(row='NEW')}"
+        "END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_stats_delete AFTER DELETE ON transactions BEGIN"
+        f"{REMOVE_TRANSACTION_FROM_STATS.format(row='OLD')}"
+        "END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_stats_update AFTER UPDATE OF date, value, category_id ON transactions BEGIN"
+        f"{REMOVE_TRANSACTION_FROM_STATS.format(row='OLD')}"
+        f"{ADD_TRANSACTION_TO_STATS.format(row='NEW')}"
+        "END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER categories_stats_delete AFTER DELETE ON categories BEGIN "
+        "DELETE FROM category_month_stats WHERE category_id = OLD.id; "
+        "END"
+    ))
+
+    # Backfill rollup from existing transactions.
+    op.execute(sa.text(
+        "INSERT INTO category_month_stats(category_id, year, month, total, transactions_count, min_value, max_value) "
+        "SELECT category_id, CAST(strftime('%Y', date) AS INTEGER), CAST(strftime('%m', date) AS INTEGER), "
+        "sum(value), count(*), min(value), max(value) "
+        "FROM transactions GROUP BY category_id, strftime('%Y', date), strftime('%m', date)"
+    ))
+
+
+def downgrade() -> None:
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS categories_stats_delete"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_stats_update"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_stats_delete"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_stats_insert"))
+    op.drop_table('category_month_stats')
@@ -0,0 +1,28 @@
+"""Add composite (category_id, date, value) index to transactions
+
+Revision ID: d7a3c5e9f1b4
+Revises: c4e1a7d9b3f2
+Create Date: 2026-06-09 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c5e9f1b4'
+down_revision: Union[str, None] = 'c4e1a7d9b3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers category month lookups (and min/max recalculation in rollup triggers) without touching the table.
+    op.create_index(
+        'ix_transactions_category_id_date_value', 'transactions', ['category_id', 'date', 'value'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_category_id_date_value', table_name='transactions')
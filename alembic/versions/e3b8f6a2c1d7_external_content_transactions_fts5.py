@@ -0,0 +1,65 @@
+"""Make transactions_fts an external-content FTS5 table maintained by triggers
+
+Revision ID: e3b8f6a2c1d7
+Revises: d7a3c5e9f1b4
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union, Any, cast
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8f6a2c1d7'
+down_revision: Union[str, None] = 'd7a3c5e9f1b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# fts_ngrams is registered on every connection by backend.fts_utils.register_fts_functions (see alembic/env.py).
+# FTS5 reads the content view on 'rebuild', so the index stores n-grams instead of raw names.
+DELETE_FTS_ROW = "INSERT INTO transactions_fts(transactions_fts, rowid, name) VALUES ('delete', OLD.id, fts_ngrams(OLD.name));"
+INSERT_FTS_ROW = "INSERT INTO transactions_fts(rowid, name) VALUES (NEW.id, fts_ngrams(NEW.name));"
+
+
+def upgrade() -> None:
+    op.execute(cast(Any, DDL)("DROP TABLE IF EXISTS transactions_fts"))
+    op.execute(cast(Any, DDL)(
+        "CREATE VIEW transactions_fts_content AS SELECT id, fts_ngrams(name) AS name FROM transactions"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE VIRTUAL TABLE transactions_fts "
+        "USING fts5(name, content='transactions_fts_content', content_rowid='id', tokenize='unicode61 remove_diacritics 1')"
+    ))
+
+    op.execute(cast(Any, DDL)(
+        f"CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN {INSERT_FTS_ROW} END"
+    ))
+    op.execute(cast(Any, DDL)(
+        f"CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN {DELETE_FTS_ROW} END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF name ON transactions WHEN OLD.name IS NOT NEW.name BEGIN "
+        f"{DELETE_FTS_ROW} {INSERT_FTS_ROW} "
+        "END"
+    ))
+
+    # Index only live transactions. Old table could keep rows of transactions deleted with their category or account.
+    op.execute(sa.text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"))
+
+
+def downgrade() -> None:
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_fts_update"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_fts_delete"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_fts_insert"))
+    op.execute(cast(Any, DDL)("DROP TABLE IF EXISTS transactions_fts"))
+    op.execute(cast(Any, DDL)("DROP VIEW IF EXISTS transactions_fts_content"))
+
+    op.execute(cast(Any, DDL)(
+        "CREATE VIRTUAL TABLE transactions_fts "
+        "USING fts5(name, tokenize='unicode61 remove_diacritics 1')"
+    ))
+    op.execute(sa.text("INSERT INTO transactions_fts(rowid, name) SELECT id, fts_ngrams(name) FROM transactions"))
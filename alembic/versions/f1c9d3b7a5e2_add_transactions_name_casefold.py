@@ -0,0 +1,45 @@
+"""Add casefolded transaction name maintained by triggers
+
+Revision ID: f1c9d3b7a5e2
+Revises: e3b8f6a2c1d7
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union, Any, cast
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9d3b7a5e2'
+down_revision: Union[str, None] = 'e3b8f6a2c1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# search_casefold is registered on every connection by backend.fts_utils.register_fts_functions (see alembic/env.py).
+# SQLite can't change NEW row in a trigger, so the column is set by an UPDATE right after the write.
+SET_NAME_CASEFOLD = "UPDATE transactions SET name_casefold = search_casefold(NEW.name) WHERE id = NEW.id;"
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('name_casefold', sa.String(), nullable=True))
+
+    op.execute(cast(Any, DDL)(
+        f"CREATE TRIGGER transactions_name_casefold_insert AFTER INSERT ON transactions BEGIN {SET_NAME_CASEFOLD} END"
+    ))
+    op.execute(cast(Any, DDL)(
+        "CREATE TRIGGER transactions_name_casefold_update AFTER UPDATE OF name ON transactions "
+        f"WHEN OLD.name IS NOT NEW.name BEGIN {SET_NAME_CASEFOLD} END"
+    ))
+
+    op.execute(sa.text("UPDATE transactions SET name_casefold = search_casefold(name)"))
+
+
+def downgrade() -> None:
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_name_casefold_update"))
+    op.execute(cast(Any, DDL)("DROP TRIGGER IF EXISTS transactions_name_casefold_insert"))
+    # Batch mode recreates the table and would drop FTS and statistics triggers, so column is dropped in place (SQLite 3.35+).
+    op.execute(cast(Any, DDL)("ALTER TABLE transactions DROP COLUMN name_casefold"))
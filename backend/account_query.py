@@ -1,8 +1,10 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from sqlalchemy.sql import text
-from backend.models import Account
+from sqlalchemy.sql import text, func as sql_func
+from backend.models import Account, Category, Transaction
+from project_configuration import CategoryType
+from backend.unit_of_work import execute_outside_transaction, write_query
 from AppObjects.logger import get_logger
 
 if TYPE_CHECKING:
@@ -62,7 +64,7 @@ class AccountQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                session.add(Account(name=account_name, start_balance=balance))
+                session.add(Account(name=account_name, start_balance=balance, current_balance=balance))
 
 
     def get_account(self) -> Account:
@@ -102,6 +104,48 @@ class AccountQuery:
                 }, False)
 
 
+    def apply_balance_delta(self, income_delta:float|int, expenses_delta:float|int) -> None:
+        """Apply incremental changes to the account balance in the database.
+        Totals are shifted in a single UPDATE statement, so there is no need to recalculate the balance from all transactions.
+
+            Arguments
+            ---------
+                `income_delta` : (float|int) - Value added to total income. Can be negative.
+                `expenses_delta` : (float|int) - Value added to total expenses. Can be negative.
+        """
+
+        with self.session_factory() as session:
+            with session.begin():
+                session.query(Account).filter_by(id=self.account_id).update({
+                    Account.current_balance:sql_func.round(Account.current_balance + income_delta - expenses_delta, 2),
+                    Account.current_total_income:sql_func.round(Account.current_total_income + income_delta, 2),
+                    Account.current_total_expenses:sql_func.round(Account.current_total_expenses + expenses_delta, 2)
+                }, False)
+
+
+    def get_account_totals(self) -> tuple[float, float]:
+        """Calculate total income and total expenses of the account from all transactions.
+        Sums are calculated by database grouped by category type.
+
+            Returns
+            -------
+                `tuple[float, float]` - Total income and total expenses of the account.
+        """
+
+        with self.session_factory() as session:
+            with session.begin():
+                sums = session.query(
+                    Category.category_type, sql_func.sum(Transaction.value)
+                ).join(Transaction, Transaction.category_id == Category.id).filter(
+                    Category.account_id == self.account_id
+                ).group_by(Category.category_type).all()
+                totals:dict[str, float] = {category_type:total for category_type, total in sums}
+
+        total_income = totals.get(CategoryType.Income)
+        total_expenses = totals.get(CategoryType.Expense)
+        return round(total_income, 2) if total_income else 0, round(total_expenses, 2) if total_expenses else 0
+
+
     def rename_account(self, new_account_name:str) -> None:
         """Rename the account in the database.
 
@@ -120,6 +164,7 @@ class AccountQuery:
                     logger.error(f"Account with ID {self.account_id} not found.")
     
 
+    @write_query
     def delete_account(self) -> None:
         """Delete the account from the database."""
         
@@ -128,5 +173,5 @@ class AccountQuery:
                 account = session.query(Account).filter_by(id=self.account_id).first()
                 session.delete(account)
 
-            session.execute(text("VACUUM"))
+            execute_outside_transaction(session, text("VACUUM"))
   
\ No newline at end of file
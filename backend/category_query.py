@@ -4,6 +4,7 @@ from sqlalchemy.sql import text
 from sqlalchemy import desc, and_
 
 from backend.models import Category
+from backend.unit_of_work import execute_outside_transaction, write_query
 from AppObjects.logger import get_logger
 
 if TYPE_CHECKING:
@@ -41,6 +42,7 @@ class CategoryQuery:
                 return bool(result)
 
 
+    @write_query
     def create_category(self, name:str, category_type:str, position:int) -> None:
         """Create a new category in the database.
 
@@ -80,6 +82,7 @@ class CategoryQuery:
                 return last_category.position + 1
 
 
+    @write_query
     def change_category_position(self, new_position:int, old_position:int, category_id:int, category_type:str) -> None:
         """Change the position of a category in the database.
 
@@ -177,6 +180,7 @@ class CategoryQuery:
                 return session.query(Category).filter_by(account_id=self.account_id).order_by(Category.position).all()
 
 
+    @write_query
     def rename_category(self, category_id:int, new_name:str) -> None:
         """Rename a category in the database.
 
@@ -191,6 +195,7 @@ class CategoryQuery:
                 session.query(Category).filter_by(id=category_id).update({Category.name:new_name}, False)
 
 
+    @write_query
     def delete_category(self, category_id:int) -> None:
         """Delete a category from the database.
 
@@ -216,9 +221,10 @@ class CategoryQuery:
                     raise RuntimeError(f"Category with ID {category_id} not found.")
 
 
-            session.execute(text("VACUUM"))
+            execute_outside_transaction(session, text("VACUUM"))
     
 
+    @write_query
     def set_anomalous_transaction_values(self, category_id:int, min:float|None, max:float|None) -> None:
         """Set the anomalous transaction values for a category.
 
@@ -2,8 +2,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 import os
 import logging
+from contextlib import contextmanager
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
 
 from alembic.config import Config
 from alembic.script import ScriptDirectory
@@ -12,6 +12,7 @@ from alembic import command
 
 from project_configuration import DB_PATH, TEST_DB_PATH, APP_DIRECTORY
 from AppObjects.logger import get_logger
+from AppObjects.user_config import UserConfig
 
 from backend.models import Account
 from backend.account_query import AccountQuery
@@ -20,23 +21,82 @@ from backend.transaction_query import TransactionQuery
 from backend.backup_query import BackupQuery
 from backend.statistics_query import StatisticsQuery
 from backend.search_query import SearchQuery
+from backend.unit_of_work import UnitOfWorkSessionMaker
+from backend.fts_utils import register_fts_functions
 
 if TYPE_CHECKING:
+    from typing import Iterator
     from sqlalchemy import Engine
+    from sqlalchemy.orm import Session
     from sqlite3 import Connection as SQLiteConnection
 
 
 
 logger = get_logger(__name__)
 
+#Negative cache_size is measured in KiB, mmap_size in bytes, busy_timeout in milliseconds
+DB_PROFILES_PRAGMAS:dict[str, dict[str, str|int]] = {
+    UserConfig.DBProfile.SAFE.value:{
+        "journal_mode":"DELETE",
+        "synchronous":"FULL",
+        "cache_size":-2000,
+        "mmap_size":0,
+        "temp_store":"DEFAULT",
+        "busy_timeout":5000
+    },
+    UserConfig.DBProfile.BALANCED.value:{
+        "journal_mode":"WAL",
+        "synchronous":"NORMAL",
+        "cache_size":-16000,
+        "mmap_size":64 * 1024 * 1024,
+        "temp_store":"MEMORY",
+        "busy_timeout":5000
+    },
+    UserConfig.DBProfile.FAST.value:{
+        "journal_mode":"WAL",
+        "synchronous":"OFF",
+        "cache_size":-64000,
+        "mmap_size":256 * 1024 * 1024,
+        "temp_store":"MEMORY",
+        "busy_timeout":5000
+    }
+}
+
+
+def apply_db_profile(dbapi_connection:SQLiteConnection, db_profile:str) -> None:
+    """Set SQLite PRAGMA settings of the profile for the connection.
+
+        Arguments
+        ---------
+            `dbapi_connection` : (SQLiteConnection) - Raw SQLite connection.
+            `db_profile` : (str) - Name of the profile. One of UserConfig.DBProfile values.
+    """
+
+    if db_profile not in DB_PROFILES_PRAGMAS:
+        logger.error(f"Unknown database profile {db_profile}.")
+        raise ValueError(f"Unknown database profile {db_profile}.")
+
+    cursor = dbapi_connection.cursor()
+    for pragma, value in DB_PROFILES_PRAGMAS[db_profile].items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+
 class DBController():
     """
     This class is used to manage the database connection and queries.
     It handles the creation of the database engine, session, and queries
     for accounts, categories, transactions, backups, and statistics.
+    Every connection of the engine registers FTS functions required by transactions triggers,
+    so database has to be written through DBController (or another connection with registered functions).
     """
 
-    def __init__(self, test_mode:bool, test_alembic_config:Config|None = None) -> None:
+    def __init__(
+            self,
+            test_mode:bool,
+            test_alembic_config:Config|None = None,
+            db_profile:str = UserConfig.DBProfile.BALANCED.value
+        ) -> None:
         # Init db connection 
 
         logger.info("Loading alembic config")
@@ -56,22 +116,22 @@ class DBController():
             self.engine = create_engine(DB_PATH)
             logger.debug("Engine created")
 
+        self.db_profile = db_profile
+
         @event.listens_for(self.engine, "connect")
         def set_sqlite_pragma(dbapi_connection:SQLiteConnection, connection_record:Any) -> None:
-            """Set SQLite PRAGMA settings for the connection."""
+            """Set SQLite PRAGMA settings of the current database profile and register FTS functions for the connection."""
 
-            cursor = dbapi_connection.cursor()
-            # cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=OFF")
-            logger.info("PRAGMA synchronous=OFF")
-            cursor.close()
+            apply_db_profile(dbapi_connection, self.db_profile)
+            register_fts_functions(dbapi_connection)
+            logger.info(f"Database profile {self.db_profile} applied")
 
         if not self.db_up_to_date(self.alembic_config, self.engine):
             logger.info("Upgrading database")
             command.upgrade(self.alembic_config, "head")
 
         self.account_id:int|None = None
-        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.session_factory = UnitOfWorkSessionMaker(bind=self.engine, expire_on_commit=False)
 
         self.account_query = AccountQuery(self.session_factory)
         self.category_query = CategoryQuery(self.session_factory)
@@ -83,6 +143,37 @@ class DBController():
         logger.info("Db session created")
 
 
+    def set_db_profile(self, db_profile:str) -> None:
+        """Set database profile. Pooled connections are closed, so all new connections use PRAGMA settings of the profile.
+
+            Arguments
+            ---------
+                `db_profile` : (str) - Name of the profile. One of UserConfig.DBProfile values.
+        """
+
+        if db_profile not in DB_PROFILES_PRAGMAS:
+            logger.error(f"Unknown database profile {db_profile}.")
+            raise ValueError(f"Unknown database profile {db_profile}.")
+
+        if db_profile == self.db_profile:
+            return
+
+        self.db_profile = db_profile
+        self.engine.dispose(close=True)
+        logger.info(f"Database profile changed to {db_profile}")
+
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """Run all queries inside the block in one session and transaction. Changes are committed once at the end of the block
+        or rolled back if an exception is raised, so a user action is saved atomically.
+        Unit of work is bound to the current thread.
+        """
+
+        with self.session_factory.unit_of_work() as session:
+            yield session
+
+
     def close_connection(self) -> None:
         """Close the database connection."""
 
@@ -135,6 +226,7 @@ class DBController():
                 self.transaction_query.account_id = self.account_id
                 self.backup_query.account_id = self.account_id
                 self.statistics_query.account_id = self.account_id
+                self.search_query.account_id = self.account_id
     
 
     def create_account(self, account_name:str, balance:float|int=0) -> None:
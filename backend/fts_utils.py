@@ -1,7 +1,11 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 
 from unicodedata import normalize
 
+if TYPE_CHECKING:
+    from sqlite3 import Connection as SQLiteConnection
+
 
 def build_fts_ngram_text(text: str | None, gram_size: int = 2) -> str:
     """Build an n-gram token string for FTS indexing and querying.
@@ -22,3 +26,29 @@ def build_fts_ngram_text(text: str | None, gram_size: int = 2) -> str:
         normalized[index:index + gram_size]
         for index in range(len(normalized) - gram_size + 1)
     )
+
+
+def build_search_casefold_text(text: str | None) -> str:
+    """Normalize text for fuzzy matching.
+
+    Unlike SQLite's lower(), casefolding works for all Unicode letters.
+    Whitespace is collapsed the same way as in n-gram text.
+    """
+    if not text:
+        return ""
+
+    return " ".join(normalize("NFC", text).casefold().split())
+
+
+FTS_NGRAM_FUNCTION_NAME = "fts_ngrams"
+SEARCH_CASEFOLD_FUNCTION_NAME = "search_casefold"
+
+
+def register_fts_functions(dbapi_connection: SQLiteConnection) -> None:
+    """Register SQL functions used by the transactions_fts content view and search triggers.
+
+    The functions have to exist on every connection that writes transactions,
+    otherwise SQLite fails with "no such function".
+    """
+    dbapi_connection.create_function(FTS_NGRAM_FUNCTION_NAME, 1, build_fts_ngram_text, deterministic=True)
+    dbapi_connection.create_function(SEARCH_CASEFOLD_FUNCTION_NAME, 1, build_search_casefold_text, deterministic=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 import datetime
-from sqlalchemy import String, Float, ForeignKey, DateTime, SmallInteger, Date
+from typing import NamedTuple
+from sqlalchemy import String, Float, ForeignKey, DateTime, SmallInteger, Date, Integer, Index
 from sqlalchemy.orm import Mapped, DeclarativeBase, relationship, mapped_column
 
 
@@ -64,14 +65,26 @@ class Category(Base):
 
 
 class Transaction(Base):
-    """Represents a transaction in the application."""
+    """Represents a transaction in the application.
+
+    Triggers of transactions table call fts_ngrams and search_casefold SQL functions, which are defined in Python.
+    Connection that inserts or updates transactions has to register them with backend.fts_utils.register_fts_functions,
+    otherwise SQLite fails the write with "no such function". Engines of DBController and alembic register them on connect.
+    """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_category_id_date_value", "category_id", "date", "value"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     date: Mapped[datetime.date] = mapped_column(Date, nullable=False, index=True)
     value: Mapped[float] = mapped_column(Float, nullable=False)
     name: Mapped[str | None] = mapped_column(String)
+    #Casefolded name for fuzzy search ranking. It's maintained by triggers, so the application only reads it.
+    name_casefold: Mapped[str | None] = mapped_column(String, nullable=True)
+    #Id of transaction in imported file (OFX FITID). It's used to skip transactions that were already imported.
+    import_id: Mapped[str | None] = mapped_column(String, nullable=True)
 
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"))
     category: Mapped["Category"] = relationship(
@@ -81,12 +94,70 @@ class Transaction(Base):
 
     def __repr__(self) -> str:
         return f"{self.date}-{self.name} value:{self.value}"
-    
+
+
+
+class TransactionRow(NamedTuple):
+    """Represents a read-only transaction row.
+
+    Read-only queries return it instead of Transaction instances, so loaded rows skip identity map and attribute instrumentation.
+    """
+
+    id: int
+    date: datetime.date
+    value: float
+    name: str | None
+    category_id: int
+
+
+#Columns selected by read-only queries. Order matches TransactionRow fields.
+TRANSACTION_ROW_COLUMNS = (Transaction.id, Transaction.date, Transaction.value, Transaction.name, Transaction.category_id)
+
+
+class CategoryMonthStats(Base):
+    """Represents monthly rollup of category transactions.
+
+    Rows are maintained by triggers on the transactions table, so the application only reads them.
+    """
+
+    __tablename__ = "category_month_stats"
+
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[float] = mapped_column(Float, nullable=False)
+    transactions_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_value: Mapped[float | None] = mapped_column(Float, nullable=True)
+    max_value: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"CategoryMonthStats({self.category_id}, {self.year}-{self.month} total:{self.total})"
+
+
+
+class StatisticsVersion(Base):
+    """Represents data version of a month. Every write of month transactions increments it.
+
+    Rows are maintained by triggers on the transactions table, so the application only reads them.
+    Versions are never decremented, so sum of versions of months identifies data of the period.
+    """
+
+    __tablename__ = "statistics_versions"
+
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"StatisticsVersion({self.year}-{self.month} version:{self.version})"
+
+
 
 class TransactionsFTS(Base):
     """Represents the FTS5 virtual table for full-text search on transaction names.
     
-    This virtual table is kept in sync with the Transaction table via triggers.
+    This is an external-content table that reads n-grams of transaction names from transactions_fts_content view.
+    It is kept in sync with the Transaction table via triggers, so it must never be written directly.
     It provides Unicode-aware, case-insensitive token-based search.
     FTS5 virtual tables have an implicit 'rowid' that maps to the content table's content_rowid ('id').
     """
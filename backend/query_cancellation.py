@@ -0,0 +1,38 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from contextlib import contextmanager
+
+from project_configuration import CANCELLATION_CHECK_INSTRUCTIONS
+
+if TYPE_CHECKING:
+    from typing import Iterator, Callable
+    from sqlalchemy.orm import Session
+
+
+
+@contextmanager
+def interrupt_when_cancelled(session:Session, is_cancelled:Callable[[], bool]|None) -> Iterator[None]:
+    """Interrupt SQLite statements executed in the block as soon as query is cancelled.
+    SQLite calls `is_cancelled` every CANCELLATION_CHECK_INSTRUCTIONS virtual machine instructions,
+    interrupted statement raises OperationalError.
+
+        Arguments
+        ---------
+            `session` : (Session) - Session whose connection executes statements.
+            `is_cancelled` : (Callable|None) - Function that returns True if query was cancelled. If None nothing is interrupted.
+    """
+
+    if is_cancelled is None:
+        yield
+        return
+
+    dbapi_connection = session.connection().connection.driver_connection
+    if dbapi_connection is None:
+        yield
+        return
+
+    dbapi_connection.set_progress_handler(lambda: int(is_cancelled()), CANCELLATION_CHECK_INSTRUCTIONS)
+    try:
+        yield
+    finally:
+        dbapi_connection.set_progress_handler(None, 0)
@@ -1,18 +1,119 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from sqlalchemy import select
+from typing import TYPE_CHECKING, NamedTuple, TypeAlias
+from collections import OrderedDict
+from threading import Lock
+from sqlalchemy import select, text, tuple_, case, literal, Date, func as sql_func
 from datetime import date
 from rapidfuzz import process, fuzz
 
-from backend.models import Transaction, TransactionsFTS
-from backend.fts_utils import build_fts_ngram_text
+from backend.models import Category, Transaction, TransactionRow, TRANSACTION_ROW_COLUMNS, TransactionsFTS
+from backend.fts_utils import build_fts_ngram_text, build_search_casefold_text
+from backend.query_cancellation import interrupt_when_cancelled
+from backend.unit_of_work import get_write_generation
+from project_configuration import CategoryType, SEARCH_PAGE_SIZE, SEARCH_SCORE_CUTOFF, SEARCH_PREFILTER_THRESHOLD,\
+SEARCH_PREFILTER_SCORE_CUTOFF, SEARCH_MAX_MATCHES, SEARCH_CACHE_SIZE
 
 if TYPE_CHECKING:
+    from sqlalchemy import Select
     from sqlalchemy.orm import sessionmaker, Session as sql_Session
-    from sqlalchemy.sql.elements import BinaryExpression
-    from typing import Any, Callable
+    from sqlalchemy.sql.elements import BinaryExpression, ColumnElement
+    from typing import Any, Callable, Sequence, Iterable
 
 
+SearchCandidate:TypeAlias = tuple[int, date, float, str|None, int, str, str|None]#Transaction row, category type, casefolded name
+
+
+def _score_names(
+        query:str,
+        names:Sequence[str],
+        scorer:Callable[..., float],
+        score_cutoff:float
+    ) -> list[tuple[int, float]]:
+    """Score names against query.
+
+        Returns
+        -------
+            `list[tuple[int, float]]` - Index of name and its score for names with score not less than `score_cutoff`.
+    """
+
+    return [
+        (index, score) for _, score, index in
+        process.extract(query, names, scorer=scorer, score_cutoff=score_cutoff, limit=None)
+    ]
+
+
+def score_transactions_names(query:str, names:Sequence[str]) -> list[tuple[int, float]]:
+    """Find names that match query with typos tolerance. Both query and names have to be normalized
+    by build_search_casefold_text.
+    If there are many names, they are first filtered by cheaper fuzz.partial_ratio, so slower fuzz.WRatio
+    scores only names that have similar substring.
+
+        Arguments
+        ---------
+            `query` : (str) - Normalized searched name.
+            `names` : (Sequence[str]) - Normalized names of candidates.
+        Returns
+        -------
+            `list[tuple[int, float]]` - Index of matched name and its WRatio score. Order is not defined.
+    """
+
+    if len(names) <= SEARCH_PREFILTER_THRESHOLD:
+        return _score_names(query, names, fuzz.WRatio, SEARCH_SCORE_CUTOFF)
+
+    prefiltered_indexes = [index for index, _ in _score_names(query, names, fuzz.partial_ratio, SEARCH_PREFILTER_SCORE_CUTOFF)]
+    matches = _score_names(query, [names[index] for index in prefiltered_indexes], fuzz.WRatio, SEARCH_SCORE_CUTOFF)
+    return [(prefiltered_indexes[index], score) for index, score in matches]
+
+
+
+
+class SearchCriteria(NamedTuple):
+    """Parameters of transactions search."""
+
+    name_substring:str
+    value:float|None
+    value_operand:str
+    from_date:date
+    to_date:date
+    categories_id:list[int]
+
+
+class SearchCursor(NamedTuple):
+    """Position of the last transaction of a search page. Next page starts right after it.
+    Sort key is match score for name search and transaction value for value search.
+    """
+
+    sort_key:float
+    date:date
+    id:int
+
+
+class SearchSummary(NamedTuple):
+    """Amount and sums of all transactions found by search, not only of the loaded pages."""
+
+    transactions_count:int
+    income_sum:float
+    expense_sum:float
+
+
+class SearchPage(NamedTuple):
+    """Page of found transactions.
+
+    `next_cursor` is None if it's the last page. `summary` is calculated only for the first page.
+    """
+
+    transactions:list[TransactionRow]
+    next_cursor:SearchCursor|None
+    summary:SearchSummary|None
+
+
+class NameSearchResult(NamedTuple):
+    """All ranked matches of name search. It's cached, so next pages and refined searches don't query FTS again."""
+
+    fts_tokens:frozenset[str]
+    candidates:list[SearchCandidate]
+    matches:list[tuple[int, float]]#Index of candidate and its score sorted by (score, date, id) descending
+    summary:SearchSummary
 
 
 class SearchQuery:
@@ -30,91 +131,304 @@ class SearchQuery:
             "<=": lambda field, value: field <= value,
             ">=": lambda field, value: field >= value,
         }
-    
 
-    def search_transactions(
+        #LRU cache of search results. Every result is saved with write generation of the database
+        #it was read from and is not used once the generation changes.
+        self.search_cache:OrderedDict[tuple[Any, ...], tuple[int, SearchPage|NameSearchResult]] = OrderedDict()
+        self.search_cache_lock = Lock()
+
+
+    def search_transactions_page(
             self,
-            name_substring:str,
-            value:float|None,
-            value_operand:str,
-            from_date:date,
-            to_date:date,
-            categories_id:list[int]
-        ) -> list[Transaction]:
-        """Search for transactions based on name, value, date range, and categories.
+            criteria:SearchCriteria,
+            cursor:SearchCursor|None = None,
+            page_size:int = SEARCH_PAGE_SIZE,
+            is_cancelled:Callable[[], bool]|None = None
+        ) -> SearchPage:
+        """Search for transactions based on name, value, date range, and categories and return one page of them.
+        Pages are keyset-paginated, so loading a page doesn't depend on amount of previous pages.
 
             Arguments
             ---------
-                `name_substring` : (str) - Substring to search in transaction names.
-                `value` : (float) - Value to search in transaction values.
-                `value_operand` : (str) - Operand to use for value comparison.
-                `from_date` : (date) - Start date of the date range.
-                `to_date` : (date) - End date of the date range.
-                `categories_id` : (list[int]) - List of category IDs to filter transactions.
+                `criteria` : (SearchCriteria) - Search parameters.
+                `cursor` : (SearchCursor|None) - Cursor of the previous page. None for the first page.
+                `page_size` : (int) - Max amount of transactions in the page.
+                `is_cancelled` : (Callable|None) - Function that returns True if search was cancelled.\
+                    Running SQLite statement is interrupted then.
+            Returns
+            -------
+                `SearchPage` - Read-only rows of found transactions, cursor of the next page and summary of the search.
+        """
+
+        #Generation is read before the search, so data committed during the search makes its result stale
+        generation = get_write_generation(self.session_factory)
+        with self.session_factory() as session:
+            with session.begin(), interrupt_when_cancelled(session, is_cancelled):
+                if criteria.name_substring:
+                    return self._search_by_name_page(session, criteria, cursor, page_size, generation, is_cancelled)
+                return self._search_by_value_page(session, criteria, cursor, page_size, generation)
+
+
+    def _get_criteria_key(self, criteria:SearchCriteria) -> tuple[Any, ...]:
+        """Build cache key of all search criteria except name."""
+
+        return (
+            self.account_id, criteria.value, criteria.value_operand,
+            criteria.from_date, criteria.to_date, frozenset(criteria.categories_id)
+        )
+
+
+    def _get_cached_result(self, key:tuple[Any, ...], generation:int|None) -> SearchPage|NameSearchResult|None:
+        """Get cached search result if it was read from the current database state."""
+
+        if generation is None:
+            return None
+
+        with self.search_cache_lock:
+            cached = self.search_cache.get(key)
+            if cached is None or cached[0] != generation:
+                return None
+            self.search_cache.move_to_end(key)
+            return cached[1]
+
+
+    def _cache_result(self, key:tuple[Any, ...], generation:int|None, result:SearchPage|NameSearchResult) -> None:
+        """Save search result. Least recently used result is removed if cache is full."""
+
+        if generation is None:
+            return
+
+        with self.search_cache_lock:
+            self.search_cache[key] = (generation, result)
+            self.search_cache.move_to_end(key)
+            while len(self.search_cache) > SEARCH_CACHE_SIZE:
+                self.search_cache.popitem(last=False)
+
+
+    def _find_refined_search_base(
+            self,
+            criteria_key:tuple[Any, ...],
+            fts_tokens:frozenset[str],
+            generation:int|None
+        ) -> NameSearchResult|None:
+        """Find cached name search that the current search refines, e.g. searched name was extended.
+        FTS candidates are transactions that contain any of the name tokens, so candidates of a search
+        with less tokens are a part of the current search candidates and don't have to be read again.
         """
-        # Build common filters
-        filters = [
-            Transaction.date.between(from_date, to_date),
-            Transaction.category_id.in_(categories_id)
+
+        if generation is None:
+            return None
+
+        base:NameSearchResult|None = None
+        with self.search_cache_lock:
+            for key, (cached_generation, cached_result) in self.search_cache.items():
+                if (
+                    key[0] != "name" or key[1] != criteria_key or cached_generation != generation
+                    or not isinstance(cached_result, NameSearchResult) or not cached_result.fts_tokens <= fts_tokens
+                ):
+                    continue
+                if base is None or len(cached_result.fts_tokens) > len(base.fts_tokens):
+                    base = cached_result
+        return base
+
+
+    def _build_filters(self, criteria:SearchCriteria) -> list[ColumnElement[bool]]:
+        """Build filters common for name and value search."""
+
+        filters:list[ColumnElement[bool]] = [
+            Transaction.date.between(criteria.from_date, criteria.to_date),
+            Transaction.category_id.in_(criteria.categories_id)
         ]
 
-        if value:
-            operand_func = self.values_operands[value_operand]
-            filters.append(operand_func(Transaction.value, value))
-
-        # Build base query using FTS5 if name_substring provided, otherwise plain query
-        if name_substring:
-            # Use FTS5 virtual table for Unicode-aware search (pure DB-side).
-            
-            fts = TransactionsFTS.__table__
-            fts_tokens = build_fts_ngram_text(name_substring).split()
-            fts_query = " OR ".join(f'"{token}"' for token in fts_tokens) if fts_tokens else ""
-
-            stmt = select(Transaction).select_from(
-                Transaction.__table__.join(fts, fts.c.rowid == Transaction.__table__.c.id)
-            )
-            if fts_query:
-                stmt = stmt.where(fts.c.name.match(fts_query))
+        if criteria.value:
+            operand_func = self.values_operands[criteria.value_operand]
+            filters.append(operand_func(Transaction.value, criteria.value))
+        return filters
+
+
+    def _search_by_value_page(
+            self,
+            session:sql_Session,
+            criteria:SearchCriteria,
+            cursor:SearchCursor|None,
+            page_size:int,
+            generation:int|None
+        ) -> SearchPage:
+        """Load page of value search. Transactions are ordered and paginated by (value, date, id) in SQL,
+        and summary is calculated by SQL aggregates, so only one page is loaded into memory."""
+
+        cache_key = ("value", self._get_criteria_key(criteria), cursor, page_size)
+        cached_page = self._get_cached_result(cache_key, generation)
+        if isinstance(cached_page, SearchPage):
+            return cached_page
+
+        filters = self._build_filters(criteria)
+        sort_columns = tuple_(Transaction.value, Transaction.date, Transaction.id)
+        descending = criteria.value_operand in ("<=", "<", "!=")
+
+        stmt = select(*TRANSACTION_ROW_COLUMNS).where(*filters)
+        if cursor is not None:
+            cursor_columns = tuple_(literal(cursor.sort_key), literal(cursor.date, Date()), literal(cursor.id))
+            stmt = stmt.where(sort_columns < cursor_columns if descending else sort_columns > cursor_columns)
+
+        if descending:
+            stmt = stmt.order_by(Transaction.value.desc(), Transaction.date.desc(), Transaction.id.desc())
         else:
-            stmt = select(Transaction)
+            stmt = stmt.order_by(Transaction.value.asc(), Transaction.date.asc(), Transaction.id.asc())
+
+        #One extra row tells if there is a next page
+        transactions = list(map(TransactionRow._make, session.execute(stmt.limit(page_size + 1)).tuples()))
+        next_cursor = None
+        if len(transactions) > page_size:
+            transactions = transactions[:page_size]
+            last_transaction = transactions[-1]
+            next_cursor = SearchCursor(last_transaction.value, last_transaction.date, last_transaction.id)
+
+        summary = None
+        if cursor is None:
+            summary_stmt: Select[tuple[int, float|None, float|None]] = select(
+                sql_func.count(Transaction.id),
+                sql_func.sum(case((Category.category_type == CategoryType.Income, Transaction.value), else_=0)),
+                sql_func.sum(case((Category.category_type == CategoryType.Expense, Transaction.value), else_=0))
+            ).join(Category, Category.id == Transaction.category_id).where(*filters)
+            transactions_count, income_sum, expense_sum = session.execute(summary_stmt).one()
+            summary = SearchSummary(transactions_count, round(income_sum or 0, 2), round(expense_sum or 0, 2))
+
+        search_page = SearchPage(transactions, next_cursor, summary)
+        self._cache_result(cache_key, generation, search_page)
+        return search_page
+
+
+    def _search_by_name_page(
+            self,
+            session:sql_Session,
+            criteria:SearchCriteria,
+            cursor:SearchCursor|None,
+            page_size:int,
+            generation:int|None,
+            is_cancelled:Callable[[], bool]|None
+        ) -> SearchPage:
+        """Load page of name search. FTS5 finds candidates, then they are ranked by match score in Python.
+        Transactions are ordered by (score, date, id) descending. Only SEARCH_MAX_MATCHES best matches are paged,\
+        but summary counts all of them.
+        Ranked matches are cached, so next pages are sliced from them."""
+
+        criteria_key = self._get_criteria_key(criteria)
+        cache_key = ("name", criteria_key, build_search_casefold_text(criteria.name_substring))
+        search_result = self._get_cached_result(cache_key, generation)
+
+        if not isinstance(search_result, NameSearchResult):
+            fts_tokens = frozenset(build_fts_ngram_text(criteria.name_substring).split())
+            base_result = self._find_refined_search_base(criteria_key, fts_tokens, generation)
+
+            if base_result is None:
+                candidates = self._get_name_candidates(session, criteria, fts_tokens)
+            elif not base_result.fts_tokens:
+                candidates = base_result.candidates#Search without tokens has all transactions as candidates
+            else:
+                # Only transactions that contain new tokens are read, already known candidates are re-ranked
+                known_candidates_id = {candidate[0] for candidate in base_result.candidates}
+                candidates = base_result.candidates + [
+                    candidate for candidate in self._get_name_candidates(session, criteria, fts_tokens - base_result.fts_tokens)
+                    if candidate[0] not in known_candidates_id
+                ]
+
+            if is_cancelled is not None and is_cancelled():
+                return SearchPage([], None, SearchSummary(0, 0, 0) if cursor is None else None)
+
+            search_result = self._rank_name_candidates(criteria.name_substring, fts_tokens, candidates)
+            self._cache_result(cache_key, generation, search_result)
+
+        candidates = search_result.candidates
+        matches = search_result.matches
+
+        # Newer transactions go first among equal scores.
+        def _sort_key(match_data:tuple[int, float]) -> tuple[float, int, int]:
+            candidate = candidates[match_data[0]]
+            return (-match_data[1], -candidate[1].toordinal(), -candidate[0])
+
+        if cursor is not None:
+            cursor_key = (-cursor.sort_key, -cursor.date.toordinal(), -cursor.id)
+            matches = [match_data for match_data in matches if _sort_key(match_data) > cursor_key]
+
+        transactions = [TransactionRow._make(candidates[index][:5]) for index, _ in matches[:page_size]]
+        next_cursor = None
+        if len(matches) > page_size:
+            last_match = matches[page_size - 1]
+            last_transaction = transactions[-1]
+            next_cursor = SearchCursor(last_match[1], last_transaction.date, last_transaction.id)
+
+        return SearchPage(transactions, next_cursor, search_result.summary if cursor is None else None)
+
+
+    def _get_name_candidates(
+            self,
+            session:sql_Session,
+            criteria:SearchCriteria,
+            fts_tokens:Iterable[str]
+        ) -> list[SearchCandidate]:
+        """Find transactions that contain any of the tokens using FTS5. All transactions match if there are no tokens."""
+
+        # Use FTS5 virtual table for Unicode-aware search (pure DB-side).
+        fts = TransactionsFTS.__table__
+        #Tokens are FTS5 strings, so their double quotes are escaped by doubling
+        fts_query = " OR ".join('"' + token.replace('"', '""') + '"' for token in sorted(fts_tokens))
+
+        stmt = select(*TRANSACTION_ROW_COLUMNS, Category.category_type, Transaction.name_casefold).select_from(
+            Transaction.__table__
+            .join(fts, fts.c.rowid == Transaction.__table__.c.id)
+            .join(Category.__table__, Category.__table__.c.id == Transaction.__table__.c.category_id)
+        )
+        if fts_query:
+            stmt = stmt.where(fts.c.name.match(fts_query))
+        stmt = stmt.where(*self._build_filters(criteria))
+
+        return list(session.execute(stmt).tuples().all())
+
+
+    def _rank_name_candidates(
+            self,
+            name_substring:str,
+            fts_tokens:frozenset[str],
+            candidates:list[SearchCandidate]
+        ) -> NameSearchResult:
+        """Rank candidates by match score and calculate summary of all matches.
+        Only SEARCH_MAX_MATCHES best matches are kept for pages, while summary includes all of them."""
+
+        # SQLite's built-in case-insensitive functions and collations are
+        # ASCII-only in many builds and may not handle Unicode casefolding
+        # correctly. Names are casefolded in Python by triggers when they are written,
+        # and ranked here using RapidFuzz for typo tolerance and proper substring matching.
+        matches = score_transactions_names(
+            build_search_casefold_text(name_substring),
+            [candidate[6] or "" for candidate in candidates]
+        ) if candidates else []
+
+        income_sum = sum(candidates[index][2] for index, _ in matches if candidates[index][5] == CategoryType.Income)
+        expense_sum = sum(candidates[index][2] for index, _ in matches if candidates[index][5] == CategoryType.Expense)
+        summary = SearchSummary(len(matches), round(income_sum, 2), round(expense_sum, 2))
+
+        # Sort primarily by match score (highest first), newer transactions go first among equal scores.
+        matches.sort(key=lambda match_data: (
+            -match_data[1], -candidates[match_data[0]][1].toordinal(), -candidates[match_data[0]][0]
+        ))
+        del matches[SEARCH_MAX_MATCHES:]
+
+        return NameSearchResult(fts_tokens, candidates, matches, summary)
+
+
+    def rebuild_index(self) -> None:
+        """Rebuild transactions_fts from transactions. It's needed only if the index got out of sync with transactions
+        (e.g. database was changed by a connection without FTS triggers functions)."""
+
+        with self.session_factory() as session:
+            with session.begin():
+                session.execute(text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"))
 
-        # Apply common filters to both FTS and non-FTS queries
-        stmt = stmt.where(*filters)
 
-        # Apply ordering based on search type
-        if not name_substring and value:
-            # Order by value if value filter is applied
-            if value_operand in (">=", ">"):
-                stmt = stmt.order_by(Transaction.value.asc())
-            elif value_operand in ("<=", "<", "!="):
-                stmt = stmt.order_by(Transaction.value.desc())
+    def optimize_index(self) -> None:
+        """Merge all b-trees of transactions_fts into one, so search reads less pages. Useful after bulk inserts."""
 
         with self.session_factory() as session:
             with session.begin():
-                results = list(session.execute(stmt).scalars())
-
-                # SQLite's built-in case-insensitive functions and collations are
-                # ASCII-only in many builds and may not handle Unicode casefolding
-                # correctly. Therefore, we do Unicode-aware ranking and filtering in Python
-                # using RapidFuzz for typo tolerance and proper substring matching.
-                if name_substring and results:
-                    search_query_casefolded = name_substring.casefold()
-                    
-                    transaction_names = [(t.name or "").casefold() for t in results]
-                    
-                    extracted = process.extract(
-                        query=search_query_casefolded,
-                        choices=transaction_names,
-                        scorer=fuzz.WRatio,
-                        score_cutoff=85,  # Filters out candidates without typo-tolerant substring match
-                        limit=None
-                    )
-                    
-                    # 'extracted' returns Tuples of (matched_string, match_score, index)
-                    # Sort primarily by match score (highest first).
-                    # Secondary sort ensures stable tie-breaking.
-                    extracted.sort(key=lambda x: (-x[1], x[0]))
-                    
-                    results = [results[match_data[2]] for match_data in extracted]
-
-                return results
+                session.execute(text("INSERT INTO transactions_fts(transactions_fts) VALUES ('optimize')"))
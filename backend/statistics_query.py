@@ -1,19 +1,23 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from sqlalchemy.sql import func as sql_func
-from sqlalchemy import and_, extract
-from datetime import date
+from typing import TYPE_CHECKING, TypeAlias
+from sqlalchemy import and_, or_, select, cast, Integer, func as sql_func
+from datetime import date, timedelta
 
-from backend.models import Transaction
-from GeneralTools.Utils import generate_month_range
+from backend.models import Transaction, TransactionRow, TRANSACTION_ROW_COLUMNS, CategoryMonthStats, StatisticsVersion
+from backend.query_cancellation import interrupt_when_cancelled
+from GeneralTools.Utils import generate_month_bounds
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import sessionmaker, Session as sql_Session
     from sqlalchemy.engine import Row
-    from typing import Sequence
+    from typing import Sequence, Callable
 
 
 
+#Category id, month, total, transactions count, min value, max value and value and name of transaction with min or max value
+CategoryMonthStatisticsRow:TypeAlias = tuple[int, int, float, int, float, float, float, str|None]
+
+
 class StatisticsQuery:
     """This class is used to create statistics."""
 
@@ -37,11 +41,10 @@ class StatisticsQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                total = session.query(sql_func.sum(Transaction.value)).filter(and_(
-                    Transaction.date.between(*generate_month_range(year, month)),
-                    Transaction.category_id==category_id
-                )).scalar()
-                return float(total) if total else 0
+                total = session.query(CategoryMonthStats.total).filter_by(
+                    category_id=category_id, year=year, month=month
+                ).scalar()
+                return round(total, 2) if total else 0
     
 
     def get_categories_monthly_transactions_sum(self, categories_id: list[int], year:int, month:int) -> list[float]:
@@ -59,17 +62,14 @@ class StatisticsQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                sums:Sequence[Row[tuple[int, float]]] = session.query(Transaction.category_id, sql_func.sum(Transaction.value)).filter(
-                    Transaction.date.between(*generate_month_range(year, month)),
-                    Transaction.category_id.in_(categories_id)
-                ).group_by(Transaction.category_id).all()
-
-                result = [0.0] * len(categories_id)
-                for index, category_id in enumerate(categories_id):
-                    for s in sums:
-                        if s[0] == category_id:
-                            result[index] = float(s[1]) if s[1] else 0.0
-                return result
+                sums:Sequence[Row[tuple[int, float]]] = session.query(CategoryMonthStats.category_id, CategoryMonthStats.total).filter(
+                    CategoryMonthStats.year == year,
+                    CategoryMonthStats.month == month,
+                    CategoryMonthStats.category_id.in_(categories_id)
+                ).all()
+
+                categories_sums = {category_id:round(total, 2) for category_id, total in sums}
+                return [categories_sums.get(category_id, 0.0) for category_id in categories_id]
 
 
     def get_categories_monthly_transactions_sum_by_months(self, categories_id: list[int], year:int, months: list[int]) -> dict[int, list[float]]:
@@ -88,20 +88,17 @@ class StatisticsQuery:
         with self.session_factory() as session:
             with session.begin():
                 sums:Sequence[Row[tuple[int, int, float]]] = session.query(
-                    Transaction.category_id,
-                    extract('month', Transaction.date),
-                    sql_func.sum(Transaction.value)).filter(and_(
-                        extract('year', Transaction.date) == year,
-                        extract('month', Transaction.date).in_(months),
-                        Transaction.category_id.in_(categories_id))
-                    ).group_by(Transaction.category_id, extract('month', Transaction.date)).all()
-
-                result:dict[int, list[float]] = {}
-                for category_id in categories_id:
-                    result[category_id] = [0.0]
-                    for s in sums:
-                        if s[0] == category_id:
-                            result[category_id].append(float(s[2]) if s[2] else 0)
+                    CategoryMonthStats.category_id,
+                    CategoryMonthStats.month,
+                    CategoryMonthStats.total).filter(and_(
+                        CategoryMonthStats.year == year,
+                        CategoryMonthStats.month.in_(months),
+                        CategoryMonthStats.category_id.in_(categories_id))
+                    ).order_by(CategoryMonthStats.category_id, CategoryMonthStats.month).all()
+
+                result:dict[int, list[float]] = {category_id:[0.0] for category_id in categories_id}
+                for category_id, _, total in sums:
+                    result[category_id].append(round(total, 2))
 
                 return result
 
@@ -121,10 +118,9 @@ class StatisticsQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                min_value = session.query(sql_func.min(Transaction.value)).filter(and_(
-                    Transaction.date.between(*generate_month_range(year, month)),
-                    Transaction.category_id==category_id
-                )).scalar()
+                min_value = session.query(CategoryMonthStats.min_value).filter_by(
+                    category_id=category_id, year=year, month=month
+                ).scalar()
                 return float(min_value) if min_value else 0
     
 
@@ -143,10 +139,9 @@ class StatisticsQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                max_value = session.query(sql_func.max(Transaction.value)).filter(and_(
-                    Transaction.date.between(*generate_month_range(year, month)),
-                    Transaction.category_id==category_id
-                )).scalar()
+                max_value = session.query(CategoryMonthStats.max_value).filter_by(
+                    category_id=category_id, year=year, month=month
+                ).scalar()
                 return float(max_value) if max_value else 0
     
 
@@ -164,31 +159,131 @@ class StatisticsQuery:
                 `list[Transaction]` - List of transactions for the specified category, month, year, and value.
         """
 
+        start_date, end_date = generate_month_bounds(year, month)
         with self.session_factory() as session:
             with session.begin():
                 return session.query(Transaction).filter(and_(
-                    Transaction.date.between(*generate_month_range(year, month)),
+                    Transaction.date >= start_date,
+                    Transaction.date < end_date,
                     Transaction.value==value,
                     Transaction.category_id==category_id)
                 ).all()
 
 
-    def get_transactions_by_range(self, category_ids:list[int], from_date:date, to_date:date) -> list[Transaction]:
+    def get_transactions_by_range(
+            self,
+            category_ids:list[int],
+            from_date:date,
+            to_date:date,
+            is_cancelled:Callable[[], bool]|None = None
+        ) -> list[TransactionRow]:
         """Get transactions for specific categories within a date range.
         
             Arguments
             ---------
                 `category_ids` : (list[int]) - List of category IDs to filter transactions.
                 `from_date` : (date) - Start date.
-                `to_date` : (date) - End date.
+                `to_date` : (date) - End date (inclusive).
+                `is_cancelled` : (Callable|None) - Function that returns True if statistics collection was cancelled.\
+                    Running SQLite statement is interrupted then.
+            Returns
+            -------
+                `list[TransactionRow]` - List of read-only transaction rows for the specified categories and date range.
+        """
+
+        with self.session_factory() as session:
+            with session.begin(), interrupt_when_cancelled(session, is_cancelled):
+                return list(map(TransactionRow._make, session.execute(
+                    select(*TRANSACTION_ROW_COLUMNS).where(
+                        Transaction.category_id.in_(category_ids),
+                        Transaction.date >= from_date,
+                        Transaction.date < to_date + timedelta(days=1)
+                    )
+                ).tuples()))
+
+
+    def get_period_categories_months_statistics(
+            self,
+            categories_id:list[int],
+            year:int,
+            months:list[int],
+            is_cancelled:Callable[[], bool]|None = None
+        ) -> list[CategoryMonthStatisticsRow]:
+        """Get sum, count, min and max value of transactions of every category in every month of consecutive months with one query.
+        Aggregates are calculated by window functions and only transactions with min or max value of their category month
+        are returned with them, so names of these transactions can be counted.
+        Rows are ordered by date and id, so transactions with the same value are counted in the order they were added.
+
+            Arguments
+            ---------
+                `categories_id` : (list[int]) - List of category IDs to filter transactions.
+                `year` : (int) - Year to filter transactions.
+                `months` : (list[int]) - Consecutive months of the period.
+                `is_cancelled` : (Callable|None) - Function that returns True if statistics collection was cancelled.\
+                    Running SQLite statement is interrupted then.
             Returns
             -------
-                `list[Transaction]` - List of transactions for the specified categories and date range.
+                `list[CategoryMonthStatisticsRow]` - Aggregates of category months with transactions that have min or max value.
+        """
+
+        start_date = generate_month_bounds(year, min(months))[0]
+        end_date = generate_month_bounds(year, max(months))[1]
+        month = cast(sql_func.strftime("%m", Transaction.date), Integer)
+        category_month = (Transaction.category_id, month)
+
+        period_transactions = select(
+            Transaction.category_id,
+            month.label("month"),
+            sql_func.sum(Transaction.value).over(partition_by=category_month).label("total"),
+            sql_func.count().over(partition_by=category_month).label("transactions_count"),
+            sql_func.min(Transaction.value).over(partition_by=category_month).label("min_value"),
+            sql_func.max(Transaction.value).over(partition_by=category_month).label("max_value"),
+            Transaction.value,
+            Transaction.name,
+            Transaction.date,
+            Transaction.id
+        ).where(
+            Transaction.category_id.in_(categories_id),
+            Transaction.date >= start_date,
+            Transaction.date < end_date
+        ).subquery()
+
+        with self.session_factory() as session:
+            with session.begin(), interrupt_when_cancelled(session, is_cancelled):
+                return list(session.execute(
+                    select(
+                        period_transactions.c.category_id,
+                        period_transactions.c.month,
+                        period_transactions.c.total,
+                        period_transactions.c.transactions_count,
+                        period_transactions.c.min_value,
+                        period_transactions.c.max_value,
+                        period_transactions.c.value,
+                        period_transactions.c.name
+                    ).where(or_(
+                        period_transactions.c.value == period_transactions.c.min_value,
+                        period_transactions.c.value == period_transactions.c.max_value
+                    )).order_by(period_transactions.c.date, period_transactions.c.id)
+                ).tuples())
+
+
+    def get_period_data_version(self, year:int, months:list[int]) -> int:
+        """Get data version of months. It's incremented by every write of transactions of these months.
+
+            Arguments
+            ---------
+                `year` : (int) - Year of months.
+                `months` : (list[int]) - Months of the period.
+            Returns
+            -------
+                `int` - Sum of versions of months. 0 if months never had transactions.
         """
 
         with self.session_factory() as session:
             with session.begin():
-                return session.query(Transaction).filter(and_(
-                    Transaction.category_id.in_(category_ids),
-                    Transaction.date.between(from_date, to_date)
-                )).all()
+                return int(session.execute(
+                    select(sql_func.coalesce(sql_func.sum(StatisticsVersion.version), 0)).where(
+                        StatisticsVersion.year == year,
+                        StatisticsVersion.month.in_(months)
+                    )
+                ).scalar_one())
@@ -1,17 +1,27 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeAlias
+from collections import Counter
 from datetime import date
-from sqlalchemy import and_
+from itertools import islice
+from sqlalchemy import select, insert, case
+from sqlalchemy.sql import func as sql_func
 
-from backend.fts_utils import build_fts_ngram_text
-from backend.models import Transaction, TransactionsFTS
-from GeneralTools.Utils import generate_month_range
+from backend.models import Account, Category, Transaction, TransactionRow, TRANSACTION_ROW_COLUMNS, CategoryMonthStats
+from backend.unit_of_work import write_query
+from GeneralTools.Utils import generate_month_bounds
+from project_configuration import CategoryType, IMPORT_CHUNK_SIZE, EXPORT_CHUNK_SIZE
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import sessionmaker, Session as sql_Session
+    from sqlalchemy.engine import Row
+    from typing import Sequence, Iterable, Generator, Callable, Any
 
 
 
+ImportedTransaction:TypeAlias = tuple[date, float, str, int, str|None]#Date, value, name, category id, import id (OFX FITID)
+ExportedTransaction:TypeAlias = tuple[str, date, float, str, str]#Account name, date, signed value, name, category name
+
+
 class TransactionQuery:
     """This class is used to manage transactions and related data in the database."""
 
@@ -20,6 +30,7 @@ class TransactionQuery:
         self.account_id:int
     
 
+    @write_query
     def delete_transaction(self, transaction_id:int) -> None:
         """Delete a transaction from the database.
 
@@ -30,10 +41,10 @@ class TransactionQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                session.query(TransactionsFTS).filter_by(rowid=transaction_id).delete(False)
                 session.query(Transaction).filter_by(id=transaction_id).delete(False)
             
 
+    @write_query
     def update_transaction(self, transaction_id:int, transaction_name:str, day:int, transaction_value:float) -> None:
         """Update a transaction in the database.
 
@@ -56,14 +67,8 @@ class TransactionQuery:
                 transaction.date = date(transaction.date.year, transaction.date.month, day)
                 transaction.value = transaction_value
 
-                fts_row = session.get(TransactionsFTS, transaction_id)
-                fts_name = build_fts_ngram_text(transaction_name)
-                if fts_row is None:
-                    session.add(TransactionsFTS(rowid=transaction_id, name=fts_name))
-                else:
-                    fts_row.name = fts_name
-
 
+    @write_query
     def add_transaction(self, category_id:int, date:date, value:float, name:str) -> Transaction:
         """Add a new transaction to the database.
 
@@ -80,11 +85,10 @@ class TransactionQuery:
                 transaction = Transaction(date=date, value=value, name=name, category_id=category_id)
                 session.add(transaction)
                 session.flush()
-                session.add(TransactionsFTS(rowid=transaction.id, name=build_fts_ngram_text(name)))
                 return transaction
 
 
-    def get_transactions_by_month(self, category_id:int, year:int, month:int) -> list[Transaction]:
+    def get_transactions_by_month(self, category_id:int, year:int, month:int) -> list[TransactionRow]:
         """Get transactions for a specific category in a given month and year.
 
             Arguments
@@ -94,19 +98,70 @@ class TransactionQuery:
                 `month` : (int) - Month to filter transactions.
             Returns
             -------
-                `list[Transaction]` - List of transactions for the specified category, month, and year.
+                `list[TransactionRow]` - List of read-only transaction rows for the specified category, month, and year.
         """
 
+        start_date, end_date = generate_month_bounds(year, month)
         with self.session_factory() as session:
             with session.begin():
-                return session.query(Transaction).filter(
-                    and_(
-                        Transaction.date.between(*generate_month_range(year, month)),
+                return list(map(TransactionRow._make, session.execute(
+                    select(*TRANSACTION_ROW_COLUMNS).where(
+                        Transaction.date >= start_date,
+                        Transaction.date < end_date,
                         Transaction.category_id == category_id
                     )
+                ).tuples()))
+
+
+
+    def get_categories_transactions_by_month(self, categories_id:list[int], year:int, month:int) -> tuple[
+        dict[int, list[TransactionRow]], dict[int, float]
+    ]:
+        """Get transactions and their totals for multiple categories in a given month and year.
+        Both are read in a single transaction, so loading a month costs one session instead of two per category.
+
+            Arguments
+            ---------
+                `categories_id` : (list[int]) - List of category IDs to filter transactions.
+                `year` : (int) - Year to filter transactions.
+                `month` : (int) - Month to filter transactions.
+            Returns
+            -------
+                `tuple[dict[int, list[TransactionRow]], dict[int, float]]` - Transaction rows grouped by category ID\
+                    and total sum of transactions for each category ID.
+        """
+
+        categories_transactions:dict[int, list[TransactionRow]] = {category_id:[] for category_id in categories_id}
+        categories_totals:dict[int, float] = {category_id:0 for category_id in categories_id}
+        if len(categories_id) == 0:
+            return categories_transactions, categories_totals
+
+        start_date, end_date = generate_month_bounds(year, month)
+        with self.session_factory() as session:
+            with session.begin():
+                transactions = list(map(TransactionRow._make, session.execute(
+                    select(*TRANSACTION_ROW_COLUMNS).where(
+                        Transaction.date >= start_date,
+                        Transaction.date < end_date,
+                        Transaction.category_id.in_(categories_id)
+                    ).order_by(Transaction.date, Transaction.id)
+                ).tuples()))
+                sums:Sequence[Row[tuple[int, float]]] = session.query(
+                    CategoryMonthStats.category_id, CategoryMonthStats.total
+                ).filter(
+                    CategoryMonthStats.year == year,
+                    CategoryMonthStats.month == month,
+                    CategoryMonthStats.category_id.in_(categories_id)
                 ).all()
 
-    
+        for transaction in transactions:
+            categories_transactions[transaction.category_id].append(transaction)
+
+        for category_id, total in sums:
+            categories_totals[category_id] = round(total, 2) if total else 0
+
+        return categories_transactions, categories_totals
+
     
     def check_categories_have_transactions(self, categories_id:list[int], year:int, month:int) -> bool:
         """Check if any of the specified categories have transactions in a given month and year.
@@ -119,10 +174,11 @@ class TransactionQuery:
 
         with self.session_factory() as session:
             with session.begin():
-                row = session.query(Transaction).filter(and_(
-                    Transaction.date.between(*generate_month_range(year, month)),
-                    Transaction.category_id.in_(categories_id)
-                )).limit(1).first()
+                row = session.query(CategoryMonthStats.category_id).filter(
+                    CategoryMonthStats.year == year,
+                    CategoryMonthStats.month == month,
+                    CategoryMonthStats.category_id.in_(categories_id)
+                ).limit(1).first()
                 return row is not None
 
 
@@ -141,4 +197,122 @@ class TransactionQuery:
             with session.begin():
                 return session.query(Transaction).filter_by(category_id=category_id).all()
     
- 
\ No newline at end of file
+ 
+
+    def get_category_transactions_sum(self, category_id:int) -> float:
+        """Get sum of all transactions for a specific category.
+
+            Arguments
+            ---------
+                `category_id` : (int) - ID of the category to sum transactions.
+            Returns
+            -------
+                `float` - Sum of all transactions values of the category. 0 if category has no transactions.
+        """
+
+        with self.session_factory() as session:
+            with session.begin():
+                total = session.query(sql_func.sum(Transaction.value)).filter_by(category_id=category_id).scalar()
+                return round(total, 2) if total else 0
+
+
+    @write_query
+    def import_transactions(
+            self,
+            transactions:Iterable[ImportedTransaction],
+            progress_callback:Callable[[int], None]|None = None
+        ) -> tuple[int, int]:
+        """Import transactions in chunks. Every chunk is inserted by one executemany.
+        Transactions with import id are skipped if account already has transaction with this import id.
+        Other transactions are matched with existing transactions (same date, value, name and category) one to one,\
+        so identical transactions of the same file are imported as long as account doesn't have them yet. The whole import is one transaction.
+
+            Arguments
+            ---------
+                `transactions` : (Iterable[ImportedTransaction]) - Date, value, name, category id and import id of transactions. Can be a generator.
+                `progress_callback` : (Callable|None) - Function called with amount of processed transactions after every chunk.
+            Returns
+            -------
+                `tuple[int, int]` - Amount of imported transactions and amount of skipped duplicates.
+        """
+
+        imported = skipped = 0
+        transactions_iterator = iter(transactions)
+        with self.session_factory() as session:
+            with session.begin():
+                #Counts of existing transactions for deduplication. Every existing transaction can match only one imported transaction.
+                existing_transactions:Counter[tuple[date, float, str, int]] = Counter()
+                existing_import_ids:set[str] = set()
+                for transaction_date, value, name, category_id, import_id in session.execute(
+                    select(Transaction.date, Transaction.value, Transaction.name, Transaction.category_id, Transaction.import_id)
+                    .join(Category, Category.id == Transaction.category_id)
+                    .where(Category.account_id == self.account_id)
+                ).tuples():
+                    existing_transactions[(transaction_date, round(value, 2), name or "", category_id)] += 1
+                    if import_id is not None:
+                        existing_import_ids.add(import_id)
+
+                while chunk := list(islice(transactions_iterator, IMPORT_CHUNK_SIZE)):
+                    new_transactions:list[dict[str, Any]] = []
+                    for transaction_date, value, name, category_id, import_id in chunk:
+                        if import_id is not None:
+                            #Import id is unique within account, so it's also checked against transactions of the same file
+                            if import_id in existing_import_ids:
+                                skipped += 1
+                                continue
+                            existing_import_ids.add(import_id)
+                        else:
+                            transaction_key = (transaction_date, round(value, 2), name, category_id)
+                            if existing_transactions[transaction_key] > 0:
+                                existing_transactions[transaction_key] -= 1
+                                skipped += 1
+                                continue
+
+                        new_transactions.append({
+                            "date":transaction_date, "value":round(value, 2), "name":name,
+                            "category_id":category_id, "import_id":import_id
+                        })
+
+                    if new_transactions:
+                        session.execute(insert(Transaction), new_transactions)
+                        imported += len(new_transactions)
+
+                    if progress_callback is not None:
+                        progress_callback(imported + skipped)
+
+        return imported, skipped
+
+
+    def stream_transactions_for_export(self, all_accounts:bool = False) -> Generator[ExportedTransaction, None, None]:
+        """Stream transactions ordered by account and date. Rows are fetched from the cursor in batches of EXPORT_CHUNK_SIZE,\
+        so memory usage doesn't depend on amount of transactions. Session stays open until the generator is exhausted or closed,\
+        so it has to be consumed on the thread that started it.
+
+            Arguments
+            ---------
+                `all_accounts` : (bool) - Export transactions of all accounts instead of the current one.
+            Yields
+            ------
+                `ExportedTransaction` - Account name, date, value (negative for expenses), name and category name of transaction.
+        """
+
+        statement = (
+            select(
+                Account.name,
+                Transaction.date,
+                case((Category.category_type == CategoryType.Expense, -Transaction.value), else_=Transaction.value),
+                Transaction.name,
+                Category.name
+            )
+            .join(Category, Category.id == Transaction.category_id)
+            .join(Account, Account.id == Category.account_id)
+            .order_by(Account.id, Transaction.date, Transaction.id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        if not all_accounts:
+            statement = statement.where(Category.account_id == self.account_id)
+
+        with self.session_factory() as session:
+            with session.begin():
+                for account_name, transaction_date, value, name, category_name in session.execute(statement).tuples():
+                    yield account_name, transaction_date, value, name or "", category_name
@@ -0,0 +1,194 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar, ParamSpec, Concatenate, cast
+from contextlib import contextmanager
+from functools import wraps
+from threading import local, Lock
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from AppObjects.logger import get_logger
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Iterator, Callable
+    from sqlalchemy.sql import Executable
+
+
+
+logger = get_logger(__name__)
+
+class UnitOfWorkSession(Session):
+    """Session that can be shared by all queries of a unit of work.
+    While it's shared, queries can't close it and `begin()` only flushes changes instead of starting a new transaction.
+    The whole unit of work is committed (or rolled back) once by `UnitOfWorkSessionMaker.unit_of_work()`.
+    """
+
+    def __init__(self, *args:Any, **kwargs:Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.shared = False
+        self.deferred_statements:list[Executable] = []
+        self.write_generation_bump_pending = False
+
+
+    def __exit__(self, type_:type[BaseException]|None, value:BaseException|None, traceback:TracebackType|None) -> None:
+        if not self.shared:
+            super().__exit__(type_, value, traceback)
+
+
+    def begin(self, nested:bool = False) -> Any:
+        """Begin a transaction. If session is shared by a unit of work, changes are only flushed at the end of the block.
+
+            Arguments
+            ---------
+                `nested` : (bool) - Begin a nested transaction (SAVEPOINT).
+            Returns
+            -------
+                `SessionTransaction` or flush scope if session is shared.
+        """
+
+        if self.shared and not nested:
+            return self.flush_scope()
+        return super().begin(nested)
+
+
+    @contextmanager
+    def flush_scope(self) -> Iterator[UnitOfWorkSession]:
+        """Flush changes made in the block, so the next queries of the unit of work see them."""
+
+        yield self
+        self.flush()
+
+
+
+class UnitOfWorkSessionMaker(sessionmaker[Session]):
+    """Session factory that returns the shared session of the current thread's unit of work if there is one.
+    Unit of work is bound to a thread, so queries run on query executor workers always get their own sessions.
+
+    It also counts committed writes. Write generation only grows, so read caches remember generation
+    they were filled with and become stale as soon as it changes.
+    """
+
+    def __init__(self, *args:Any, **kwargs:Any) -> None:
+        super().__init__(*args, class_=UnitOfWorkSession, **kwargs)
+        self.thread_data = local()
+        self.write_generation = 0
+        self.write_generation_lock = Lock()
+
+
+    def bump_write_generation(self) -> None:
+        """Mark that database was changed. Inside unit of work generation is bumped only after the unit of work is committed,
+        so a read running on another thread can't cache not yet committed data as the new generation.
+        """
+
+        shared_session:UnitOfWorkSession|None = getattr(self.thread_data, "session", None)
+        if shared_session is not None:
+            shared_session.write_generation_bump_pending = True
+            return
+
+        with self.write_generation_lock:
+            self.write_generation += 1
+
+
+    def __call__(self, **local_kw:Any) -> Session:
+        shared_session:UnitOfWorkSession|None = getattr(self.thread_data, "session", None)
+        if shared_session is not None:
+            return shared_session
+        return super().__call__(**local_kw)
+
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """Share one session and transaction between all queries run inside the block.
+        Changes are committed once at the end of the block or rolled back if an exception is raised.
+        Nested unit of work joins the outer one.
+        """
+
+        shared_session:UnitOfWorkSession|None = getattr(self.thread_data, "session", None)
+        if shared_session is not None:
+            yield shared_session
+            return
+
+        session = cast(UnitOfWorkSession, super().__call__())
+        with session:
+            with session.begin():
+                session.shared = True
+                self.thread_data.session = session
+                try:
+                    yield session
+                except Exception:
+                    logger.error("Unit of work failed. Changes are rolled back")
+                    session.deferred_statements.clear()
+                    session.write_generation_bump_pending = False
+                    raise
+                finally:
+                    self.thread_data.session = None
+                    session.shared = False
+
+            for statement in session.deferred_statements:
+                session.execute(statement)
+            session.deferred_statements.clear()
+
+            if session.write_generation_bump_pending:
+                session.write_generation_bump_pending = False
+                self.bump_write_generation()
+
+
+def execute_outside_transaction(session:Session, statement:Executable) -> None:
+    """Execute statement that can't be run inside a transaction (e.g. VACUUM).
+    If session is shared by a unit of work, statement is executed after the unit of work is committed.
+
+        Arguments
+        ---------
+            `session` : (Session) - Session to execute statement.
+            `statement` : (Executable) - Statement to execute.
+    """
+
+    if isinstance(session, UnitOfWorkSession) and session.shared:
+        session.deferred_statements.append(statement)
+    else:
+        session.execute(statement)
+
+
+def get_write_generation(session_factory:sessionmaker[Session]) -> int|None:
+    """Get write generation of the session factory.
+
+        Arguments
+        ---------
+            `session_factory` : (sessionmaker) - Session factory of the query.
+        Returns
+        -------
+            `int|None` - Write generation or None if session factory doesn't count writes (e.g. plain sessionmaker in benchmarks).
+    """
+
+    if isinstance(session_factory, UnitOfWorkSessionMaker):
+        return session_factory.write_generation
+    return None
+
+
+
+class WriteQueryOwner(Protocol):
+    """Query object that writes to database through its session factory."""
+
+    session_factory:sessionmaker[Session]
+
+
+QueryT = TypeVar("QueryT", bound=WriteQueryOwner)
+QueryParams = ParamSpec("QueryParams")
+QueryResult = TypeVar("QueryResult")
+
+
+def write_query(
+        method:Callable[Concatenate[QueryT, QueryParams], QueryResult]
+    ) -> Callable[Concatenate[QueryT, QueryParams], QueryResult]:
+    """Decorate query method that changes database. Write generation is bumped after the method succeeded,
+    so cached results of read queries are not used anymore.
+    """
+
+    @wraps(method)
+    def wrapper(query:QueryT, /, *args:QueryParams.args, **kwargs:QueryParams.kwargs) -> QueryResult:
+        result = method(query, *args, **kwargs)
+        if isinstance(query.session_factory, UnitOfWorkSessionMaker):
+            query.session_factory.bump_write_generation()
+        return result
+
+    return wrapper
@@ -0,0 +1,116 @@
+"""Measure insert and statistics latency of every SQLite database profile.
+
+Run from the app directory: `python -m benchmarks.db_profiles_benchmark [transactions_amount]`
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import os
+import sys
+import logging
+from random import randint, uniform
+from datetime import date
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from alembic.config import Config
+from alembic import command
+
+from project_configuration import APP_DIRECTORY, CategoryType
+from AppObjects.user_config import UserConfig
+from backend.db_controller import apply_db_profile
+from backend.fts_utils import register_fts_functions
+from backend.account_query import AccountQuery
+from backend.category_query import CategoryQuery
+from backend.transaction_query import TransactionQuery
+from backend.statistics_query import StatisticsQuery
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection as SQLiteConnection
+
+
+BENCHMARK_YEAR = 2024
+DEFAULT_TRANSACTIONS_AMOUNT = 2000
+STATISTICS_REPEATS = 50
+
+
+def benchmark_profile(db_profile:str, db_directory:str, transactions_amount:int) -> tuple[float, float]:
+    """Fill a new database using the profile and measure latency of single inserts and yearly statistics.
+
+        Arguments
+        ---------
+            `db_profile` : (str) - Name of the profile. One of UserConfig.DBProfile values.
+            `db_directory` : (str) - Directory where the benchmark database is created.
+            `transactions_amount` : (int) - Amount of transactions to insert.
+        Returns
+        -------
+            `tuple[float, float]` - Average insert latency and average yearly statistics latency in milliseconds.
+    """
+
+    db_path = f"sqlite:///{os.path.join(db_directory, f'{db_profile}.sqlite')}"
+    alembic_config = Config(os.path.join(APP_DIRECTORY, "alembic.ini"))
+    alembic_config.set_main_option("script_location", os.path.join(APP_DIRECTORY, "alembic"))
+    alembic_config.set_main_option("sqlalchemy.url", db_path)
+    command.upgrade(alembic_config, "head")
+    logging.disable(logging.INFO)
+
+    engine = create_engine(db_path)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection:SQLiteConnection, connection_record:Any) -> None:
+        apply_db_profile(dbapi_connection, db_profile)
+        register_fts_functions(dbapi_connection)
+
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    account_query = AccountQuery(session_factory)
+    category_query = CategoryQuery(session_factory)
+    transaction_query = TransactionQuery(session_factory)
+    statistics_query = StatisticsQuery(session_factory)
+
+    account_query.create_account("Benchmark account")
+    account_id = account_query.get_all_accounts()[0].id
+    account_query.account_id = category_query.account_id = account_id
+    transaction_query.account_id = statistics_query.account_id = account_id
+
+    for position, category_type in enumerate((CategoryType.Income, CategoryType.Expense)):
+        category_query.create_category(f"Benchmark {category_type}", category_type, position)
+    categories_id = [category.id for category in category_query.get_all_categories()]
+
+    start = perf_counter()
+    for index in range(transactions_amount):
+        transaction_query.add_transaction(
+            categories_id[index % len(categories_id)],
+            date(BENCHMARK_YEAR, randint(1, 12), randint(1, 28)),
+            round(uniform(1, 1000), 2),
+            f"Benchmark transaction {index}"
+        )
+    insert_latency = (perf_counter() - start) * 1000 / transactions_amount
+
+    start = perf_counter()
+    for _ in range(STATISTICS_REPEATS):
+        statistics_query.get_categories_monthly_transactions_sum_by_months(categories_id, BENCHMARK_YEAR, list(range(1, 13)))
+        for month in range(1, 13):
+            for category_id in categories_id:
+                statistics_query.get_monthly_transactions_max_value(category_id, BENCHMARK_YEAR, month)
+                statistics_query.get_monthly_transactions_min_value(category_id, BENCHMARK_YEAR, month)
+    statistics_latency = (perf_counter() - start) * 1000 / STATISTICS_REPEATS
+
+    engine.dispose(close=True)
+    logging.disable(logging.NOTSET)
+    return insert_latency, statistics_latency
+
+
+def main() -> None:
+    transactions_amount = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS_AMOUNT
+
+    print(f"Transactions: {transactions_amount}")
+    print(f"{'Profile':<10}{'Insert, ms':>14}{'Yearly statistics, ms':>26}")
+    with TemporaryDirectory() as db_directory:
+        for db_profile in UserConfig.DBProfile:
+            insert_latency, statistics_latency = benchmark_profile(db_profile.value, db_directory, transactions_amount)
+            print(f"{db_profile.value:<10}{insert_latency:>14.3f}{statistics_latency:>26.3f}")
+
+
+if __name__ == "__main__":
+    main()
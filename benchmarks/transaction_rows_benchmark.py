@@ -0,0 +1,115 @@
+"""Compare loading transactions as ORM instances and as read-only TransactionRow tuples.
+
+Run from the app directory: `python -m benchmarks.transaction_rows_benchmark [transactions_amount]`
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import os
+import sys
+import logging
+from random import randint, uniform
+from datetime import date, timedelta
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from alembic.config import Config
+from alembic import command
+
+from project_configuration import APP_DIRECTORY, CategoryType
+from AppObjects.user_config import UserConfig
+from backend.db_controller import apply_db_profile
+from backend.fts_utils import register_fts_functions
+from backend.models import Transaction
+from backend.account_query import AccountQuery
+from backend.category_query import CategoryQuery
+from backend.statistics_query import StatisticsQuery
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection as SQLiteConnection
+
+
+BENCHMARK_YEAR = 2024
+DEFAULT_TRANSACTIONS_AMOUNT = 500_000
+INSERT_BATCH_SIZE = 50_000
+LOAD_REPEATS = 3
+
+
+def main() -> None:
+    transactions_amount = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS_AMOUNT
+
+    with TemporaryDirectory() as db_directory:
+        db_path = f"sqlite:///{os.path.join(db_directory, 'rows.sqlite')}"
+        alembic_config = Config(os.path.join(APP_DIRECTORY, "alembic.ini"))
+        alembic_config.set_main_option("script_location", os.path.join(APP_DIRECTORY, "alembic"))
+        alembic_config.set_main_option("sqlalchemy.url", db_path)
+        command.upgrade(alembic_config, "head")
+        logging.disable(logging.INFO)
+
+        engine = create_engine(db_path)
+
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragma(dbapi_connection:SQLiteConnection, connection_record:Any) -> None:
+            apply_db_profile(dbapi_connection, UserConfig.DBProfile.BALANCED.value)
+            register_fts_functions(dbapi_connection)
+
+        session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        account_query = AccountQuery(session_factory)
+        category_query = CategoryQuery(session_factory)
+        statistics_query = StatisticsQuery(session_factory)
+
+        account_query.create_account("Benchmark account")
+        account_id = account_query.get_all_accounts()[0].id
+        account_query.account_id = category_query.account_id = statistics_query.account_id = account_id
+
+        for position, category_type in enumerate((CategoryType.Income, CategoryType.Expense)):
+            category_query.create_category(f"Benchmark {category_type}", category_type, position)
+        categories_id = [category.id for category in category_query.get_all_categories()]
+
+        print(f"Inserting {transactions_amount} transactions")
+        with engine.begin() as connection:
+            for batch_start in range(0, transactions_amount, INSERT_BATCH_SIZE):
+                connection.execute(insert(Transaction), [
+                    {
+                        "category_id":categories_id[index % len(categories_id)],
+                        "date":date(BENCHMARK_YEAR, randint(1, 12), randint(1, 28)),
+                        "value":round(uniform(1, 1000), 2),
+                        "name":f"Benchmark transaction {index}"
+                    }
+                    for index in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, transactions_amount))
+                ])
+
+        from_date, to_date = date(BENCHMARK_YEAR, 1, 1), date(BENCHMARK_YEAR, 12, 31)
+
+        start = perf_counter()
+        for _ in range(LOAD_REPEATS):
+            with session_factory() as session:
+                orm_transactions = session.query(Transaction).filter(
+                    Transaction.category_id.in_(categories_id),
+                    Transaction.date >= from_date,
+                    Transaction.date < to_date + timedelta(days=1)
+                ).all()
+                orm_sum = sum(transaction.value for transaction in orm_transactions)
+        orm_latency = (perf_counter() - start) * 1000 / LOAD_REPEATS
+
+        start = perf_counter()
+        for _ in range(LOAD_REPEATS):
+            transaction_rows = statistics_query.get_transactions_by_range(categories_id, from_date, to_date)
+            rows_sum = sum(transaction.value for transaction in transaction_rows)
+        rows_latency = (perf_counter() - start) * 1000 / LOAD_REPEATS
+
+        engine.dispose(close=True)
+        logging.disable(logging.NOTSET)
+
+    if round(orm_sum, 2) != round(rows_sum, 2):
+        raise RuntimeError("ORM instances and transaction rows have different values")
+
+    print(f"{'Loaded as':<18}{'Rows':>10}{'Load and sum, ms':>20}")
+    print(f"{'ORM Transaction':<18}{len(orm_transactions):>10}{orm_latency:>20.1f}")
+    print(f"{'TransactionRow':<18}{len(transaction_rows):>10}{rows_latency:>20.1f}")
+    print(f"Speedup: {orm_latency / rows_latency:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -105,6 +105,8 @@ class LanguageStructure():
     ShortcutsManagement = Settings.add_subcategory("Shortcuts management")
     ShortcutsNames = ShortcutsManagement.add_subcategory("Shortcuts names")
     ShortcutsDescriptions = ShortcutsManagement.add_subcategory("Shortcuts descriptions")
+    TransactionsImport = Settings.add_subcategory("Transactions import")
+    TransactionsExport = Settings.add_subcategory("Transactions export")
 
     Statistics = Windows.add_subcategory("Statistics")
     Update = Windows.add_subcategory("Update")
@@ -155,7 +155,7 @@ def main(test_mode:bool=False) -> None:
 
     from AppObjects.windows_registry import WindowsRegistry
     from Statistics.statistics import show_monthly_statistics, show_quarterly_statistics, show_yearly_statistics,\
-    show_custom_range_statistics_window, show_custom_range_statistics_view
+    show_custom_range_statistics_window, show_custom_range_statistics_view, cancel_statistics
     from Statistics.copy_statistics import  copy_monthly_transactions, copy_monthly_statistics, copy_quarterly_statistics,\
     copy_yearly_statistics, copy_custom_range_statistics, copy_custom_range_transactions
 
@@ -169,9 +169,12 @@ def main(test_mode:bool=False) -> None:
     from AppManagement.account import show_add_user_window, add_account, remove_account,\
         show_rename_account_window, rename_account, load_accounts, clear_accounts_layout 
     from AppManagement.backup_management import load_backups, create_backup, remove_backup, load_backup,\
-        open_auto_backup_window, auto_backup, prevent_same_auto_backup_status, save_auto_backup_settings, auto_remove_backups
+        open_auto_backup_window, auto_backup, prevent_same_auto_backup_status, save_auto_backup_settings, auto_remove_backups,\
+        rebuild_search_index
     from AppManagement.shortcuts.shortcuts_management import load_shortcuts, save_shortcuts
-    from AppManagement.search import show_search_window, perform_search
+    from AppManagement.search import show_search_window, perform_search, load_next_search_page
+    from AppManagement.transactions_import import show_transactions_import_window, choose_import_file, import_transactions
+    from AppManagement.transactions_export import show_transactions_export_window, choose_export_file
 
     #Set main window for instance guard
     app_core.instance_guard.main_window = WindowsRegistry.MainWindow
@@ -196,6 +199,14 @@ def main(test_mode:bool=False) -> None:
     WindowsRegistry.StatisticsWindow.quarterly_statistics.clicked.connect(show_quarterly_statistics)
     WindowsRegistry.StatisticsWindow.yearly_statistics.clicked.connect(show_yearly_statistics)
     WindowsRegistry.StatisticsWindow.custom_range_statistics.clicked.connect(show_custom_range_statistics_window)
+    WindowsRegistry.MonthlyStatistics.finished.connect(
+        lambda: cancel_statistics("monthly_statistics", WindowsRegistry.MonthlyStatistics.statistics_progress))
+    WindowsRegistry.QuarterlyStatistics.finished.connect(
+        lambda: cancel_statistics("quarterly_statistics", WindowsRegistry.QuarterlyStatistics.statistics_progress))
+    WindowsRegistry.YearlyStatistics.finished.connect(
+        lambda: cancel_statistics("yearly_statistics", WindowsRegistry.YearlyStatistics.statistics_progress))
+    WindowsRegistry.CustomRangeStatisticsView.finished.connect(
+        lambda: cancel_statistics("custom_range_statistics", WindowsRegistry.CustomRangeStatisticsView.statistics_progress))
     WindowsRegistry.MonthlyStatistics.copy_statistics.clicked.connect(copy_monthly_statistics)
     WindowsRegistry.QuarterlyStatistics.copy_statistics.clicked.connect(copy_quarterly_statistics)
     WindowsRegistry.YearlyStatistics.copy_statistics.clicked.connect(copy_yearly_statistics)
@@ -257,6 +268,7 @@ def main(test_mode:bool=False) -> None:
     WindowsRegistry.BackupManagementWindow.create_backup.clicked.connect(create_backup)
     WindowsRegistry.BackupManagementWindow.delete_backup.clicked.connect(remove_backup)
     WindowsRegistry.BackupManagementWindow.load_backup.clicked.connect(load_backup)
+    WindowsRegistry.BackupManagementWindow.rebuild_search_index.clicked.connect(rebuild_search_index)
     WindowsRegistry.SettingsWindow.auto_backup.clicked.connect(open_auto_backup_window)
 
     WindowsRegistry.AutoBackupWindow.monthly.stateChanged.connect(
@@ -283,9 +295,19 @@ def main(test_mode:bool=False) -> None:
     WindowsRegistry.SettingsWindow.switch_account.clicked.connect(WindowsRegistry.SwitchAccountWindow.exec)
     WindowsRegistry.SettingsWindow.backup_management.clicked.connect(WindowsRegistry.BackupManagementWindow.exec)
     WindowsRegistry.SettingsWindow.shortcuts_management.clicked.connect(WindowsRegistry.ShortcutsWindow.exec)
+    WindowsRegistry.SettingsWindow.transactions_import.clicked.connect(show_transactions_import_window)
+    WindowsRegistry.SettingsWindow.transactions_export.clicked.connect(show_transactions_export_window)
+
+    #Transactions import
+    WindowsRegistry.TransactionsImportWindow.choose_file.clicked.connect(choose_import_file)
+    WindowsRegistry.TransactionsImportWindow.import_transactions.clicked.connect(import_transactions)
+
+    #Transactions export
+    WindowsRegistry.TransactionsExportWindow.export_transactions.clicked.connect(choose_export_file)
 
     #Search
     WindowsRegistry.SearchWindow.search.clicked.connect(perform_search)
+    WindowsRegistry.SearchWindow.transactions_list.verticalScrollBar().valueChanged.connect(load_next_search_page)
     
     QTimer.singleShot(50, post_show_setup)
 
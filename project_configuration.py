@@ -55,6 +55,8 @@ GUI_LIBRARY_HASH_FILE_PATH = os.path.join(APP_HASHES_DIRECTORY, GUI_LIBRARY_HASH
 TEST_GUI_LIBRARY_HASH_FILE_PATH = os.path.join(TEST_APP_HASHES_DIRECTORY, GUI_LIBRARY_HASH_FILE)
 
 CACHE_DIRECTORY = os.path.join(ROOT_DIRECTORY, "Cache")
+STATISTICS_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "Statistics")
+TEST_STATISTICS_CACHE_DIRECTORY = os.path.join(CACHE_DIRECTORY, "Test Statistics")
 
 UPDATE_DIRECTORY = os.path.join(ROOT_DIRECTORY, "Temp Update")
 TEST_UPDATE_DIRECTORY = os.path.join(APP_DIRECTORY, "Test Temp Update")
@@ -116,10 +118,31 @@ AVAILABLE_LANGUAGES = ["English","Українська","Polski"]
 MIN_TRANSACTION_VALUE = 0.0
 MAX_TRANSACTION_VALUE = 2_000_000_000#2 billion
 
+QUERY_EXECUTOR_MAX_WORKERS = 2
+CANCELLATION_CHECK_INSTRUCTIONS = 10_000#SQLite VM instructions between checks if running query was cancelled
+SEARCH_PAGE_SIZE = 100
+SEARCH_SCORE_CUTOFF = 85#Min WRatio score of found transaction name
+SEARCH_PREFILTER_THRESHOLD = 2000#Candidates are first filtered by cheaper partial_ratio if there are more of them
+SEARCH_PREFILTER_SCORE_CUTOFF = 75
+SEARCH_MAX_MATCHES = 5000#Only best matches are shown for very common words
+SEARCH_CACHE_SIZE = 16#Searches kept in memory. Cached name search keeps all its candidates
+IMPORT_CHUNK_SIZE = 5000#Transactions inserted by one executemany
+IMPORT_FILES_FILTER = "Transactions (*.csv *.ofx *.qfx)"
+EXPORT_CHUNK_SIZE = 5000#Transactions fetched from cursor and written to file at once
+EXPORT_FILES_FILTERS = {"csv":"CSV (*.csv)", "jsonl":"JSON Lines (*.jsonl)"}
+STATISTICS_CACHE_MAX_SIZE = 8*1024*1024#8 MB, least recently used statistics are removed from disk cache above it
+MONTH_SNAPSHOTS_CACHE_SIZE = 12#Loaded months kept in memory for instant month switching
+PREFETCHED_MONTHS_OFFSETS = (1, -1, 2, -2)#Months around the current one loaded in background after navigation
+ACCOUNT_VIEW_STATES_CACHE_SIZE = 3#Recently used accounts which categories widgets are kept for instant switching
+
 QCALENDAR_DATE_FORMAT = "dd/MM/yyyy"
 INFORMATION_MESSAGE_DURATION = 500#Milliseconds
 INFORMATION_MESSAGE_STEP_INTERVAL = 60 #FPS for animation
 INFORMATION_MESSAGE_STEPS = INFORMATION_MESSAGE_DURATION / INFORMATION_MESSAGE_STEP_INTERVAL
+LAZY_PANEL_RELEASE_TIMEOUT = 60_000#Milliseconds, statistics panel that wasn't visible that long is cleared
+LAZY_PANEL_RELEASE_CHECK_INTERVAL = 10_000#Milliseconds
+RICH_TEXT_DOCUMENTS_CACHE_SIZE = 500#Laid out documents of painted list items
+RICH_TEXT_SIZES_CACHE_SIZE = 20_000#Sizes of list items, they are requested for every item of list
 
 MAX_BACKUPS_VALIDATOR_REGEX = r"^[1-9][0-9]{0,2}|1000$"
 MAX_LEGACY_BACKUPS_VALIDATOR_REGEX = r"^(?:[1-9]|[1-9]\d|100)$"
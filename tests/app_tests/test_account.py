@@ -147,4 +147,29 @@ class TestAccount(DBTestCase, OutOfScopeTestCase):
 
 
         
-        
\ No newline at end of file
+        
+
+
+    def test_4_account_view_cache(self) -> None:
+        """Test that switching back to recently used account restores its cached view."""
+
+        app_core = AppCore.instance()
+        test_user_id = app_core.db.account_id
+        test_user_categories = dict(app_core.categories)
+        test_user_balance = app_core.current_balance
+
+        app_core.db.create_account("Second test user", 100)
+        load_account_data("Second test user")
+        self.assertEqual(len(app_core.categories), 0, "Categories of previous account are shown")
+        self.assertIn(test_user_id, app_core.account_view_states.states, "View of previous account hasn't been cached")
+        self.assertEqual(app_core.current_balance, 100, "Balance of loaded account hasn't been loaded")
+
+        load_account_data("Test user")
+        self.assertNotIn(test_user_id, app_core.account_view_states.states, "Shown account view is still cached")
+        self.assertEqual(app_core.categories, test_user_categories, "Cached categories haven't been restored")
+        self.assertEqual(app_core.current_balance, test_user_balance, "Cached balance hasn't been restored")
+        self.assertEqual(
+            app_core.categories[self.income_category.id].table_data.rowCount(), 1,
+            "Transactions of restored category have been lost"
+        )
+        qsleep(500)
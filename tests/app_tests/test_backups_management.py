@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 import os
 from functools import partial
 from datetime import datetime, timedelta
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, Qt
 
 from languages import LanguageStructure
 from project_configuration import TEST_BACKUPS_DIRECTORY, MIN_RECOMMENDED_BACKUPS, MAX_RECOMMENDED_BACKUPS,\
@@ -12,6 +12,7 @@ from tests.tests_toolkit import DBTestCase, OutOfScopeTestCase, qsleep
 from AppObjects.app_core import AppCore
 from AppObjects.windows_registry import WindowsRegistry
 from DesktopQtToolkit.Utils import get_table_widget_item
+from DesktopQtToolkit.table_widget import CustomTableWidget, CustomTableWidgetItem
 
 from AppManagement.backup_management import auto_backup
 
@@ -862,3 +863,34 @@ class TestBackupsManagement(DBTestCase, OutOfScopeTestCase):
 
 
             
+
+
+    def test_9_backups_table_sorting(self) -> None:
+        """Test that table items are sorted by number if they are numbers and by text otherwise,
+        and that bulk population restores sorting and updates of the table even if it fails."""
+
+        table = CustomTableWidget(0, 2)
+        table.setSortingEnabled(True)
+        with table.bulk_population():
+            self.assertFalse(table.isSortingEnabled(), "Sorting isn't suspended during bulk population")
+            for row, (value, name) in enumerate((("10", "b"), ("9", "a"), ("2.5", "C"))):
+                table.insertRow(row)
+                table.setItem(row, 0, CustomTableWidgetItem(value))
+                table.setItem(row, 1, CustomTableWidgetItem(name))
+
+        table.sortItems(0, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(
+            [get_table_widget_item(table, row, 0).text() for row in range(table.rowCount())], ["2.5", "9", "10"],
+            "Numeric column isn't sorted by value"
+        )
+        table.sortItems(1, Qt.SortOrder.AscendingOrder)
+        self.assertEqual(
+            [get_table_widget_item(table, row, 1).text() for row in range(table.rowCount())], ["C", "a", "b"],
+            "Text column isn't sorted by text"
+        )
+
+        with self.assertRaises(ValueError):
+            with table.bulk_population():
+                raise ValueError("Population failed")
+        self.assertTrue(table.isSortingEnabled(), "Sorting hasn't been restored after failed bulk population")
+        self.assertTrue(table.updatesEnabled(), "Updates haven't been enabled after failed bulk population")
@@ -9,6 +9,8 @@ from languages import LanguageStructure
 from backend.models import Category
 from GUI.gui_constants import app
 from AppManagement.shortcuts.shortcuts_actions import move_to_next_category
+from AppManagement.category import create_category, reorder_categories, remove_categories_from_list, load_categories,\
+activate_categories
 from project_configuration import CategoryType
 
 from AppObjects.app_core import AppCore
@@ -292,3 +294,91 @@ class TestCategory(DBTestCase, OutOfScopeTestCase):
 
 
 
+
+
+    def test_7_load_categories_data_on_month_change(self) -> None:
+        """Test that categories tables and totals are reloaded when month is changed."""
+
+        app_core = AppCore.instance()
+        next_month = app_core.current_month + 1 if app_core.current_month != 12 else 1
+        next_month_year = app_core.current_year if app_core.current_month != 12 else app_core.current_year + 1
+
+        app_core.db.transaction_query.add_transaction(
+            self.income_category.id, date(next_month_year, next_month, 1), 500, "Next month income transaction"
+        )
+        income_category = app_core.categories[self.income_category.id]
+        expenses_category = app_core.categories[self.expenses_category.id]
+
+        self.click_on_widget(WindowsRegistry.MainWindow.next_month_button)
+        if next_month == 1:
+            self.click_on_widget(WindowsRegistry.MainWindow.next_year_button)
+
+        self.assertEqual(1, income_category.table_data.rowCount(), "Income category hasn't loaded next month transactions")
+        self.assertEqual(0, expenses_category.table_data.rowCount(), "Expenses category still shows previous month transactions")
+        self.assertEqual(
+            f"{LanguageStructure.Categories.get_translation(10)}500.0", income_category.total_value_label.text(),
+            "Income category total hasn't been updated for next month"
+        )
+        self.assertEqual(
+            f"{LanguageStructure.Categories.get_translation(10)}0", expenses_category.total_value_label.text(),
+            "Expenses category total hasn't been reset for next month"
+        )
+
+        self.click_on_widget(WindowsRegistry.MainWindow.previous_month_button)
+        if next_month == 1:
+            self.click_on_widget(WindowsRegistry.MainWindow.previous_year_button)
+
+        for category in (income_category, expenses_category):
+            self.assertEqual(1, category.table_data.rowCount(), f"Category {category.name} hasn't loaded current month transactions")
+            self.assertEqual(
+                f"{LanguageStructure.Categories.get_translation(10)}1000.0", category.total_value_label.text(),
+                f"Category {category.name} total hasn't been restored for current month"
+            )
+
+        qsleep(500)
+
+
+    def test_8_category_widgets_reuse(self) -> None:
+        """Test that position change moves category widgets and reloaded categories reuse pooled widgets."""
+
+        app_core = AppCore.instance()
+        WindowsRegistry.MainWindow.Incomes_and_expenses.setCurrentIndex(0)
+        WindowsRegistry.AddCategoryWindow.category_name.setText("Second "+self.income_category.name)
+        create_category()
+
+        second_income_category = app_core.db.category_query.get_category("Second "+self.income_category.name, CategoryType.Income)
+        if second_income_category is None:
+            logger.error("Just created category not found in the database")
+            raise ValueError("Just created category not found in the database")
+
+        category_window = app_core.categories[self.income_category.id].window
+        app_core.db.category_query.change_category_position(1, 0, self.income_category.id, CategoryType.Income)
+        reorder_categories()
+
+        self.assertIs(
+            app_core.categories[self.income_category.id].window, category_window, "Category widgets have been recreated"
+        )
+        self.assertEqual(app_core.categories[self.income_category.id].position, 1, "Category position hasn't been updated")
+        self.assertEqual(
+            WindowsRegistry.MainWindow.Incomes_window_layout.indexOf(category_window), 2,
+            "Category widget hasn't been moved to its new position"
+        )
+
+        loaded_windows = {category.window for category in app_core.categories.values()}
+        remove_categories_from_list()
+        self.assertTrue(
+            {category.window for category in app_core.categories_pool}.issuperset(loaded_windows),
+            "Removed categories haven't been put to categories pool"
+        )
+
+        load_categories()
+        activate_categories()
+        self.assertEqual(
+            {category.window for category in app_core.categories.values()}, loaded_windows,
+            "Loaded categories haven't reused pooled widgets"
+        )
+        self.assertEqual(
+            app_core.categories[second_income_category.id].name_label.text(), second_income_category.name,
+            "Reused category widgets show data of previous category"
+        )
+        qsleep(500)
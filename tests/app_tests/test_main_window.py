@@ -2,13 +2,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, QSize
 
 from languages import LanguageStructure
 from project_configuration import AVAILABLE_LANGUAGES
 from AppObjects.app_core import AppCore
 from AppObjects.windows_registry import WindowsRegistry
 from tests.tests_toolkit import qsleep, OutOfScopeTestCase
+from DesktopQtToolkit.qrich_text_delegate import QRichTextDelegate
 
 from GUI.gui_constants import app
 
@@ -214,6 +215,8 @@ class TestMainWindow(OutOfScopeTestCase):
             current_theme = app_core.config.theme
             current_style_sheet = app.styleSheet()
             current_theme_icon = WindowsRegistry.SettingsWindow.switch_themes_button.icon()
+            cached_layout_key = ("Cached before theme change", 1, "", 0)
+            QRichTextDelegate.sizes_cache[cached_layout_key] = QSize(1, 1)
 
             self.click_on_widget(WindowsRegistry.SettingsWindow.switch_themes_button)
 
@@ -226,6 +229,7 @@ class TestMainWindow(OutOfScopeTestCase):
                 WindowsRegistry.SettingsWindow.switch_themes_button.icon(),
                 f"Theme icon  hasn't changed."
             )
+            self.assertNotIn(cached_layout_key, QRichTextDelegate.sizes_cache, "Rich text layout cache isn't cleared after theme change")
 
             self.click_on_widget(WindowsRegistry.SettingsWindow.switch_themes_button)
             WindowsRegistry.SettingsWindow.done(1)
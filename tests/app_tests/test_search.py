@@ -3,10 +3,16 @@ from typing import Callable, cast
 from PySide6.QtCore import QTimer, QDate
 from datetime import date
 import random
+import sqlite3
+from contextlib import closing
+from unittest.mock import patch
+from sqlalchemy import text
 
-from tests.tests_toolkit import DBTestCase, qsleep
+from tests.tests_toolkit import DBTestCase, qsleep, wait_for_queries
 from AppObjects.windows_registry import WindowsRegistry
 from AppObjects.app_core import AppCore
+from backend.search_query import SearchCriteria, score_transactions_names
+from project_configuration import SEARCH_PAGE_SIZE, SEARCH_PREFILTER_THRESHOLD, TEST_DB_FILE_PATH
 
 
 
@@ -68,6 +74,7 @@ class TestSearch(DBTestCase):
             WindowsRegistry.SearchWindow.date_selection.search_from_date.setDate(date_range[0])
             WindowsRegistry.SearchWindow.date_selection.search_to_date.setDate(date_range[1])
         self.click_on_widget(WindowsRegistry.SearchWindow.search)
+        wait_for_queries()
         return self.get_search_result()
 
 
@@ -541,3 +548,256 @@ class TestSearch(DBTestCase):
         perform_search_and_assert("ства", True)
 
 
+
+
+    def test_08_superseded_search_results_are_dropped(self) -> None:
+        """
+        Tests that only the latest search of the channel delivers its results when searches are performed in quick succession.
+        """
+
+        query_executor = AppCore.instance().query_executor
+        delivered_results:list[str] = []
+
+        query_executor.submit("search", lambda: "first", delivered_results.append)
+        query_executor.submit("search", lambda: "second", delivered_results.append)
+        wait_for_queries()
+        self.assertEqual(delivered_results, ["second"], "Result of superseded search was delivered")
+
+        query_executor.submit("search", lambda: "cancelled", delivered_results.append)
+        query_executor.cancel("search")
+        wait_for_queries()
+        self.assertEqual(delivered_results, ["second"], "Result of cancelled search was delivered")
+
+
+    def test_09_fts5_index_is_maintained_by_triggers(self) -> None:
+        """
+        Tests that search index follows transactions changes, including transactions deleted together with their category.
+        """
+
+        app_core = AppCore.instance()
+
+        def get_index_state() -> tuple[int, int, list[int]]:
+            with app_core.db.session_factory() as session:
+                with session.begin():
+                    session.execute(text("INSERT INTO transactions_fts(transactions_fts, rank) VALUES ('integrity-check', 1)"))
+                    return (
+                        session.execute(text("SELECT count(*) FROM transactions_fts_docsize")).scalar_one(),
+                        session.execute(text("SELECT count(*) FROM transactions")).scalar_one(),
+                        list(session.execute(text(
+                            "SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH '\"Re\" AND \"am\" AND \"ed\"'"
+                        )).scalars())
+                    )
+
+        app_core.db.transaction_query.update_transaction(
+            self.income_transaction.id, "Renamed", self.income_transaction.date.day, self.income_transaction.value
+        )
+        indexed_transactions, transactions, renamed_transactions = get_index_state()
+        self.assertEqual(indexed_transactions, transactions, "Search index size differs from amount of transactions")
+        self.assertEqual(renamed_transactions, [self.income_transaction.id], "Renamed transaction isn't found by new name")
+
+        app_core.db.category_query.delete_category(self.income_category.id)
+        indexed_transactions, transactions, renamed_transactions = get_index_state()
+        self.assertEqual(indexed_transactions, transactions, "Transactions of deleted category are left in search index")
+        self.assertEqual(renamed_transactions, [], "Transaction of deleted category is found")
+
+        app_core.db.search_query.rebuild_index()
+        app_core.db.search_query.optimize_index()
+        self.assertEqual(get_index_state()[0], transactions, "Rebuilt search index size differs from amount of transactions")
+
+
+    def test_10_search_results_are_paginated(self) -> None:
+        """
+        Tests that search results are loaded page by page without duplicates, while sums include all found transactions.
+        """
+
+        app_core = AppCore.instance()
+        transaction_date = self.income_transaction.date
+        extra_transactions = SEARCH_PAGE_SIZE + SEARCH_PAGE_SIZE // 2
+        app_core.db.transaction_query.import_transactions(
+            (transaction_date, index % 5 + 1, f"Paged {index}", self.income_category.id, None) for index in range(extra_transactions)
+        )
+        found_transactions = extra_transactions + 2
+
+        for criteria in (
+            SearchCriteria("", 0.5, ">", transaction_date, transaction_date, [self.income_category.id, self.expenses_category.id]),
+            SearchCriteria("Paged", None, "=", transaction_date, transaction_date, [self.income_category.id])
+        ):
+            with self.subTest(criteria=criteria):
+                search_page = app_core.db.search_query.search_transactions_page(criteria, page_size=7)
+                assert search_page.summary is not None
+                transactions_count = search_page.summary.transactions_count
+                transactions_id = [transaction.id for transaction in search_page.transactions]
+                while search_page.next_cursor is not None:
+                    search_page = app_core.db.search_query.search_transactions_page(criteria, search_page.next_cursor, 7)
+                    self.assertIsNone(search_page.summary, "Summary is calculated for not first page")
+                    transactions_id.extend(transaction.id for transaction in search_page.transactions)
+
+                self.assertEqual(len(transactions_id), transactions_count, "Pages don't contain all found transactions")
+                self.assertEqual(len(set(transactions_id)), len(transactions_id), "Pages contain duplicate transactions")
+
+        def perform_search() -> None:
+            """Search transactions and scroll results list to load remaining pages."""
+
+            self.fill_search_fields_and_perform_search(search_value="0.5", operand=">")
+            transactions_list = WindowsRegistry.SearchWindow.transactions_list
+            self.assertEqual(transactions_list.count(), SEARCH_PAGE_SIZE, "Only the first page has to be loaded")
+            self.assertIn(str(found_transactions), WindowsRegistry.SearchWindow.transaction_amount.text(), "Amount of all found transactions isn't shown")
+            self.assertIn(
+                str(round(sum(index % 5 + 1 for index in range(extra_transactions)) + 1000, 2)),
+                WindowsRegistry.SearchWindow.income_transactions_sum.text(),
+                "Income sum of all found transactions isn't shown"
+            )
+
+            scroll_bar = transactions_list.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+            wait_for_queries()
+            self.assertEqual(transactions_list.count(), found_transactions, "Next page isn't loaded on scroll")
+            WindowsRegistry.SearchWindow.done(0)
+            qsleep(100)
+
+        self.open_search_window(perform_search)
+
+
+    def test_11_casefolded_names_are_maintained_by_triggers(self) -> None:
+        """
+        Tests that casefolded names used for ranking follow transactions changes and large candidate sets are prefiltered.
+        """
+
+        app_core = AppCore.instance()
+        transaction_date = self.income_transaction.date
+
+        def get_name_casefold(transaction_id:int) -> str|None:
+            with app_core.db.session_factory() as session:
+                with session.begin():
+                    return cast(str|None, session.execute(
+                        text("SELECT name_casefold FROM transactions WHERE id = :id"), {"id":transaction_id}
+                    ).scalar_one())
+
+        transaction = app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, 10, "ВЕЛИКИЙ  Ремонт")
+        self.assertEqual(get_name_casefold(transaction.id), "великий ремонт", "Casefolded name isn't set on insert")
+
+        app_core.db.transaction_query.update_transaction(transaction.id, "ЗИМОВІ Шини", transaction_date.day, 10)
+        self.assertEqual(get_name_casefold(transaction.id), "зимові шини", "Casefolded name isn't updated on rename")
+
+        search_page = app_core.db.search_query.search_transactions_page(
+            SearchCriteria("шини", None, "=", transaction_date, transaction_date, [self.income_category.id])
+        )
+        self.assertEqual([found.id for found in search_page.transactions], [transaction.id], "Renamed transaction isn't found")
+
+        names = ["зимові шини", "літні шини"] + [f"продукти {index}" for index in range(SEARCH_PREFILTER_THRESHOLD)]
+        matches = score_transactions_names("шини", names)
+        self.assertEqual(sorted(index for index, _ in matches), [0, 1], "Prefiltered candidates don't match expected names")
+
+
+    def test_12_search_results_are_cached_until_database_changes(self) -> None:
+        """
+        Tests that repeated and refined searches use cached results, and any write makes them stale.
+        """
+
+        app_core = AppCore.instance()
+        search_query = app_core.db.search_query
+        transaction_date = self.income_transaction.date
+        categories_id = [self.income_category.id, self.expenses_category.id]
+        app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, 15, "Winter tires")
+        app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, 25, "Winter coat")
+
+        def search(name:str) -> list[int]:
+            search_page = search_query.search_transactions_page(
+                SearchCriteria(name, None, "=", transaction_date, transaction_date, categories_id)
+            )
+            return [transaction.id for transaction in search_page.transactions]
+
+        value_criteria = SearchCriteria("", 10, ">", transaction_date, transaction_date, categories_id)
+        first_search = search_query.search_transactions_page(value_criteria)
+        self.assertIs(search_query.search_transactions_page(value_criteria), first_search, "Repeated search isn't taken from cache")
+        self.assertEqual(search("Wint"), search("Wint"), "Repeated name search differs")
+
+        refined_search = search("Winter tires")
+        search_query.search_cache.clear()
+        self.assertEqual(refined_search, search("Winter tires"), "Refined search differs from search without cache")
+
+        generation = app_core.db.session_factory.write_generation
+        with app_core.db.unit_of_work():
+            new_transaction = app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, 35, "Winter tyres")
+            self.assertEqual(app_core.db.session_factory.write_generation, generation, "Generation is bumped before commit")
+        self.assertGreater(app_core.db.session_factory.write_generation, generation, "Generation isn't bumped after commit")
+        self.assertIn(new_transaction.id, search("Winter tires"), "Stale cached search is used after database change")
+
+        app_core.db.transaction_query.delete_transaction(new_transaction.id)
+        self.assertNotIn(new_transaction.id, search("Winter tires"), "Stale cached search is used after transaction deletion")
+
+
+    def test_13_search_name_with_double_quotes(self) -> None:
+        """
+        Tests that double quotes of searched name don't break FTS5 query.
+        """
+
+        app_core = AppCore.instance()
+        transaction_date = self.income_transaction.date
+        quoted_transaction = app_core.db.transaction_query.add_transaction(
+            self.income_category.id, transaction_date, 15, 'Book "Dune"'
+        )
+
+        search_page = app_core.db.search_query.search_transactions_page(
+            SearchCriteria('"Dune"', None, "=", transaction_date, transaction_date, [self.income_category.id])
+        )
+        self.assertIn(
+            quoted_transaction.id, [transaction.id for transaction in search_page.transactions],
+            "Transaction with double quotes in name isn't found"
+        )
+
+
+    def test_14_summary_includes_matches_beyond_max_matches(self) -> None:
+        """
+        Tests that only best matches are paged, while amount and sums of name search include all found transactions.
+        """
+
+        app_core = AppCore.instance()
+        transaction_date = self.income_transaction.date
+        app_core.db.transaction_query.import_transactions(
+            (transaction_date, index + 1, f"Capped {index}", self.income_category.id, None) for index in range(10)
+        )
+
+        with patch("backend.search_query.SEARCH_MAX_MATCHES", 3):
+            search_page = app_core.db.search_query.search_transactions_page(
+                SearchCriteria("Capped", None, "=", transaction_date, transaction_date, [self.income_category.id]), page_size=7
+            )
+
+        assert search_page.summary is not None
+        self.assertEqual(len(search_page.transactions), 3, "More than max matches are paged")
+        self.assertIsNone(search_page.next_cursor, "Matches beyond max matches are paged")
+        self.assertEqual(search_page.summary.transactions_count, 10, "Amount of found transactions is capped by max matches")
+        self.assertEqual(search_page.summary.income_sum, 55, "Income sum of found transactions is capped by max matches")
+
+
+    def test_15_write_without_fts_functions_fails(self) -> None:
+        """
+        Tests that connection without registered FTS functions can't write transactions and database stays unchanged.
+        """
+
+        app_core = AppCore.instance()
+
+        def get_transactions_state() -> tuple[int, str|None]:
+            with app_core.db.session_factory() as session:
+                with session.begin():
+                    transactions_count = session.execute(text("SELECT COUNT(*) FROM transactions")).scalar_one()
+                    name = session.execute(
+                        text("SELECT name FROM transactions WHERE id = :id"), {"id":self.income_transaction.id}
+                    ).scalar_one()
+                    return cast(int, transactions_count), cast(str|None, name)
+
+        transactions_state = get_transactions_state()
+
+        with closing(sqlite3.connect(TEST_DB_FILE_PATH)) as connection:
+            with self.assertRaisesRegex(sqlite3.OperationalError, "no such function", msg="Insert without FTS functions hasn't failed"):
+                connection.execute(
+                    "INSERT INTO transactions (date, value, name, category_id) VALUES (?, ?, ?, ?)",
+                    (self.income_transaction.date.isoformat(), 10, "Unregistered", self.income_category.id)
+                )
+            with self.assertRaisesRegex(sqlite3.OperationalError, "no such function", msg="Update without FTS functions hasn't failed"):
+                connection.execute(
+                    "UPDATE transactions SET name = ? WHERE id = ?", ("Unregistered", self.income_transaction.id)
+                )
+            connection.rollback()
+
+        self.assertEqual(get_transactions_state(), transactions_state, "Transactions have been written without FTS functions")
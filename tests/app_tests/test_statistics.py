@@ -2,21 +2,25 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import random
 import re
+from sqlalchemy import event
 
 from datetime import date
 from PySide6.QtCore import QTimer, QDate
 from calendar import monthrange, isleap
 from textwrap import dedent
 
-from tests.tests_toolkit import DBTestCase, OutOfScopeTestCase, qsleep
+from tests.tests_toolkit import DBTestCase, OutOfScopeTestCase, qsleep, wait_for_queries
 from languages import LanguageStructure
 from AppObjects.app_core import AppCore
 from AppObjects.windows_registry import WindowsRegistry
 from project_configuration import CategoryType
 from GeneralTools.html_to_text import html_to_text
+from Statistics.statistics import collect_period_statistics, get_cached_statistics
+from Statistics.statistics_engine import StatisticsEngine
 
 if TYPE_CHECKING:
     from typing import Callable
+    from Statistics.statistics import PeriodStatisticsData
     from DesktopQtToolkit.list_widget import CustomListWidget
 
 
@@ -149,6 +153,8 @@ class TestStatistics(DBTestCase, OutOfScopeTestCase):
             def _check_monthly_statistics() -> None:
                 """Check if monthly statistics are correct."""
 
+                wait_for_queries()
+
                 expected_monthly_statistics = self.create_monthly_statistics(days_amount)
                 actual_statistics = self.get_plain_statistics(WindowsRegistry.MonthlyStatistics.statistics)
 
@@ -187,6 +193,14 @@ class TestStatistics(DBTestCase, OutOfScopeTestCase):
             def _check_quarterly_statistics() -> None:
                 """Check if quarterly statistics are correct."""
 
+                wait_for_queries()
+                qsleep(50)#Wait for visible panels to be populated
+
+                quarters = WindowsRegistry.QuarterlyStatistics.statistics.quarters
+                self.assertNotEqual(quarters[0].total_quarter_statistics.data.count(), 0, "Visible quarter isn't populated")
+                self.assertEqual(quarters[-1].months[-1].data.count(), 0, "Hidden month is populated before it's shown")
+                WindowsRegistry.QuarterlyStatistics.lazy_panels.populate_all()
+
                 for quarter in WindowsRegistry.QuarterlyStatistics.statistics.quarters:
                     quarter_number = quarter.quarter_number
                     months_in_quarter = range((quarter_number - 1) * 3 + 1, quarter_number * 3 + 1)
@@ -286,6 +300,16 @@ class TestStatistics(DBTestCase, OutOfScopeTestCase):
             def _check_yearly_statistics() -> None:
                 """Check if yearly statistics are correct."""
 
+                wait_for_queries()
+                qsleep(50)#Wait for visible panels to be populated
+
+                yearly_statistics = WindowsRegistry.YearlyStatistics.statistics
+                self.assertNotEqual(yearly_statistics.total_year_statistics.data.count(), 0, "Visible year total isn't populated")
+                self.assertEqual(yearly_statistics.months[-1].data.count(), 0, "Hidden month is populated before it's shown")
+                WindowsRegistry.YearlyStatistics.lazy_panels.populate_all()
+                self.assertFalse(WindowsRegistry.YearlyStatistics.statistics_progress.isVisible(), "Progress is shown after statistics are collected")
+                self.assertEqual(WindowsRegistry.YearlyStatistics.statistics_progress.value(), 12, "Progress of every month isn't reported")
+
                 days_amount = 365 if app_core.current_year % 4 != 0 else 366
 
                 total_income = 11000.0
@@ -397,6 +421,8 @@ class TestStatistics(DBTestCase, OutOfScopeTestCase):
                 def _check_custom_range_statistics() -> None:
                     """Check if custom range statistics are correct."""
 
+                    wait_for_queries()
+
                     total_income = 6000.0
                     total_expense = 6000.0
                     date_difference = date(app_core.current_year, 6, 1) - date(app_core.current_year, 1, 1)
@@ -469,5 +495,143 @@ class TestStatistics(DBTestCase, OutOfScopeTestCase):
         qsleep(500)
 
 
+    def test_5_period_statistics_are_calculated_from_one_query(self) -> None:
+        """Test that statistics of the whole year are calculated from transactions loaded with one query."""
+
+        app_core = AppCore.instance()
+        year, month = app_core.current_year, app_core.current_month
+        transaction_date = self.income_transaction.date
+        for value, name in ((1000, "Salary"), (200, "Gift"), (200, "Gift"), (500, "Bonus")):
+            app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, value, name)
+
+        executed_statements:list[str] = []
+        def _count_statement(*args:object) -> None:
+            executed_statements.append(str(args[2]))
+
+        event.listen(app_core.db.engine, "before_cursor_execute", _count_statement)
+        try:
+            Incomes_total_values, Expenses_total_values, months_statistics = collect_period_statistics(
+                [self.income_category.id], [self.expenses_category.id], year, list(range(1, 13))
+            )
+        finally:
+            event.remove(app_core.db.engine, "before_cursor_execute", _count_statement)
+
+        self.assertEqual(len(executed_statements), 1, f"Yearly statistics executed several queries {executed_statements}")
+        self.assertEqual(Incomes_total_values, {self.income_category.id:2900.0}, "Yearly income total is wrong")
+        self.assertEqual(Expenses_total_values, {self.expenses_category.id:1000.0}, "Yearly expense total is wrong")
+
+        month_statistics = months_statistics[month]
+        assert month_statistics is not None
+        Incomes_statistic = month_statistics[0]
+        self.assertEqual(
+            Incomes_statistic[0],
+            {self.income_category.id:({self.test_income_transaction_name:1, "Salary":1}, 1000, {"Gift":2}, 200)},
+            "Highest and lowest transactions of income category are wrong"
+        )
+        self.assertEqual(Incomes_statistic[1], 2900.0, "Highest income category total is wrong")
+        self.assertEqual(month_statistics[1][2], {}, "Only expense category is added to lowest categories")
+        self.assertTrue(
+            all(months_statistics[other_month] is None for other_month in range(1, 13) if other_month != month),
+            "Months without transactions have statistics"
+        )
+
+
+    def test_6_cancelled_statistics_collection_is_stopped(self) -> None:
+        """Test that cancelled statistics collection stops and doesn't collect remaining months."""
+
+        app_core = AppCore.instance()
+        collected_months:list[int] = []
+        statistics_engine = StatisticsEngine([])
+        collect_period_statistics(
+            [self.income_category.id], [self.expenses_category.id], app_core.current_year, list(range(1, 13)),
+            statistics_engine, collected_months.append, lambda: len(collected_months) == 3
+        )
+        self.assertEqual(collected_months, [1, 2, 3], "Months are collected after statistics collection was cancelled")
+
+
+    def test_7_period_query_returns_only_extreme_transactions(self) -> None:
+        """Test that period statistics query returns aggregates of category month with transactions that have min or max value."""
+
+        app_core = AppCore.instance()
+        transaction_date = self.income_transaction.date
+        for value, name in ((1000, "Salary"), (200, "Gift"), (500, "Bonus")):
+            app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, value, name)
+
+        rows = app_core.db.statistics_query.get_period_categories_months_statistics(
+            [self.income_category.id], app_core.current_year, list(range(1, 13))
+        )
+        self.assertEqual(
+            sorted(row[7] for row in rows), sorted(["Gift", "Salary", self.test_income_transaction_name]),
+            "Transactions without min or max value are returned"
+        )
+        self.assertTrue(
+            all(row[:6] == (self.income_category.id, transaction_date.month, 2700.0, 4, 200, 1000) for row in rows),
+            f"Category month aggregates are wrong {rows}"
+        )
+
+
+    def test_8_statistics_cache_is_invalidated_by_writes(self) -> None:
+        """Test that cached statistics are used until transactions of their period change."""
+
+        app_core = AppCore.instance()
+        year, month = app_core.current_year, app_core.current_month
+        Incomes_categories, Expenses_categories = [self.income_category.id], [self.expenses_category.id]
+        collected_statistics:list[PeriodStatisticsData] = []
+
+        def _collect_statistics() -> PeriodStatisticsData:
+            statistics = collect_period_statistics(Incomes_categories, Expenses_categories, year, list(range(1, 13)))
+            collected_statistics.append(statistics)
+            return statistics
+
+        def _get_statistics() -> PeriodStatisticsData:
+            return get_cached_statistics(
+                "yearly", Incomes_categories, Expenses_categories, year, list(range(1, 13)), _collect_statistics, lambda: False
+            )
 
+        first_statistics = _get_statistics()
+        self.assertEqual(_get_statistics(), first_statistics, "Cached statistics are different from collected ones")
+        self.assertEqual(len(collected_statistics), 1, "Cached statistics are collected again")
+
+        app_core.db.transaction_query.add_transaction(self.income_category.id, self.income_transaction.date, 500, "Bonus")
+        self.assertEqual(_get_statistics()[0], {self.income_category.id:1500.0}, "Statistics are loaded from outdated cache")
+        self.assertEqual(len(collected_statistics), 2, "Statistics aren't collected after transaction was added")
+
+        other_year_version = app_core.db.statistics_query.get_period_data_version(year - 1, list(range(1, 13)))
+        app_core.db.transaction_query.add_transaction(self.income_category.id, date(year, month, 1), 100, "Gift")
+        self.assertEqual(
+            app_core.db.statistics_query.get_period_data_version(year - 1, list(range(1, 13))), other_year_version,
+            "Transaction added to one year changed data version of another year"
+        )
 
+        app_core.statistics_cache.clear()
+        _get_statistics()
+        self.assertEqual(len(collected_statistics), 3, "Statistics aren't collected after cache was cleared")
+
+
+    def test_9_monthly_statistics_without_transactions(self) -> None:
+        """Test that monthly statistics show message if expenses categories don't have transactions in the month."""
+
+        AppCore.instance().db.transaction_query.delete_transaction(self.expenses_transaction.id)
+
+        def _open_monthly_statics_window() -> None:
+            """Click button that show monthly statistics window."""
+
+            def _check_monthly_statistics() -> None:
+                """Check that only message about missing transactions is shown."""
+
+                wait_for_queries()
+                statistics = WindowsRegistry.MonthlyStatistics.statistics
+                self.assertEqual(statistics.count(), 1, "Month without expenses has statistics rows")
+                self.assertEqual(
+                    statistics.item(0).text(), WindowsRegistry.Messages.no_transactions.text(),
+                    "Month without expenses hasn't showed error text"
+                )
+                self.assertFalse(
+                    WindowsRegistry.MonthlyStatistics.statistics_progress.isVisible(), "Progress bar hasn't been hidden"
+                )
+                WindowsRegistry.MonthlyStatistics.done(1)
+
+            QTimer.singleShot(100, self.catch_failure(_check_monthly_statistics))
+            self.click_on_widget(WindowsRegistry.StatisticsWindow.monthly_statistics)
+        self.open_statistics_window(_open_monthly_statics_window)
+        qsleep(500)
@@ -1,11 +1,26 @@
-from PySide6.QtCore import QTimer
+import os
+import csv
+import json
+from PySide6.QtCore import Qt, QTimer
 from datetime import datetime
-from tests.tests_toolkit import DBTestCase, OutOfScopeTestCase, qsleep
+from tempfile import TemporaryDirectory
+from sqlalchemy import text
+from tests.tests_toolkit import DBTestCase, OutOfScopeTestCase, qsleep, wait_for_queries
 
 from project_configuration import CategoryType
+from backend.models import Transaction
+from GeneralTools.Utils import generate_month_bounds, shift_month
 from AppManagement.shortcuts.shortcuts_actions import move_to_next_category
+from AppManagement.balance import load_account_balance
+from AppManagement.date import next_month, previous_month
+from AppManagement.transaction import invalidate_current_month
+from AppManagement.transactions_import import show_transactions_import_window, set_import_file, parse_ofx_transactions
+from AppManagement.transactions_import import resolve_transactions_categories, ParsedTransaction
+from AppManagement.transactions_export import export_transactions
+from GUI.ComplexWidgets.transactions_table_model import TransactionsTableModel, SORT_ROLE
 from AppObjects.app_core import AppCore
 from AppObjects.windows_registry import WindowsRegistry
+from languages import LanguageStructure
 
 
 
@@ -187,4 +202,420 @@ class TestTransaction(DBTestCase, OutOfScopeTestCase):
                     self.click_on_widget(WindowsRegistry.TransactionManagementWindow.button)
                 QTimer.singleShot(100, self.catch_failure(set_values))
                 self.click_on_widget(category.add_transaction)
-                qsleep(500)
\ No newline at end of file
+                qsleep(500)
+
+    def test_5_balance_verification(self) -> None:
+        """Test that out of sync account balance is recalculated on the first load of account in session only."""
+
+        app_core = AppCore.instance()
+        start_balance = app_core.db.account_query.get_account().start_balance
+        app_core.db.account_query.update_account_balance(12345, 0, 0)
+        load_account_balance()
+        wait_for_queries()
+        self.assertEqual(
+            app_core.db.account_query.get_account().current_balance,
+            12345,
+            "Account balance has been verified again in the same session"
+        )
+
+        app_core.balance_verified_accounts.clear()
+        load_account_balance()
+        wait_for_queries()
+
+        account = app_core.db.account_query.get_account()
+        self.assertEqual(
+            (account.current_total_income, account.current_total_expenses),
+            (1000, 1000),
+            "Account totals haven't been recalculated from transactions"
+        )
+        self.assertEqual(
+            account.current_balance,
+            start_balance,
+            "Account balance hasn't been recalculated from transactions"
+        )
+        self.assertEqual(
+            app_core.db.account_query.get_account_totals(),
+            (app_core.current_total_income, app_core.current_total_expenses),
+            "Session totals don't match totals calculated by database"
+        )
+    
+
+    def test_6_month_stats_rollup(self) -> None:
+        """Test that monthly statistics rollup follows transactions changes."""
+
+        app_core = AppCore.instance()
+        statistics_query = app_core.db.statistics_query
+        category_id = self.income_category.id
+        year, month = app_core.current_year, app_core.current_month
+
+        transaction = app_core.db.transaction_query.add_transaction(
+            category_id, datetime(year, month, 1).date(), 250, "Rollup transaction"
+        )
+        self.assertEqual(statistics_query.get_monthly_transactions_sum(category_id, year, month), 1250, "Rollup sum hasn't been increased")
+        self.assertEqual(statistics_query.get_monthly_transactions_min_value(category_id, year, month), 250, "Rollup min value hasn't been updated")
+
+        app_core.db.transaction_query.update_transaction(transaction.id, "Rollup transaction", 1, 2000)
+        self.assertEqual(statistics_query.get_monthly_transactions_sum(category_id, year, month), 3000, "Rollup sum hasn't been updated")
+        self.assertEqual(statistics_query.get_monthly_transactions_min_value(category_id, year, month), 1000, "Rollup min value hasn't been recalculated")
+        self.assertEqual(statistics_query.get_monthly_transactions_max_value(category_id, year, month), 2000, "Rollup max value hasn't been updated")
+
+        app_core.db.transaction_query.delete_transaction(transaction.id)
+        self.assertEqual(statistics_query.get_monthly_transactions_sum(category_id, year, month), 1000, "Rollup sum hasn't been decreased")
+        self.assertEqual(statistics_query.get_monthly_transactions_max_value(category_id, year, month), 1000, "Rollup max value hasn't been recalculated")
+
+        next_year, next_month_number = shift_month(year, month, 1)
+        transaction = app_core.db.transaction_query.add_transaction(
+            category_id, datetime(next_year, next_month_number, 1).date(), 250, "Rollup transaction"
+        )
+        app_core.db.transaction_query.delete_transaction(transaction.id)
+        with app_core.db.session_factory() as session:
+            rollup_months = session.execute(
+                text("SELECT year, month FROM category_month_stats WHERE category_id = :category_id"), {"category_id":category_id}
+            ).tuples().all()
+        self.assertEqual(rollup_months, [(year, month)], "Only rollup row of the emptied month has to be removed")
+    
+
+    def test_7_month_filters_use_category_date_index(self) -> None:
+        """Test that month filters of transactions are resolved by composite (category_id, date) index."""
+
+        app_core = AppCore.instance()
+        start_date, end_date = generate_month_bounds(app_core.current_year, app_core.current_month)
+
+        with app_core.db.session_factory() as session:
+            query = session.query(Transaction).filter(
+                Transaction.date >= start_date,
+                Transaction.date < end_date,
+                Transaction.category_id.in_([self.income_category.id, self.expenses_category.id])
+            )
+            statement = query.statement.compile(app_core.db.engine, compile_kwargs={"literal_binds":True})
+            query_plan = " ".join(row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all())
+
+        self.assertIn(
+            "USING INDEX ix_transactions_category_id_date_value (category_id=? AND date>? AND date<?)",
+            query_plan,
+            f"Month filter isn't resolved by composite index. Query plan: {query_plan}"
+        )
+
+
+    def test_8_unit_of_work(self) -> None:
+        """Test that queries inside unit of work share one transaction and are rolled back together on error."""
+
+        app_core = AppCore.instance()
+        transaction_date = datetime(app_core.current_year, app_core.current_month, 1).date()
+        start_balance = app_core.db.account_query.get_account().current_balance
+
+        with self.assertRaises(RuntimeError):
+            with app_core.db.unit_of_work():
+                app_core.db.transaction_query.add_transaction(self.income_category.id, transaction_date, 1000, "Rolled back")
+                app_core.db.account_query.apply_balance_delta(1000, 0)
+                self.assertEqual(
+                    app_core.db.transaction_query.get_category_transactions_sum(self.income_category.id), 2000,
+                    "Query inside unit of work doesn't see changes of previous query"
+                )
+                raise RuntimeError("Unit of work failed")
+
+        self.assertEqual(
+            app_core.db.transaction_query.get_category_transactions_sum(self.income_category.id), 1000,
+            "Transaction added in failed unit of work hasn't been rolled back"
+        )
+        self.assertEqual(
+            app_core.db.account_query.get_account().current_balance, start_balance,
+            "Balance changed in failed unit of work hasn't been rolled back"
+        )
+
+        with app_core.db.unit_of_work():
+            transaction = app_core.db.transaction_query.add_transaction(
+                self.income_category.id, transaction_date, 1000, "Committed"
+            )
+            app_core.db.transaction_query.delete_transaction(transaction.id)
+        self.assertEqual(
+            app_core.db.transaction_query.get_category_transactions_sum(self.income_category.id), 1000,
+            "Unit of work hasn't been committed"
+        )
+
+
+    def test_9_import_transactions(self) -> None:
+        """Test importing transactions from CSV file. Existing transactions have to be skipped."""
+
+        app_core = AppCore.instance()
+        start_balance = app_core.db.account_query.get_account().start_balance
+        transaction_date = self.income_transaction.date.isoformat()
+
+        with TemporaryDirectory() as import_directory:
+            csv_path = os.path.join(import_directory, "transactions.csv")
+            with open(csv_path, "w", encoding="utf-8") as csv_file:
+                csv_file.write(
+                    "date,value,name,category\n"
+                    f"{transaction_date},1000,{self.test_income_transaction_name},{self.test_income_category_name}\n"
+                    f"{transaction_date},500,Imported income,{self.test_income_category_name}\n"
+                    f"{transaction_date},-200,Imported expense,{self.test_expenses_category_name}\n"
+                    f"{transaction_date},-50,Imported without category,Unknown category\n"
+                )
+
+            def _import_transactions() -> None:
+                """Choose CSV file, click import button and wait until import finishes."""
+
+                set_import_file(csv_path)
+                self.click_on_widget(WindowsRegistry.TransactionsImportWindow.import_transactions)
+                wait_for_queries()
+                WindowsRegistry.TransactionsImportWindow.done(0)
+
+            QTimer.singleShot(100, self.catch_failure(_import_transactions))
+            show_transactions_import_window()
+
+        self.assertEqual(
+            len(app_core.db.transaction_query.get_all_transactions(self.income_category.id)), 2,
+            "Income transaction hasn't been imported or duplicate hasn't been skipped"
+        )
+        self.assertEqual(
+            len(app_core.db.transaction_query.get_all_transactions(self.expenses_category.id)), 3,
+            "Expense transactions haven't been imported into found and default categories"
+        )
+        self.assertEqual(
+            app_core.db.transaction_query.get_category_transactions_sum(self.expenses_category.id), 1250,
+            "Imported expense values have to be positive"
+        )
+        self.assertEqual(
+            app_core.db.account_query.get_account().current_balance, start_balance + 250,
+            "Account balance hasn't been recalculated after import"
+        )
+        self.assertEqual(
+            WindowsRegistry.TransactionsImportWindow.import_status.text(),
+            LanguageStructure.TransactionsImport.get_translation(7).replace("%imported%", "3").replace("%skipped%", "1"),
+            "Import result isn't shown"
+        )
+
+
+    def test_10_export_transactions(self) -> None:
+        """Test streaming export of account transactions to CSV and JSON Lines files."""
+
+        app_core = AppCore.instance()
+        account_name = app_core.db.account_query.get_account().name
+        transaction_date = self.income_transaction.date.isoformat()
+        expected_transactions = [
+            {
+                "account":account_name, "date":transaction_date, "value":1000.0,
+                "name":self.test_income_transaction_name, "category":self.test_income_category_name
+            },
+            {
+                "account":account_name, "date":transaction_date, "value":-1000.0,
+                "name":self.test_expenses_transaction_name, "category":self.test_expenses_category_name
+            }
+        ]
+        expected_transactions.sort(key=lambda transaction: str(transaction["name"]))
+
+        with TemporaryDirectory() as export_directory:
+            WindowsRegistry.TransactionsExportWindow.file_format.setCurrentIndex(
+                WindowsRegistry.TransactionsExportWindow.file_format.findData("csv")
+            )
+            export_transactions(os.path.join(export_directory, "transactions"))
+            wait_for_queries()
+
+            with open(os.path.join(export_directory, "transactions.csv"), newline="", encoding="utf-8") as csv_file:
+                exported_transactions = [
+                    {**row, "value":float(row["value"])} for row in csv.DictReader(csv_file)
+                ]
+            exported_transactions.sort(key=lambda transaction: str(transaction["name"]))
+            self.assertEqual(exported_transactions, expected_transactions, "Transactions haven't been exported to CSV")
+
+            WindowsRegistry.TransactionsExportWindow.file_format.setCurrentIndex(
+                WindowsRegistry.TransactionsExportWindow.file_format.findData("jsonl")
+            )
+            export_transactions(os.path.join(export_directory, "transactions.jsonl"))
+            wait_for_queries()
+
+            with open(os.path.join(export_directory, "transactions.jsonl"), encoding="utf-8") as jsonl_file:
+                exported_transactions = [json.loads(line) for line in jsonl_file]
+            exported_transactions.sort(key=lambda transaction: str(transaction["name"]))
+            self.assertEqual(exported_transactions, expected_transactions, "Transactions haven't been exported to JSON Lines")
+            self.assertEqual(
+                sorted(os.listdir(export_directory)), ["transactions.csv", "transactions.jsonl"],
+                "Temporary export file hasn't been replaced"
+            )
+
+        self.assertEqual(
+            WindowsRegistry.TransactionsExportWindow.export_status.text(),
+            LanguageStructure.TransactionsExport.get_translation(5).replace("%exported%", "2"),
+            "Export result isn't shown"
+        )
+        WindowsRegistry.TransactionsExportWindow.file_format.setCurrentIndex(0)
+
+
+    def test_11_transactions_table_model(self) -> None:
+        """Test that category table sorts transactions by numeric values and finds rows by id."""
+
+        transactions = TransactionsTableModel()
+        transactions.add_transaction(1, 3, 100, "Rent")
+        transactions.add_transaction(2, 12, 9, "Coffee")
+        transactions.add_transaction(3, 1, 10.5, "Coffee")
+        transactions.sort(2, Qt.SortOrder.AscendingOrder)
+
+        self.assertEqual(
+            [transactions.index(row, 2).data(SORT_ROLE) for row in range(transactions.rowCount())],
+            [9, 10.5, 100],
+            "Transactions aren't sorted by numeric value"
+        )
+        self.assertEqual(transactions.index(0, 0).data(), "Coffee", "Name of transaction isn't shown")
+        self.assertEqual(len(transactions.names), 2, "Transactions names aren't deduplicated")
+
+        old_value = transactions.update_transaction(1, 3, 1, "Rent")
+        self.assertEqual(old_value, 100, "Previous value of updated transaction isn't returned")
+        self.assertEqual(transactions.get_row(1), 0, "Updated transaction hasn't been moved to its sorted row")
+
+        transactions.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(
+            [transactions.index(row, 1).data() for row in range(transactions.rowCount())],
+            ["12", "3", "1"],
+            "Transactions aren't sorted by day"
+        )
+
+        transactions.remove_transaction(2)
+        self.assertEqual(transactions.rowCount(), 2, "Transaction hasn't been removed")
+        self.assertEqual(
+            [transactions.get_transaction_id(transactions.get_row(transaction_id)) for transaction_id in (1, 3)],
+            [1, 3],
+            "Rows of transactions aren't found by id after removal"
+        )
+
+        for name in ("Taxi", "Bus", "Train"):
+            transactions.update_transaction(3, 1, 10.5, name)
+        self.assertEqual(sorted(transactions.names), ["Rent", "Train"], "Names of removed and updated transactions haven't been compacted")
+        self.assertEqual(
+            [transactions.index(transactions.get_row(transaction_id), 0).data() for transaction_id in (1, 3)],
+            ["Rent", "Train"],
+            "Names of transactions have been lost after compaction"
+        )
+
+
+    def test_12_month_snapshots(self) -> None:
+        """Test that months around the current one are prefetched and loaded from cache."""
+
+        app_core = AppCore.instance()
+        next_month()
+        wait_for_queries()
+
+        categories_id = list(app_core.categories)
+        for months_offset in (1, -1, 2, -2):
+            year, month = shift_month(app_core.current_year, app_core.current_month, months_offset)
+            self.assertTrue(
+                app_core.month_snapshots.contains((app_core.db.account_id, year, month), categories_id),
+                f"Month {month}.{year} hasn't been prefetched"
+            )
+
+        previous_month()
+        self.assertEqual(
+            app_core.categories[self.income_category.id].table_data.rowCount(), 1,
+            "Transactions of cached month haven't been loaded"
+        )
+
+        month_key = (app_core.db.account_id, app_core.current_year, app_core.current_month)
+        invalidate_current_month()
+        self.assertFalse(
+            app_core.month_snapshots.contains(month_key, categories_id),
+            "Month snapshot hasn't been invalidated"
+        )
+        wait_for_queries()
+
+
+    def test_13_import_identical_transactions(self) -> None:
+        """Test that identical transactions of the same file are all imported. Only transactions that account already has are skipped."""
+
+        app_core = AppCore.instance()
+        account = app_core.db.account_query.get_account()
+
+        def _restore_account_balance() -> None:
+            """Import recalculates balance of the account which isn't reset after tests."""
+
+            app_core.db.account_query.update_account_balance(
+                account.current_balance, account.current_total_income, account.current_total_expenses
+            )
+            load_account_balance()
+            wait_for_queries()
+        self.addCleanup(_restore_account_balance)
+        transaction_date = self.income_transaction.date.isoformat()
+
+        with TemporaryDirectory() as import_directory:
+            csv_path = os.path.join(import_directory, "transactions.csv")
+            with open(csv_path, "w", encoding="utf-8") as csv_file:
+                csv_file.write(
+                    "date,value,name,category\n"
+                    f"{transaction_date},1000,{self.test_income_transaction_name},{self.test_income_category_name}\n"
+                    f"{transaction_date},1000,{self.test_income_transaction_name},{self.test_income_category_name}\n"
+                    f"{transaction_date},30,Coffee,{self.test_income_category_name}\n"
+                    f"{transaction_date},30,Coffee,{self.test_income_category_name}\n"
+                )
+
+            def _import_transactions() -> None:
+                """Choose CSV file, click import button and wait until import finishes."""
+
+                set_import_file(csv_path)
+                self.click_on_widget(WindowsRegistry.TransactionsImportWindow.import_transactions)
+                wait_for_queries()
+                WindowsRegistry.TransactionsImportWindow.done(0)
+
+            QTimer.singleShot(100, self.catch_failure(_import_transactions))
+            show_transactions_import_window()
+
+        income_transactions = app_core.db.transaction_query.get_all_transactions(self.income_category.id)
+        self.assertEqual(
+            len(income_transactions), 4,
+            "Identical transactions of the same file haven't been imported or existing transaction hasn't been skipped"
+        )
+        self.assertEqual(
+            WindowsRegistry.TransactionsImportWindow.import_status.text(),
+            LanguageStructure.TransactionsImport.get_translation(7).replace("%imported%", "3").replace("%skipped%", "1"),
+            "Import result isn't shown"
+        )
+
+        with TemporaryDirectory() as import_directory:
+            ofx_path = os.path.join(import_directory, "transactions.ofx")
+            ofx_transaction = (
+                "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>{date}<TRNAMT>-30<FITID>{fitid}<NAME>Coffee</STMTTRN>\n"
+            )
+            with open(ofx_path, "w", encoding="utf-8") as ofx_file:
+                ofx_file.write(
+                    "<OFX><BANKTRANLIST>\n"
+                    + ofx_transaction.format(date=transaction_date.replace("-", ""), fitid="1")
+                    + ofx_transaction.format(date=transaction_date.replace("-", ""), fitid="2")
+                    + "</BANKTRANLIST></OFX>\n"
+                )
+
+            expenses_count = len(app_core.db.transaction_query.get_all_transactions(self.expenses_category.id))
+            for expected_imported in (2, 0):
+                resolved_transactions = resolve_transactions_categories(
+                    parse_ofx_transactions(ofx_path), {}, self.income_category.id, self.expenses_category.id
+                )
+                self.assertEqual(
+                    app_core.db.transaction_query.import_transactions(resolved_transactions),
+                    (expected_imported, 2 - expected_imported),
+                    "OFX transactions aren't deduplicated by FITID"
+                )
+
+        self.assertEqual(
+            len(app_core.db.transaction_query.get_all_transactions(self.expenses_category.id)), expenses_count + 2,
+            "Identical OFX transactions with different FITID haven't been imported"
+        )
+
+
+    def test_14_imported_transactions_keep_sign(self) -> None:
+        """Test that imported transaction with category of the other type is added to default category of its own type."""
+
+        transaction_date = self.income_transaction.date
+        categories = {
+            (self.test_income_category_name, CategoryType.Income):self.income_category.id,
+            (self.test_expenses_category_name, CategoryType.Expense):self.expenses_category.id
+        }
+        parsed_transactions = (
+            ParsedTransaction(transaction_date, 100, "Refund", self.test_expenses_category_name),
+            ParsedTransaction(transaction_date, -100, "Fee", self.test_income_category_name),
+            ParsedTransaction(transaction_date, -100, "Groceries", self.test_expenses_category_name)
+        )
+        default_income_category_id, default_expense_category_id = -1, -2
+
+        self.assertEqual(
+            [category_id for *_, category_id, _ in resolve_transactions_categories(
+                parsed_transactions, categories, default_income_category_id, default_expense_category_id
+            )],
+            [default_income_category_id, default_expense_category_id, self.expenses_category.id],
+            "Imported transaction has been added to category of the other type"
+        )
@@ -12,7 +12,8 @@ from AppObjects.app_core import AppCore
 from AppObjects.single_instance_guard import SingleInstanceGuard
 from backend.db_controller import DBController
 from project_configuration import TEST_DB_PATH, APP_DIRECTORY, TEST_DB_FILE_PATH, TEST_BACKUPS_DIRECTORY,\
-    TEST_USER_CONF_PATH, TEST_UPDATE_DIRECTORY, TEST_APP_HASHES_DIRECTORY, TEST_UPDATE_APP_DIRECTORY
+    TEST_USER_CONF_PATH, TEST_UPDATE_DIRECTORY, TEST_APP_HASHES_DIRECTORY, TEST_UPDATE_APP_DIRECTORY,\
+    TEST_STATISTICS_CACHE_DIRECTORY
 
 from tests.tests_toolkit import ColoredTextTestResult
 
@@ -30,8 +31,9 @@ def cleanup_test_files() -> None:
     if os.path.exists(TEST_BACKUPS_DIRECTORY):
         shutil.rmtree(TEST_BACKUPS_DIRECTORY)
 
-    if os.path.exists(TEST_DB_FILE_PATH):
-        os.remove(TEST_DB_FILE_PATH)
+    for db_file_path in (TEST_DB_FILE_PATH, f"{TEST_DB_FILE_PATH}-wal", f"{TEST_DB_FILE_PATH}-shm"):
+        if os.path.exists(db_file_path):
+            os.remove(db_file_path)
 
     if os.path.exists(TEST_UPDATE_DIRECTORY):
         shutil.rmtree(TEST_UPDATE_DIRECTORY)
@@ -42,6 +44,9 @@ def cleanup_test_files() -> None:
     if os.path.exists(TEST_UPDATE_APP_DIRECTORY):
         shutil.rmtree(TEST_UPDATE_APP_DIRECTORY)
 
+    if os.path.exists(TEST_STATISTICS_CACHE_DIRECTORY):
+        shutil.rmtree(TEST_STATISTICS_CACHE_DIRECTORY)
+
 
 def test_main(app_main:Callable[[bool], None]) -> None:
     """This function is used to run the tests in the test suite.
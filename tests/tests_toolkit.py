@@ -20,11 +20,11 @@ from unittest.mock import Mock
 
 from PySide6.QtCore import QEventLoop, QTimer, QObject, Signal
 from PySide6.QtWidgets import QPushButton, QToolButton, QCheckBox
-import sqlalchemy as sa
 
 from backend.models import Category, Transaction, Account
 from project_configuration import TEST_BACKUPS_DIRECTORY, CategoryType
 from AppManagement.category import activate_categories, remove_categories_from_list
+from AppManagement.account import clear_account_views
 from AppManagement.backup_management import remove_backup
 from GUI.category import load_category
 from DesktopQtToolkit.sub_window import SubWindow
@@ -75,6 +75,23 @@ def qsleep(milliseconds:int) -> None:
     loop.exec()
 
 
+def wait_for_queries(timeout:int = 5000) -> None:
+    """Wait until query executor delivers results of all submitted queries. Event loop keeps running while waiting.
+
+        Arguments
+        ---------
+            `timeout` : (int) - Maximum number of milliseconds to wait.
+    """
+
+    query_executor = AppCore.instance().query_executor
+    waited = 0
+    while query_executor.has_pending_queries():
+        if waited >= timeout:
+            raise TimeoutError(f"Query executor hasn't delivered results in {timeout} milliseconds")
+        qsleep(10)
+        waited += 10
+
+
 def assert_any_call_with_details(mock: Mock, *args:Any, msg: str | None = None, **kwargs:dict[str, Any]) -> None:
     """
     Like mock.assert_any_call but if it fails raises AssertionError that
@@ -274,6 +291,7 @@ class DBTestCase(DefaultTestCase):
                     app_core.current_year,
                     app_core.current_month
                 )
+            app_core.account_view_states.shown_account_id = app_core.db.account_id
             activate_categories()
             qsleep(500)#Wait for the categories to be activated in the application
 
@@ -307,13 +325,14 @@ class DBTestCase(DefaultTestCase):
         """This method is used to remove the test database after the test is finished."""
 
         remove_categories_from_list()
+        clear_account_views()
         app_core = AppCore.instance()
         with app_core.db.session_factory() as session:
             with session.begin():
-                session.execute(sa.text("DELETE FROM transactions_fts"))
                 session.query(Category).delete()
                 session.query(Transaction).delete()
                 session.query(Account).filter(Account.id != 1).delete()
+        app_core.month_snapshots.clear()
         
         app_core.config.account_name = "Test user"
         app_core.db.set_account_id(app_core.config.account_name)